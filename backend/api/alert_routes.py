@@ -1,60 +1,227 @@
 """Climate Alert API routes with Cyoda MCP integration."""
 
-import sys
-from pathlib import Path
-from flask import Blueprint, jsonify, request
+import logging
+import os
+import threading
+import time
+from flask import Blueprint, current_app, jsonify, request
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
-
+from backend.api.json_utils import (
+    parse_json, json_response, bytes_response, dumps_bytes, spec_responder,
+    json_error_handler
+)
+from backend.api.validation import compile_schema, ValidationError
 from src.utils.cyoda_client import CyodaAlertClient
 from src.services.alert_service import ClimateAlertService
 
+logger = logging.getLogger(__name__)
+
 alert_bp = Blueprint('alerts', __name__)
+alert_bp.register_error_handler(Exception, json_error_handler)
 
-# Initialize clients
+# Initialize clients (stateless spec builder, shared by all requests)
 cyoda_client = CyodaAlertClient()
 
-# Service instance (will be initialized with dependencies)
-alert_service = None
+# Pre-encoded envelopes for pass-through specification endpoints
+_create_response = spec_responder(
+    'alert_specification',
+    'Use mcp__cyoda__entity_create_entity_tool with this specification'
+)
+_search_response = spec_responder(
+    'search_specification',
+    'Use mcp__cyoda__search_search tool with this specification'
+)
+_update_response = spec_responder(
+    'update_specification',
+    'Use mcp__cyoda__entity_update_entity_tool with this specification'
+)
+_get_response = spec_responder(
+    'get_specification',
+    'Use mcp__cyoda__entity_get_entity_tool with this specification'
+)
+
+# The list specification never changes, so its whole body is encoded once
+_LIST_SPEC_BODY = dumps_bytes({
+    'success': True,
+    'mcp_spec': cyoda_client.list_all_alerts(),
+    'message': 'No cached alerts. Execute MCP tool and POST results to /api/alerts/list',
+    'alerts': [],
+    'cached': False
+})
+
+# Request schemas, compiled once at import
+_validate_detect = compile_schema({
+    'type': 'object',
+    'properties': {
+        'data': {'type': 'array'},
+        'metric': {'type': 'string'},
+        'value_column': {'type': 'string'},
+        'use_ai_analysis': {'type': 'boolean'},
+    },
+})
+
+_validate_create = compile_schema({
+    'type': 'object',
+    'required': ['alert_type', 'severity', 'value', 'date', 'anomaly_score'],
+    'properties': {
+        'alert_type': {'type': 'string', 'minLength': 1},
+        'severity': {'type': 'string', 'minLength': 1},
+        'value': {'type': 'number'},
+        'date': {'type': 'string', 'minLength': 1},
+        'anomaly_score': {'type': 'number'},
+        'metric': {'type': 'string'},
+        'use_ai_analysis': {'type': 'boolean'},
+    },
+})
+
+_validate_search = compile_schema({
+    'type': 'object',
+    'properties': {
+        'status': {'type': ['string', 'null']},
+        'severity': {'type': ['string', 'null']},
+        'alert_type': {'type': ['string', 'null']},
+        'min_anomaly_score': {'type': ['number', 'null']},
+        'date_from': {'type': ['string', 'null']},
+        'date_to': {'type': ['string', 'null']},
+        'filter': {'type': ['object', 'null']},
+    },
+})
+
+_validate_update = compile_schema({
+    'type': 'object',
+    'properties': {
+        'status': {'type': 'string'},
+        'acknowledged': {'type': 'boolean'},
+        'resolved': {'type': 'boolean'},
+        'resolution_notes': {'type': ['string', 'null']},
+    },
+})
+
+_validate_classify_batch = compile_schema({
+    'type': 'object',
+    'required': ['values'],
+    'properties': {
+        'values': {'type': 'array'},
+        'metric': {'type': 'string'},
+        'anomaly_scores': {'type': ['array', 'null']},
+    },
+})
+
+_validate_classify_cases = compile_schema({
+    'type': 'object',
+    'required': ['cases'],
+    'properties': {
+        'cases': {'type': 'array'},
+    },
+})
+
+
+@alert_bp.errorhandler(ValidationError)
+def _invalid_request(error):
+    """Build the 400 response for a payload that failed validation."""
+    return jsonify({'success': False, 'error': f'Invalid request: {error.message}'}), 400
+
+
+# Alerts posted to /list by Claude Code, shared across request threads
+ALERTS_TTL = int(os.getenv('ALERTS_TTL', 60))
+_alerts_cache = {}
+_alerts_lock = threading.Lock()
+
+
+def _build_alert_service():
+    """Create the alert service with whichever dependencies are available."""
+    # Try to load anomaly detector
+    try:
+        from src.models.anomaly_detector import ClimateAnomalyDetector
+        anomaly_detector = ClimateAnomalyDetector()
+        try:
+            anomaly_detector.load_model('models/anomaly_model.pkl', 'models/anomaly_scaler.pkl')
+        except:
+            logger.warning("Anomaly model not loaded")
+            anomaly_detector = None
+    except ImportError:
+        anomaly_detector = None
 
+    # Try to load Gemini client
+    try:
+        from src.utils.gemini_ai import GeminiClimateAnalyst
+        api_key = os.getenv('GEMINI_API_KEY')
+        gemini_client = GeminiClimateAnalyst(api_key=api_key) if api_key else None
+    except:
+        gemini_client = None
 
-def get_alert_service():
-    """Get or create alert service with dependencies."""
-    global alert_service
+    return ClimateAlertService(
+        anomaly_detector=anomaly_detector,
+        gemini_client=gemini_client,
+        cyoda_client=cyoda_client
+    )
+
+
+# Alert service, created once at blueprint registration and stored in
+# app.extensions['alert_service']
+_service_lock = threading.Lock()
 
-    if alert_service is None:
-        # Try to load anomaly detector
-        try:
-            from src.models.anomaly_detector import ClimateAnomalyDetector
-            anomaly_detector = ClimateAnomalyDetector()
-            try:
-                anomaly_detector.load_model('models/anomaly_model.pkl', 'models/anomaly_scaler.pkl')
-            except:
-                print("Anomaly model not loaded")
-                anomaly_detector = None
-        except ImportError:
-            anomaly_detector = None
 
-        # Try to load Gemini client
+@alert_bp.record_once
+def _init_service(state):
+    """Create the alert service at startup so no request pays for model loading."""
+    app = state.app
+
+    with _service_lock:
+        if 'alert_service' in app.extensions:
+            return
+
         try:
-            import os
-            from src.utils.gemini_ai import GeminiClimateAnalyst
-            api_key = os.getenv('GEMINI_API_KEY')
-            gemini_client = GeminiClimateAnalyst(api_key=api_key) if api_key else None
-        except:
-            gemini_client = None
+            service = _build_alert_service()
+        except Exception as e:
+            logger.warning("Failed to initialize alert service: %s", e)
+            service = None
 
-        alert_service = ClimateAlertService(
-            anomaly_detector=anomaly_detector,
-            gemini_client=gemini_client,
-            cyoda_client=cyoda_client
-        )
+        app.extensions['alert_service'] = service
+
+
+def get_alert_service():
+    """Get the alert service for the current app, or None if unavailable."""
+    return current_app.extensions.get('alert_service')
+
+
+def _service_unavailable():
+    """Response returned when the alert service failed to initialize."""
+    return jsonify({'success': False, 'error': 'Alert service not available'}), 503
+
+
+def _records_to_columns(records, value_column):
+    """
+    Split a list of ``{"date": ..., value_column: ...}`` records into columns.
+
+    Args:
+        records: List of record dicts from the request body
+        value_column: Name of the value key
+
+    Returns:
+        Tuple of (values, dates) arrays, or None if the records carry keys
+        other than ``date`` and ``value_column`` (or are not plain dicts)
+    """
+    known_keys = {'date', value_column}
+    values = []
+    dates = []
+
+    for record in records:
+        if not isinstance(record, dict) or record.keys() != known_keys:
+            return None
+        values.append(record[value_column])
+        dates.append(record['date'])
+
+    try:
+        values = np.fromiter(values, dtype=np.float64, count=len(values))
+        dates = np.array(dates, dtype='datetime64[ns]')
+    except (TypeError, ValueError):
+        return None
 
-    return alert_service
+    return values, dates
 
 
 @alert_bp.route('/detect', methods=['POST'])
@@ -76,39 +243,48 @@ def detect_alerts():
     Note: This endpoint prepares alert specifications.
     Actual Cyoda entity creation happens via MCP tools.
     """
-    try:
-        data = request.get_json()
-        climate_data = data.get('data', [])
-        metric = data.get('metric', 'temperature')
-        value_column = data.get('value_column', 'value')
-        use_ai_analysis = data.get('use_ai_analysis', True)
-
-        if not climate_data:
-            return jsonify({'success': False, 'error': 'No climate data provided'}), 400
-
-        # Convert to DataFrame
-        df = pd.DataFrame(climate_data)
-
-        # Get service
-        service = get_alert_service()
-
-        # Detect alerts
+    data = parse_json(request)
+    _validate_detect(data)
+
+    climate_data = data.get('data', [])
+    metric = data.get('metric', 'temperature')
+    value_column = data.get('value_column', 'value')
+    use_ai_analysis = data.get('use_ai_analysis', True)
+
+    if not climate_data:
+        return jsonify({'success': False, 'error': 'No climate data provided'}), 400
+
+    service = get_alert_service()
+    if service is None:
+        return _service_unavailable()
+
+    # Plain {date, value} records go straight to columnar arrays;
+    # anything else falls back to the DataFrame path
+    columns = _records_to_columns(climate_data, value_column)
+
+    if columns is not None:
+        values, dates = columns
+        alert_specs = service.detect_and_create_alerts_arrays(
+            values=values,
+            dates=dates,
+            value_column=value_column,
+            metric=metric,
+            use_ai_analysis=use_ai_analysis
+        )
+    else:
         alert_specs = service.detect_and_create_alerts(
-            climate_data=df,
+            climate_data=pd.DataFrame(climate_data),
             value_column=value_column,
             metric=metric,
             use_ai_analysis=use_ai_analysis
         )
 
-        return jsonify({
-            'success': True,
-            'alerts_detected': len(alert_specs),
-            'alert_specifications': alert_specs,
-            'message': 'Alert specifications generated. Use MCP tools to create entities in Cyoda.'
-        })
-
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({
+        'success': True,
+        'alerts_detected': len(alert_specs),
+        'alert_specifications': alert_specs,
+        'message': 'Alert specifications generated. Use MCP tools to create entities in Cyoda.'
+    })
 
 
 @alert_bp.route('/create', methods=['POST'])
@@ -129,64 +305,49 @@ def create_alert_spec():
 
     Returns alert specification for mcp__cyoda__entity_create_entity_tool.
     """
-    try:
-        data = request.get_json()
-
-        # Extract parameters
-        alert_type = data.get('alert_type')
-        severity = data.get('severity')
-        value = data.get('value')
-        date = data.get('date')
-        anomaly_score = data.get('anomaly_score')
-        metric = data.get('metric', 'temperature')
-        use_ai = data.get('use_ai_analysis', False)
-
-        # Validate required fields
-        if not all([alert_type, severity, value, date, anomaly_score]):
-            return jsonify({
-                'success': False,
-                'error': 'Missing required fields'
-            }), 400
-
-        # Prepare alert parameters
-        alert_params = {
-            "alert_type": alert_type,
-            "severity": severity,
-            "value": float(value),
-            "date": date,
-            "anomaly_score": float(anomaly_score),
-            "metric": metric
-        }
+    data = parse_json(request)
+
+    # Validate required fields and types
+    _validate_create(data)
+
+    # Extract parameters
+    alert_type = data.get('alert_type')
+    severity = data.get('severity')
+    value = data.get('value')
+    date = data.get('date')
+    anomaly_score = data.get('anomaly_score')
+    metric = data.get('metric', 'temperature')
+    use_ai = data.get('use_ai_analysis', False)
+
+    # AI analysis is computed once, if requested and available
+    service = get_alert_service()
+    ai = (
+        service._generate_ai_analysis(
+            alert_type=alert_type,
+            severity=severity,
+            value=value,
+            metric=metric,
+            anomaly_score=anomaly_score,
+            date=date
+        )
+        if use_ai and service is not None and service.gemini_client
+        else None
+    )
 
-        # Add AI analysis if requested
-        if use_ai:
-            service = get_alert_service()
-            if service.gemini_client:
-                ai_analysis = service._generate_ai_analysis(
-                    alert_type=alert_type,
-                    severity=severity,
-                    value=float(value),
-                    metric=metric,
-                    anomaly_score=float(anomaly_score),
-                    date=date
-                )
-                alert_params.update({
-                    "ai_analysis": ai_analysis.get("analysis", {}),
-                    "recommendations": ai_analysis.get("recommendations", []),
-                    "description": ai_analysis.get("summary", "")
-                })
-
-        # Create alert specification
-        alert_spec = cyoda_client.create_alert(**alert_params)
+    alert_params = {
+        "alert_type": alert_type,
+        "severity": severity,
+        "value": value,
+        "date": date,
+        "anomaly_score": anomaly_score,
+        "metric": metric,
+        **(ai.as_alert_params() if ai is not None else {})
+    }
 
-        return jsonify({
-            'success': True,
-            'alert_specification': alert_spec,
-            'message': 'Use mcp__cyoda__entity_create_entity_tool with this specification'
-        })
+    # Create alert specification
+    alert_spec = cyoda_client.create_alert(**alert_params)
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return _create_response(alert_spec)
 
 
 @alert_bp.route('/search', methods=['POST'])
@@ -201,31 +362,32 @@ def search_alerts_spec():
             "alert_type": "heat_wave",
             "min_anomaly_score": 0.7,
             "date_from": "2024-01-01",
-            "date_to": "2024-12-31"
+            "date_to": "2024-12-31",
+            "filter": {"or": [{"severity": "critical"}, {"alert_type": "heat_wave"}]}
         }
 
+    ``filter`` is an optional AND/OR tree over the same fields, ANDed with
+    the top-level ones.
+
     Returns search specification for mcp__cyoda__search_search tool.
     """
-    try:
-        data = request.get_json()
+    data = parse_json(request)
+    _validate_search(data)
 
+    try:
         search_spec = cyoda_client.search_alerts(
             status=data.get('status'),
             severity=data.get('severity'),
             alert_type=data.get('alert_type'),
             min_anomaly_score=data.get('min_anomaly_score'),
             date_from=data.get('date_from'),
-            date_to=data.get('date_to')
+            date_to=data.get('date_to'),
+            filter_tree=data.get('filter')
         )
+    except ValueError as e:
+        raise ValidationError(str(e))
 
-        return jsonify({
-            'success': True,
-            'search_specification': search_spec,
-            'message': 'Use mcp__cyoda__search_search tool with this specification'
-        })
-
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return _search_response(search_spec)
 
 
 @alert_bp.route('/update/<alert_id>', methods=['PUT'])
@@ -246,25 +408,18 @@ def update_alert_spec(alert_id):
 
     Returns update specification for mcp__cyoda__entity_update_entity_tool.
     """
-    try:
-        data = request.get_json()
-
-        update_spec = cyoda_client.update_alert_status(
-            alert_id=alert_id,
-            status=data.get('status', 'active'),
-            acknowledged=data.get('acknowledged', False),
-            resolved=data.get('resolved', False),
-            resolution_notes=data.get('resolution_notes')
-        )
+    data = parse_json(request)
+    _validate_update(data)
 
-        return jsonify({
-            'success': True,
-            'update_specification': update_spec,
-            'message': 'Use mcp__cyoda__entity_update_entity_tool with this specification'
-        })
+    update_spec = cyoda_client.update_alert_status(
+        alert_id=alert_id,
+        status=data.get('status', 'active'),
+        acknowledged=data.get('acknowledged', False),
+        resolved=data.get('resolved', False),
+        resolution_notes=data.get('resolution_notes')
+    )
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return _update_response(update_spec)
 
 
 @alert_bp.route('/get/<alert_id>', methods=['GET'])
@@ -274,17 +429,53 @@ def get_alert_spec(alert_id):
 
     Returns specification for mcp__cyoda__entity_get_entity_tool.
     """
-    try:
-        get_spec = cyoda_client.get_alert(alert_id)
+    get_spec = cyoda_client.get_alert(alert_id)
 
-        return jsonify({
-            'success': True,
-            'get_specification': get_spec,
-            'message': 'Use mcp__cyoda__entity_get_entity_tool with this specification'
-        })
+    return _get_response(get_spec)
+
+
+def _normalize_alerts(entities):
+    """
+    Normalize alerts posted by Claude Code into flat alert dicts.
+
+    Handles both direct alert data and the Cyoda entity wrapper format
+    in a single pass; non-dict entries are dropped.
+
+    Args:
+        entities: List of alerts or entity wrappers
+
+    Returns:
+        List of alert dicts
+    """
+    alerts = []
+    append = alerts.append
+
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+
+        wrapper = entity.get('data')
+        if isinstance(wrapper, dict) and wrapper.get('type') == 'ENTITY':
+            # Entity wrapper format
+            append({'technical_id': wrapper['meta']['id'], **wrapper['data']})
+        else:
+            # Direct alert data
+            append(entity)
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return alerts
+
+
+def _get_cached_alerts():
+    """Return alerts cached by the last /list POST, or [] once they expire."""
+    with _alerts_lock:
+        entry = _alerts_cache.get('current')
+        if entry is None:
+            return []
+        expires_at, alerts = entry
+        if expires_at <= time.monotonic():
+            del _alerts_cache['current']
+            return []
+        return alerts
 
 
 @alert_bp.route('/list', methods=['GET', 'POST'])
@@ -295,34 +486,13 @@ def list_alerts():
     GET: Returns cached alerts or MCP specification
     POST: Accepts alerts fetched by Claude Code via MCP tools
     """
-    # Simple in-memory cache
-    if not hasattr(list_alerts, 'cached_alerts'):
-        list_alerts.cached_alerts = []
-
     if request.method == 'POST':
         # Claude Code is injecting alerts fetched from Cyoda
-        data = request.get_json()
+        data = parse_json(request)
         if data and 'alerts' in data:
-            # Extract and normalize alert data
-            alerts = []
-            for entity in data['alerts']:
-                if isinstance(entity, dict):
-                    # Handle both direct alert data and entity wrapper format
-                    if 'data' in entity and entity.get('data', {}).get('type') == 'ENTITY':
-                        # Entity wrapper format
-                        entity_data = entity['data']['data']
-                        entity_meta = entity['data']['meta']
-                        alert = {
-                            'technical_id': entity_meta['id'],
-                            **entity_data
-                        }
-                    else:
-                        # Direct alert data
-                        alert = entity
-
-                    alerts.append(alert)
-
-            list_alerts.cached_alerts = alerts
+            alerts = _normalize_alerts(data['alerts'])
+            with _alerts_lock:
+                _alerts_cache['current'] = (time.monotonic() + ALERTS_TTL, alerts)
 
             return jsonify({
                 'success': True,
@@ -331,30 +501,17 @@ def list_alerts():
             })
 
     # GET request - return cached alerts
-    if list_alerts.cached_alerts:
-        return jsonify({
+    cached_alerts = _get_cached_alerts()
+    if cached_alerts:
+        return json_response({
             'success': True,
-            'alerts': list_alerts.cached_alerts,
-            'count': len(list_alerts.cached_alerts),
+            'alerts': cached_alerts,
+            'count': len(cached_alerts),
             'cached': True
         })
     else:
         # No cached alerts, return MCP spec
-        try:
-            list_spec = cyoda_client.list_all_alerts()
-            return jsonify({
-                'success': True,
-                'mcp_spec': list_spec,
-                'message': 'No cached alerts. Execute MCP tool and POST results to /api/alerts/list',
-                'alerts': [],
-                'cached': False
-            })
-        except Exception as e:
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'alerts': []
-            }), 500
+        return bytes_response(_LIST_SPEC_BODY)
 
 
 @alert_bp.route('/summary', methods=['POST'])
@@ -370,20 +527,19 @@ def alerts_summary():
             ]
         }
     """
-    try:
-        data = request.get_json()
-        alerts = data.get('alerts', [])
+    data = parse_json(request)
+    alerts = data.get('alerts', [])
 
-        service = get_alert_service()
-        summary = service.get_active_alerts_summary(alerts)
+    service = get_alert_service()
+    if service is None:
+        return _service_unavailable()
 
-        return jsonify({
-            'success': True,
-            'summary': summary
-        })
+    summary = service.get_active_alerts_summary(alerts)
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return json_response({
+        'success': True,
+        'summary': summary
+    })
 
 
 @alert_bp.route('/prioritize', methods=['POST'])
@@ -396,20 +552,19 @@ def prioritize_alerts():
             "alerts": [...]
         }
     """
-    try:
-        data = request.get_json()
-        alerts = data.get('alerts', [])
+    data = parse_json(request)
+    alerts = data.get('alerts', [])
 
-        service = get_alert_service()
-        prioritized = service.prioritize_alerts(alerts)
+    service = get_alert_service()
+    if service is None:
+        return _service_unavailable()
 
-        return jsonify({
-            'success': True,
-            'prioritized_alerts': prioritized
-        })
+    prioritized = service.prioritize_alerts(alerts)
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    return jsonify({
+        'success': True,
+        'prioritized_alerts': prioritized
+    })
 
 
 @alert_bp.route('/classify', methods=['POST'])
@@ -424,28 +579,125 @@ def classify_alert():
             "anomaly_score": 0.85
         }
     """
-    try:
-        data = request.get_json()
-        value = data.get('value')
-        metric = data.get('metric', 'temperature')
-        anomaly_score = data.get('anomaly_score', 0.5)
-
-        severity = cyoda_client.classify_severity(
-            anomaly_score=float(anomaly_score),
-            value=float(value),
-            metric=metric
-        )
+    data = parse_json(request)
+    value = data.get('value')
+    metric = data.get('metric', 'temperature')
+    anomaly_score = data.get('anomaly_score', 0.5)
+
+    severities, alert_types = _classify_arrays(
+        np.array([float(value)]),
+        np.array([float(anomaly_score)]),
+        metric
+    )
+
+    return jsonify({
+        'success': True,
+        'severity': str(severities[0]),
+        'alert_type': str(alert_types[0])
+    })
+
+
+@alert_bp.route('/classify_batch', methods=['POST'])
+def classify_alerts_batch():
+    """
+    Classify severity and type for many values in one request.
 
-        alert_type = cyoda_client.determine_alert_type(
-            value=float(value),
-            metric=metric
-        )
+    Request body:
+        {
+            "values": [39.5, 12.0, ...],
+            "metric": "temperature",
+            "anomaly_scores": [0.85, 0.2, ...]
+        }
+
+    ``anomaly_scores`` is optional (defaults to 0.5 per value) and must
+    match ``values`` in length when given.
+
+    Cases with their own metrics can be sent instead; each gets a
+    ``{"severity", "alert_type"}`` entry in ``results``, in order:
+        {
+            "cases": [
+                {"value": 42.0, "metric": "temperature", "anomaly_score": 0.95},
+                {"value": 95.0, "metric": "precipitation"}
+            ]
+        }
+    """
+    data = parse_json(request)
+    if isinstance(data, dict) and 'cases' in data:
+        return _classify_cases(data)
+
+    _validate_classify_batch(data)
+
+    metric = data.get('metric', 'temperature')
+    scores = data.get('anomaly_scores')
 
+    try:
+        values = np.asarray(data['values'], dtype=np.float64)
+        if scores is not None:
+            scores = np.asarray(scores, dtype=np.float64)
+    except (TypeError, ValueError):
         return jsonify({
-            'success': True,
-            'severity': severity,
-            'alert_type': alert_type
-        })
+            'success': False,
+            'error': 'values and anomaly_scores must be numeric'
+        }), 400
 
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+    if scores is None:
+        scores = np.full(values.shape, 0.5)
+    elif scores.shape != values.shape:
+        return jsonify({
+            'success': False,
+            'error': 'anomaly_scores must have the same length as values'
+        }), 400
+
+    severities, alert_types = _classify_arrays(values, scores, metric)
+
+    return json_response({
+        'success': True,
+        'count': int(values.shape[0]),
+        'severities': severities.tolist(),
+        'alert_types': alert_types.tolist()
+    })
+
+
+def _classify_cases(data):
+    """Classify a list of single-alert cases, one vectorized pass per metric."""
+    _validate_classify_cases(data)
+    cases = data['cases']
+
+    try:
+        values = np.array([float(case['value']) for case in cases])
+        scores = np.array([float(case.get('anomaly_score', 0.5)) for case in cases])
+        metrics = np.array([case.get('metric', 'temperature') for case in cases], dtype=object)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'each case needs a numeric value and anomaly_score'
+        }), 400
+
+    severities = np.empty(len(cases), dtype=object)
+    alert_types = np.empty(len(cases), dtype=object)
+    for metric in dict.fromkeys(metrics):
+        idx = np.flatnonzero(metrics == metric)
+        severities[idx], alert_types[idx] = _classify_arrays(values[idx], scores[idx], metric)
+
+    return json_response({
+        'success': True,
+        'count': len(cases),
+        'results': [
+            {'severity': str(severity), 'alert_type': str(alert_type)}
+            for severity, alert_type in zip(severities, alert_types)
+        ]
+    })
+
+
+def _classify_arrays(values, anomaly_scores, metric):
+    """Classify aligned value/score arrays into severity and type labels."""
+    severities = cyoda_client.classify_severity_batch(
+        anomaly_scores=anomaly_scores,
+        values=values,
+        metric=metric
+    )
+    alert_types = cyoda_client.determine_alert_type_batch(
+        values=values,
+        metric=metric
+    )
+    return severities, alert_types
@@ -5,43 +5,74 @@ These endpoints allow Gemini to analyze data and automatically generate
 MCP specifications for Cyoda entity operations.
 """
 
-import sys
-from pathlib import Path
+import logging
+import os
+from functools import lru_cache
+
 from flask import Blueprint, jsonify, request
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+from backend.api.json_utils import (
+    parse_json, json_response, bytes_response, dumps_bytes, json_error_handler, public_cache
+)
+from backend.api.routes import STATUS_TTL
+from src.services.trend_stats import summarize_history
+
+logger = logging.getLogger(__name__)
 
 gemini_cyoda_bp = Blueprint('gemini_cyoda', __name__)
+gemini_cyoda_bp.register_error_handler(Exception, json_error_handler)
 
 # Try to import integration service
 try:
     from src.services.gemini_cyoda_integration import GeminiCyodaIntegration
     INTEGRATION_AVAILABLE = True
 except ImportError as e:
-    print(f"Gemini-Cyoda integration not available: {e}")
+    logger.warning("Gemini-Cyoda integration not available: %s", e)
     INTEGRATION_AVAILABLE = False
 
-# Global integration client (cached like gemini_routes.py does)
+# Environment is read once; changing the key requires a restart anyway
+API_KEY_CONFIGURED = bool(os.getenv('GEMINI_API_KEY'))
+
+# Global integration client, built when the blueprint is registered
 gemini_cyoda_client = None
 
 
-def get_integration():
-    """Get or create integration instance (with global caching)."""
+@lru_cache(maxsize=2)
+def _status_body(integration_working):
+    """
+    Encode the /status response for an integration state snapshot.
+
+    The flags are invariant per process apart from whether the client
+    exists, so each of the two possible bodies is encoded at most once.
+    """
+    return dumps_bytes({
+        'success': True,
+        'integration_available': INTEGRATION_AVAILABLE,
+        'api_key_configured': API_KEY_CONFIGURED,
+        'integration_working': integration_working,
+        'features': {
+            'analyze_and_alert': integration_working,
+            'natural_language_search': integration_working,
+            'trend_analysis': integration_working,
+            'report_generation': integration_working,
+            'chat': integration_working
+        }
+    })
+
+
+@gemini_cyoda_bp.record_once
+def _init_integration(state):
+    """Create the integration client once, at blueprint registration."""
     global gemini_cyoda_client
 
     if not INTEGRATION_AVAILABLE:
-        return None
-
-    if gemini_cyoda_client is None:
-        try:
-            gemini_cyoda_client = GeminiCyodaIntegration()
-        except Exception as e:
-            print(f"Failed to initialize integration: {e}")
-            return None
+        return
 
-    return gemini_cyoda_client
+    try:
+        gemini_cyoda_client = GeminiCyodaIntegration()
+    except Exception as e:
+        logger.warning("Failed to initialize integration: %s", e)
+        gemini_cyoda_client = None
 
 
 @gemini_cyoda_bp.route('/analyze-and-alert', methods=['POST'])
@@ -68,7 +99,7 @@ def gemini_analyze_and_create_alert():
             "message": "Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec"
         }
     """
-    integration = get_integration()
+    integration = gemini_cyoda_client
     if not integration:
         return jsonify({
             'success': False,
@@ -76,33 +107,26 @@ def gemini_analyze_and_create_alert():
             'hint': 'Set GEMINI_API_KEY environment variable'
         }), 503
 
-    try:
-        data = request.get_json()
-        climate_data = data.get('climate_data', {})
-
-        if not climate_data:
-            return jsonify({
-                'success': False,
-                'error': 'No climate data provided'
-            }), 400
-
-        # Gemini analyzes and generates MCP spec
-        result = integration.analyze_and_create_alert(climate_data)
+    data = parse_json(request)
+    climate_data = data.get('climate_data', {})
 
-        return jsonify({
-            'success': True,
-            'gemini_analysis': result['gemini_analysis'],
-            'cyoda_mcp_spec': result.get('cyoda_mcp_spec'),
-            'action': result.get('action'),
-            'timestamp': result['timestamp'],
-            'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
-        })
-
-    except Exception as e:
+    if not climate_data:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No climate data provided'
+        }), 400
+
+    # Gemini analyzes and generates MCP spec
+    result = integration.analyze_and_create_alert(climate_data)
+
+    return jsonify({
+        'success': True,
+        'gemini_analysis': result['gemini_analysis'],
+        'cyoda_mcp_spec': result.get('cyoda_mcp_spec'),
+        'action': result.get('action'),
+        'timestamp': result['timestamp'],
+        'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
+    })
 
 
 @gemini_cyoda_bp.route('/nl-search', methods=['POST'])
@@ -125,41 +149,34 @@ def natural_language_search():
             "message": "Use mcp__cyoda__search_search with cyoda_search_spec"
         }
     """
-    integration = get_integration()
+    integration = gemini_cyoda_client
     if not integration:
         return jsonify({
             'success': False,
             'error': 'Gemini-Cyoda integration not available'
         }), 503
 
-    try:
-        data = request.get_json()
-        query = data.get('query')
-        entity_type = data.get('entity_type', 'climate_alert')
-
-        if not query:
-            return jsonify({
-                'success': False,
-                'error': 'No query provided'
-            }), 400
-
-        # Gemini converts NL to search spec
-        result = integration.query_cyoda_with_nl(query, entity_type)
-
-        return jsonify({
-            'success': True,
-            'natural_language_query': result['natural_language_query'],
-            'cyoda_search_spec': result['cyoda_search_spec'],
-            'action': result['action'],
-            'explanation': result['explanation'],
-            'message': 'Use mcp__cyoda__search_search with cyoda_search_spec'
-        })
+    data = parse_json(request)
+    query = data.get('query')
+    entity_type = data.get('entity_type', 'climate_alert')
 
-    except Exception as e:
+    if not query:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No query provided'
+        }), 400
+
+    # Gemini converts NL to search spec
+    result = integration.query_cyoda_with_nl(query, entity_type)
+
+    return jsonify({
+        'success': True,
+        'natural_language_query': result['natural_language_query'],
+        'cyoda_search_spec': result['cyoda_search_spec'],
+        'action': result['action'],
+        'explanation': result['explanation'],
+        'message': 'Use mcp__cyoda__search_search with cyoda_search_spec'
+    })
 
 
 @gemini_cyoda_bp.route('/analyze-trends', methods=['POST'])
@@ -184,43 +201,40 @@ def analyze_trends_and_store():
             "action": "create_analysis_entity"
         }
     """
-    integration = get_integration()
+    integration = gemini_cyoda_client
     if not integration:
         return jsonify({
             'success': False,
             'error': 'Gemini-Cyoda integration not available'
         }), 503
 
-    try:
-        data = request.get_json()
-        historical_data = data.get('historical_data', [])
-        analysis_type = data.get('analysis_type', 'trend_analysis')
-
-        if not historical_data:
-            return jsonify({
-                'success': False,
-                'error': 'No historical data provided'
-            }), 400
-
-        # Gemini analyzes trends
-        result = integration.analyze_trends_and_store(
-            historical_data,
-            analysis_type
-        )
-
-        return jsonify({
-            'success': True,
-            'gemini_analysis': result['gemini_analysis'],
-            'cyoda_mcp_spec': result['cyoda_mcp_spec'],
-            'action': result['action'],
-            'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
-        })
+    data = parse_json(request)
+    historical_data = data.get('historical_data', [])
+    analysis_type = data.get('analysis_type', 'trend_analysis')
 
-    except Exception as e:
+    if not historical_data:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': 'No historical data provided'
+        }), 400
+
+    # Summarize the full series so Gemini sees more than the sample
+    statistics = summarize_history(historical_data)
+
+    # Gemini analyzes trends
+    result = integration.analyze_trends_and_store(
+        historical_data,
+        analysis_type,
+        statistics=statistics
+    )
+
+    return json_response({
+        'success': True,
+        'gemini_analysis': result['gemini_analysis'],
+        'cyoda_mcp_spec': result['cyoda_mcp_spec'],
+        'action': result['action'],
+        'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
+    })
 
 
 @gemini_cyoda_bp.route('/generate-report', methods=['POST'])
@@ -246,37 +260,30 @@ def generate_report_and_store():
             "action": "create_report_entity"
         }
     """
-    integration = get_integration()
+    integration = gemini_cyoda_client
     if not integration:
         return jsonify({
             'success': False,
             'error': 'Gemini-Cyoda integration not available'
         }), 503
 
-    try:
-        data = request.get_json()
-        report_type = data.get('report_type', 'executive_summary')
-        data_context = data.get('data_context', {})
-
-        # Gemini generates report
-        result = integration.generate_report_and_store(
-            report_type,
-            data_context
-        )
+    data = parse_json(request)
+    report_type = data.get('report_type', 'executive_summary')
+    data_context = data.get('data_context', {})
 
-        return jsonify({
-            'success': True,
-            'report': result['report'],
-            'cyoda_mcp_spec': result['cyoda_mcp_spec'],
-            'action': result['action'],
-            'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
-        })
+    # Gemini generates report
+    result = integration.generate_report_and_store(
+        report_type,
+        data_context
+    )
 
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    return jsonify({
+        'success': True,
+        'report': result['report'],
+        'cyoda_mcp_spec': result['cyoda_mcp_spec'],
+        'action': result['action'],
+        'message': 'Use mcp__cyoda__entity_create_entity_tool with cyoda_mcp_spec'
+    })
 
 
 @gemini_cyoda_bp.route('/chat', methods=['POST'])
@@ -300,64 +307,38 @@ def chat_about_alerts():
             "follow_up_questions": [...]
         }
     """
-    integration = get_integration()
+    integration = gemini_cyoda_client
     if not integration:
         return jsonify({
             'success': False,
             'error': 'Gemini-Cyoda integration not available'
         }), 503
 
-    try:
-        data = request.get_json()
-        message = data.get('message')
-        cyoda_alerts = data.get('cyoda_alerts', [])
-        conversation_history = data.get('conversation_history')
-
-        if not message:
-            return jsonify({
-                'success': False,
-                'error': 'No message provided'
-            }), 400
-
-        # Gemini chats about alerts
-        result = integration.chat_about_alerts(
-            message,
-            cyoda_alerts,
-            conversation_history
-        )
+    data = parse_json(request)
+    message = data.get('message')
+    cyoda_alerts = data.get('cyoda_alerts', [])
+    conversation_history = data.get('conversation_history')
 
-        return jsonify({
-            'success': True,
-            **result
-        })
-
-    except Exception as e:
+    if not message:
         return jsonify({
             'success': False,
-            'error': str(e)
-        }), 500
-
-
-@gemini_cyoda_bp.route('/status', methods=['GET'])
-def integration_status():
-    """Check if Gemini-Cyoda integration is available."""
-    import os
+            'error': 'No message provided'
+        }), 400
 
-    api_key_configured = bool(os.getenv('GEMINI_API_KEY'))
-
-    integration = get_integration()
-    integration_working = integration is not None
+    # Gemini chats about alerts
+    result = integration.chat_about_alerts(
+        message,
+        cyoda_alerts,
+        conversation_history
+    )
 
     return jsonify({
         'success': True,
-        'integration_available': INTEGRATION_AVAILABLE,
-        'api_key_configured': api_key_configured,
-        'integration_working': integration_working,
-        'features': {
-            'analyze_and_alert': integration_working,
-            'natural_language_search': integration_working,
-            'trend_analysis': integration_working,
-            'report_generation': integration_working,
-            'chat': integration_working
-        }
+        **result
     })
+
+
+@gemini_cyoda_bp.route('/status', methods=['GET'])
+def integration_status():
+    """Check if Gemini-Cyoda integration is available."""
+    return public_cache(bytes_response(_status_body(gemini_cyoda_client is not None)), STATUS_TTL)
@@ -1,13 +1,13 @@
 """Gemini AI insights API routes."""
 
-import sys
-from pathlib import Path
-from flask import Blueprint, jsonify, request
+import logging
+import threading
+from flask import Blueprint, current_app, jsonify, request
 import os
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+from backend.api.json_utils import bytes_response, dumps_bytes, public_cache
+from backend.api.response_cache import build_cache, cached_json_response
+from backend.api.routes import STATUS_TTL
 
 try:
     from src.utils.gemini_ai import GeminiClimateAnalyst
@@ -16,32 +16,74 @@ except ImportError:
     GEMINI_AVAILABLE = False
 
 gemini_bp = Blueprint('gemini', __name__)
+logger = logging.getLogger(__name__)
+
+# Environment is read once; changing the key requires a restart anyway
+API_KEY_CONFIGURED = os.getenv('GEMINI_API_KEY') is not None
+
+# /status is invariant per process, so its body is encoded once
+_STATUS_BODY = dumps_bytes({
+    'success': True,
+    'available': GEMINI_AVAILABLE and API_KEY_CONFIGURED,
+    'configured': API_KEY_CONFIGURED,
+    'sdk_installed': GEMINI_AVAILABLE
+})
+
+# Gemini client, created once at blueprint registration and stored in
+# app.extensions['gemini']
+_client_lock = threading.Lock()
+
+# Identical insight requests are served from cache instead of re-running
+# a paid Gemini call; keys include the prompt version
+GEMINI_CACHE_TTL = int(os.getenv('GEMINI_CACHE_TTL', 3600))
+_gemini_cache = build_cache(maxsize=int(os.getenv('GEMINI_CACHE_SIZE', 256)))
+gemini_cache = cached_json_response(
+    _gemini_cache,
+    namespace='gemini',
+    version=GeminiClimateAnalyst.PROMPT_VERSION if GEMINI_AVAILABLE else 0,
+    ttl=GEMINI_CACHE_TTL
+)
+
+# /batch result key for each GeminiClimateAnalyst.SECTIONS kind, matching
+# the single-insight routes
+BATCH_RESPONSE_KEYS = {
+    'climate_summary': 'summary',
+    'ml_insights': 'insights',
+    'anomaly_report': 'report',
+    'recommendations': 'recommendations',
+    'comparative_analysis': 'analysis',
+    'executive_summary': 'executive_summary',
+    'seasonal_narrative': 'narrative',
+}
+
+
+@gemini_bp.record_once
+def _init_client(state):
+    """Create the Gemini client at startup so no request pays for SDK setup."""
+    app = state.app
+
+    with _client_lock:
+        if 'gemini' in app.extensions:
+            return
+
+        client = None
+        api_key = os.getenv('GEMINI_API_KEY')
+        if GEMINI_AVAILABLE and api_key:
+            try:
+                client = GeminiClimateAnalyst(api_key=api_key)
+            except Exception as e:
+                logger.warning("Failed to initialize Gemini: %s", e)
 
-# Global Gemini client
-gemini_client = None
+        app.extensions['gemini'] = client
 
 
 def get_gemini_client():
-    """Get or create Gemini client."""
-    global gemini_client
-
-    if not GEMINI_AVAILABLE:
-        return None
-
-    if gemini_client is None:
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            return None
-        try:
-            gemini_client = GeminiClimateAnalyst(api_key=api_key)
-        except Exception as e:
-            print(f"Failed to initialize Gemini: {e}")
-            return None
-
-    return gemini_client
+    """Get the Gemini client for the current app, or None if unavailable."""
+    return current_app.extensions.get('gemini')
 
 
 @gemini_bp.route('/climate-summary', methods=['POST'])
+@gemini_cache
 def climate_summary():
     """
     Generate AI climate summary.
@@ -83,6 +125,7 @@ def climate_summary():
 
 
 @gemini_bp.route('/ml-insights', methods=['POST'])
+@gemini_cache
 def ml_insights():
     """
     Generate insights from ML predictions.
@@ -124,6 +167,7 @@ def ml_insights():
 
 
 @gemini_bp.route('/anomaly-report', methods=['POST'])
+@gemini_cache
 def anomaly_report():
     """
     Generate anomaly analysis report.
@@ -164,6 +208,7 @@ def anomaly_report():
 
 
 @gemini_bp.route('/recommendations', methods=['POST'])
+@gemini_cache
 def recommendations():
     """
     Generate actionable recommendations.
@@ -205,6 +250,7 @@ def recommendations():
 
 
 @gemini_bp.route('/executive-summary', methods=['POST'])
+@gemini_cache
 def executive_summary():
     """
     Generate executive summary of full analysis.
@@ -247,6 +293,7 @@ def executive_summary():
 
 
 @gemini_bp.route('/seasonal-narrative', methods=['POST'])
+@gemini_cache
 def seasonal_narrative():
     """Generate seasonal forecast narrative."""
     try:
@@ -272,14 +319,80 @@ def seasonal_narrative():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@gemini_bp.route('/batch', methods=['POST'])
+def batch_insights():
+    """
+    Generate several insights concurrently in one request.
+
+    Useful for dashboards that need e.g. a summary, ML insights and
+    recommendations at once: the Gemini calls overlap instead of running
+    back to back.
+
+    Request body:
+        {
+            "requests": {
+                "climate_summary": {...climate_data...},
+                "ml_insights": {...ml_results...},
+                "recommendations": {...analysis_summary...}
+            }
+        }
+
+    Supported kinds are ``GeminiClimateAnalyst.SECTIONS``: climate_summary,
+    ml_insights, anomaly_report, recommendations, comparative_analysis
+    (payload ``{"current_data": ..., "historical_data": ...}``),
+    executive_summary, seasonal_narrative.
+
+    Not response-cached, since a batch can carry per-kind failures.
+
+    Returns:
+        {
+            "success": true,
+            "results": {
+                "climate_summary": {"success": true, "summary": "..."},
+                ...
+            }
+        }
+    """
+    try:
+        client = get_gemini_client()
+        if not client:
+            return jsonify({
+                'success': False,
+                'error': 'Gemini AI not configured.'
+            }), 503
+
+        data = request.get_json()
+        requested = data.get('requests', {})
+
+        if not requested:
+            return jsonify({'success': False, 'error': 'No requests provided'}), 400
+
+        unknown = sorted(set(requested) - set(GeminiClimateAnalyst.SECTIONS))
+        if unknown:
+            return jsonify({
+                'success': False,
+                'error': f"Unknown request kinds: {', '.join(unknown)}"
+            }), 400
+
+        outcomes = client.generate_all(requested, return_exceptions=True)
+
+        results = {}
+        for kind, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                results[kind] = {'success': False, 'error': str(outcome)}
+            else:
+                results[kind] = {'success': True, BATCH_RESPONSE_KEYS[kind]: outcome}
+
+        return jsonify({
+            'success': True,
+            'results': results
+        })
+
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 @gemini_bp.route('/status', methods=['GET'])
 def gemini_status():
     """Check Gemini AI availability."""
-    api_key = os.getenv('GEMINI_API_KEY')
-
-    return jsonify({
-        'success': True,
-        'available': GEMINI_AVAILABLE and api_key is not None,
-        'configured': api_key is not None,
-        'sdk_installed': GEMINI_AVAILABLE
-    })
+    return public_cache(bytes_response(_STATUS_BODY), STATUS_TTL)
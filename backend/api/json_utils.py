@@ -0,0 +1,239 @@
+"""JSON request/response helpers for API blueprints."""
+
+import hashlib
+import json
+from flask import Response, current_app, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import HTTPException
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if ORJSON_AVAILABLE else 0
+)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, so ``jsonify`` skips the stdlib encoder.
+
+    Types orjson doesn't handle natively (pandas Timestamps, Decimal, ...)
+    fall back to Flask's default conversions. Keys are not sorted, matching
+    ``Config.JSON_SORT_KEYS = False``; output is indented in debug mode,
+    as with the default provider.
+    """
+
+    sort_keys = False
+
+    def _option(self):
+        option = ORJSON_OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        """Serialize ``obj`` to a JSON string."""
+        return orjson.dumps(obj, default=self.default, option=self._option()).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        """Deserialize JSON from a string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response without the intermediate str round-trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self._option()),
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app):
+    """Use :class:`OrjsonProvider` for ``app`` when orjson is installed."""
+    if ORJSON_AVAILABLE:
+        app.json = OrjsonProvider(app)
+
+
+def parse_json(req):
+    """
+    Parse the JSON body of a request.
+
+    Uses orjson when installed; the raw body is cached on the request so
+    repeated calls don't re-read the stream.
+
+    Args:
+        req: Flask request
+
+    Returns:
+        Parsed JSON payload, or None if the body is empty
+    """
+    body = req.get_data(cache=True)
+    if not body:
+        return None
+
+    if ORJSON_AVAILABLE:
+        return orjson.loads(body)
+
+    return json.loads(body)
+
+
+# Rows per chunk written by stream_json_response
+STREAM_CHUNK_ROWS = 512
+
+
+def json_response(payload, status=200):
+    """
+    Serialize a payload to a JSON response.
+
+    Args:
+        payload: JSON-serializable object
+        status: HTTP status code
+
+    Returns:
+        Flask Response
+    """
+    if ORJSON_AVAILABLE:
+        return Response(
+            orjson.dumps(payload, option=ORJSON_OPTIONS),
+            status=status,
+            mimetype='application/json'
+        )
+
+    response = jsonify(payload)
+    response.status_code = status
+    return response
+
+
+def dumps_bytes(payload):
+    """Serialize a payload to JSON bytes, converting types like jsonify does."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=DefaultJSONProvider.default, option=ORJSON_OPTIONS)
+
+    return json.dumps(payload, default=DefaultJSONProvider.default).encode('utf-8')
+
+
+def stream_json_response(envelope, key, rows, status=200):
+    """
+    Stream a JSON object whose ``key`` holds a potentially large array.
+
+    The envelope is encoded up front and rows are serialized as they are
+    consumed, in chunks of ``STREAM_CHUNK_ROWS``, so the full response body
+    is never held in memory. Anything that can fail should run before this
+    is called: once streaming starts the status can't change.
+
+    Args:
+        envelope: Small dict of top-level fields
+        key: Name of the array field
+        rows: Iterable of JSON-serializable rows, consumed lazily
+        status: HTTP status code
+
+    Returns:
+        Streaming Flask Response
+    """
+    head = dumps_bytes(envelope)
+    prefix = (head[:-1] + b',' if envelope else b'{') + dumps_bytes(key) + b':['
+
+    def generate():
+        yield prefix
+        chunk = []
+        separator = b''
+        for row in rows:
+            chunk.append(dumps_bytes(row))
+            if len(chunk) == STREAM_CHUNK_ROWS:
+                yield separator + b','.join(chunk)
+                separator = b','
+                chunk = []
+        if chunk:
+            yield separator + b','.join(chunk)
+        yield b']}'
+
+    return Response(stream_with_context(generate()), status=status, mimetype='application/json')
+
+
+def bytes_response(body, status=200):
+    """Wrap pre-serialized JSON bytes in a Response."""
+    return Response(body, status=status, mimetype='application/json')
+
+
+def etag_json_response(payload):
+    """
+    Serialize a payload with a content ETag, answering 304 when it matches.
+
+    Args:
+        payload: JSON-serializable object
+
+    Returns:
+        Flask Response, conditional on the request's ``If-None-Match``
+    """
+    body = dumps_bytes(payload)
+    response = bytes_response(body)
+    response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+    return response.make_conditional(request)
+
+
+def public_cache(response, max_age):
+    """
+    Let clients and proxies reuse ``response`` for ``max_age`` seconds.
+
+    Args:
+        response: Flask Response
+        max_age: Seconds the response may be cached
+
+    Returns:
+        The same response, with ``Cache-Control: public, max-age=...``
+    """
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+def spec_responder(spec_key, message):
+    """
+    Build a responder for pass-through MCP specification endpoints.
+
+    The invariant ``{"success": true, <spec_key>: ..., "message": ...}``
+    envelope is encoded once, so each call only serializes the spec.
+
+    Args:
+        spec_key: Response key holding the specification
+        message: Static message returned alongside the specification
+
+    Returns:
+        Function taking a spec dict and returning a Flask Response
+    """
+    prefix = b'{"success":true,' + dumps_bytes(spec_key) + b':'
+    suffix = b',"message":' + dumps_bytes(message) + b'}'
+
+    def respond(spec):
+        return bytes_response(prefix + dumps_bytes(spec) + suffix)
+
+    return respond
+
+
+def json_error_handler(error):
+    """
+    Convert an unhandled view exception into the API's JSON error shape.
+
+    Register on a blueprint with
+    ``bp.register_error_handler(Exception, json_error_handler)`` instead
+    of wrapping every view in ``try/except``. HTTP errors raised by Flask
+    itself (404, 405, ...) keep their own status and response.
+
+    Args:
+        error: Exception raised by the view
+
+    Returns:
+        Tuple of JSON response and status code 500
+    """
+    if isinstance(error, HTTPException):
+        return error
+
+    current_app.logger.exception('Unhandled error handling %s', request.path)
+    return jsonify({'success': False, 'error': str(error)}), 500
@@ -1,14 +1,19 @@
 """ML model API routes."""
 
-import sys
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
 from flask import Blueprint, jsonify, request
 import numpy as np
 import pandas as pd
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+from backend.api.json_utils import etag_json_response, stream_json_response
+from backend.api.routes import _seasonal_series, status_bucket
 
 from src.models.lstm_model import LSTMTemperatureForecaster
 from src.models.prophet_model import ProphetSeasonalAnalyzer
@@ -16,6 +21,7 @@ from src.models.anomaly_detector import ClimateAnomalyDetector
 from src.models.climate_classifier import ClimatePatternClassifier
 
 ml_bp = Blueprint('ml', __name__)
+logger = logging.getLogger(__name__)
 
 # Global model instances (loaded on demand)
 lstm_model = None
@@ -23,28 +29,53 @@ prophet_model = None
 anomaly_detector = None
 climate_classifier = None
 
+# Per-model locks so concurrent first requests load each model once and
+# never see a half-loaded instance, while different models load in parallel
+_model_locks = {
+    'lstm': threading.Lock(),
+    'prophet': threading.Lock(),
+    'anomaly_detector': threading.Lock(),
+    'classifier': threading.Lock(),
+}
+
 
 def load_lstm_model():
     """Load LSTM model if not already loaded."""
     global lstm_model
     if lstm_model is None:
-        try:
-            lstm_model = LSTMTemperatureForecaster()
-            lstm_model.load_model('models/lstm_temperature.keras', 'models/lstm_scaler.pkl')
-        except Exception as e:
-            print(f"LSTM model not found: {e}")
+        with _model_locks['lstm']:
+            if lstm_model is None:
+                model = None
+                try:
+                    model = LSTMTemperatureForecaster()
+                    model.load_model('models/lstm_temperature.keras', 'models/lstm_scaler.pkl')
+                except Exception as e:
+                    logger.warning("LSTM model not found: %s", e)
+                lstm_model = model
     return lstm_model
 
 
+def _prophet_model_path(models_dir):
+    """Saved Prophet model, falling back to the pickle used before JSON."""
+    path = models_dir / 'prophet_seasonal.json'
+    if not path.exists() and (models_dir / 'prophet_seasonal.pkl').exists():
+        return models_dir / 'prophet_seasonal.pkl'
+    return path
+
+
 def load_prophet_model():
     """Load Prophet model if not already loaded."""
     global prophet_model
     if prophet_model is None:
-        try:
-            prophet_model = ProphetSeasonalAnalyzer()
-            prophet_model.load_model('models/prophet_seasonal.pkl')
-        except Exception as e:
-            print(f"Prophet model not found: {e}")
+        with _model_locks['prophet']:
+            if prophet_model is None:
+                model = None
+                try:
+                    model = ProphetSeasonalAnalyzer()
+                    model.load_model(_prophet_model_path(Path('models')))
+                except Exception as e:
+                    logger.warning("Prophet model not found: %s", e)
+                prophet_model = model
     return prophet_model
 
 
@@ -52,11 +83,15 @@ def load_anomaly_detector():
     """Load anomaly detector if not already loaded."""
     global anomaly_detector
     if anomaly_detector is None:
-        try:
-            anomaly_detector = ClimateAnomalyDetector()
-            anomaly_detector.load_model('models/anomaly_model.pkl', 'models/anomaly_scaler.pkl')
-        except Exception as e:
-            print(f"Anomaly detector not found: {e}")
+        with _model_locks['anomaly_detector']:
+            if anomaly_detector is None:
+                model = None
+                try:
+                    model = ClimateAnomalyDetector()
+                    model.load_model('models/anomaly_model.pkl', 'models/anomaly_scaler.pkl')
+                except Exception as e:
+                    logger.warning("Anomaly detector not found: %s", e)
+                anomaly_detector = model
     return anomaly_detector
 
 
@@ -64,14 +99,125 @@ def load_climate_classifier():
     """Load climate classifier if not already loaded."""
     global climate_classifier
     if climate_classifier is None:
-        try:
-            climate_classifier = ClimatePatternClassifier()
-            climate_classifier.load_model('models/climate_classifier.pkl')
-        except Exception as e:
-            print(f"Climate classifier not found: {e}")
+        with _model_locks['classifier']:
+            if climate_classifier is None:
+                model = None
+                try:
+                    model = ClimatePatternClassifier()
+                    model.load_model('models/climate_classifier.pkl')
+                except Exception as e:
+                    logger.warning("Climate classifier not found: %s", e)
+                climate_classifier = model
     return climate_classifier
 
 
+# Processes running LSTM/Prophet inference; 0 runs it on the request thread
+ML_INFERENCE_PROCESSES = int(os.getenv('ML_INFERENCE_PROCESSES', 0))
+
+_inference_pool = None
+_inference_pool_lock = threading.Lock()
+
+
+def _init_inference_worker():
+    """Load the forecasting models once in each inference process."""
+    load_lstm_model()
+    load_prophet_model()
+
+
+def get_inference_pool():
+    """
+    Return the shared forecasting process pool, or None if disabled.
+
+    Worker processes are spawned rather than forked so TensorFlow state is
+    never inherited from the server process. Only arrays and plain dicts
+    cross the process boundary; each worker loads its own models.
+    """
+    global _inference_pool
+    if ML_INFERENCE_PROCESSES <= 0:
+        return None
+    if _inference_pool is None:
+        with _inference_pool_lock:
+            if _inference_pool is None:
+                _inference_pool = ProcessPoolExecutor(
+                    max_workers=ML_INFERENCE_PROCESSES,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_inference_worker
+                )
+    return _inference_pool
+
+
+def run_inference(fn, *args):
+    """Run ``fn(*args)`` in the inference pool if enabled, else inline."""
+    pool = get_inference_pool()
+    if pool is None:
+        return fn(*args)
+
+    return pool.submit(fn, *args).result()
+
+
+def _lstm_predict(recent_temps, steps):
+    """LSTM forecast as float arrays, or None if the model is unavailable."""
+    model = load_lstm_model()
+    if model is None:
+        return None
+
+    predictions, lower, upper = model.predict(recent_data=recent_temps, steps=steps)
+    return (
+        np.asarray(predictions, dtype=float),
+        np.asarray(lower, dtype=float),
+        np.asarray(upper, dtype=float)
+    )
+
+
+def _prophet_summary(forecast_days):
+    """Prophet forecast summary, or None if the model is unavailable."""
+    model = load_prophet_model()
+    if model is None:
+        return None
+
+    # Only future rows are read (every day of the horizon is listed for
+    # paging, the statistics cover the last min(90, days)), so the training
+    # history is not re-predicted
+    forecast = model.forecast(periods=forecast_days, freq='D', include_history=forecast_days <= 0)
+    return model.get_forecast_summary(
+        forecast, last_n=min(90, forecast_days), prediction_rows=forecast_days
+    )
+
+
+def warmup_forecasting_models():
+    """
+    Load the LSTM and Prophet models in this process.
+
+    Skipped when the inference pool is enabled, since the forecasting
+    models then live in its processes. gunicorn calls this from
+    ``post_fork`` so TensorFlow and cmdstan state is created in each
+    worker rather than inherited from the preloading master.
+    """
+    if get_inference_pool() is not None:
+        return
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='model-warmup') as executor:
+        wait([executor.submit(load_lstm_model), executor.submit(load_prophet_model)])
+
+
+def warmup_models(forecasting=True):
+    """
+    Load ML models concurrently, so no request pays for deserialization.
+
+    Each loader holds only its own lock, so the loads overlap (Keras graph
+    build and joblib unpickling release the GIL for much of their I/O).
+
+    Args:
+        forecasting: Also load the LSTM and Prophet models (see
+            :func:`warmup_forecasting_models`). Pass False before forking,
+            so only the fork-safe joblib models are loaded.
+    """
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='model-warmup') as executor:
+        loads = [executor.submit(load_anomaly_detector), executor.submit(load_climate_classifier)]
+        if forecasting:
+            warmup_forecasting_models()
+        wait(loads)
+
+
 @ml_bp.route('/lstm-forecast', methods=['POST'])
 def lstm_forecast():
     """
@@ -88,43 +234,43 @@ def lstm_forecast():
         recent_temps = data.get('recent_temperatures', [])
         forecast_days = data.get('forecast_days', 30)
 
-        # Load model
-        model = load_lstm_model()
-        if model is None:
-            return jsonify({
-                'success': False,
-                'error': 'LSTM model not trained yet. Run train_ml_models.py first.'
-            }), 503
-
         # Generate forecast
         if len(recent_temps) < 60:
             # Generate sample data if not enough provided
-            recent_temps = 18 + 8 * np.sin(2 * np.pi * np.arange(60) / 365.25) + np.random.normal(0, 1, 60)
+            recent_temps = _seasonal_series(60, base=18, amplitude=8, sigma=1)
 
-        predictions, lower, upper = model.predict(
-            recent_data=np.array(recent_temps),
-            steps=forecast_days
-        )
+        result = run_inference(_lstm_predict, np.array(recent_temps), forecast_days)
+        if result is None:
+            return jsonify({
+                'success': False,
+                'error': 'LSTM model not trained yet. Run train_ml_models.py first.'
+            }), 503
+        predictions, lower, upper = result
 
         # Format response
-        forecast_dates = pd.date_range(start=pd.Timestamp.now(), periods=forecast_days, freq='D')
+        forecast_dates = np.datetime64(date.today(), 'D') + np.arange(forecast_days)
+        date_strs = np.datetime_as_string(forecast_dates, unit='D').tolist()
 
-        forecast_data = [
+        forecast_rows = (
             {
-                'date': date.strftime('%Y-%m-%d'),
-                'predicted': float(pred),
-                'lower_bound': float(low),
-                'upper_bound': float(up)
+                'date': date,
+                'predicted': pred,
+                'lower_bound': low,
+                'upper_bound': up
             }
-            for date, pred, low, up in zip(forecast_dates, predictions, lower, upper)
-        ]
+            for date, pred, low, up in zip(
+                date_strs,
+                predictions.tolist(),
+                lower.tolist(),
+                upper.tolist()
+            )
+        )
 
-        return jsonify({
-            'success': True,
-            'forecast': forecast_data,
-            'model': 'LSTM',
-            'forecast_days': forecast_days
-        })
+        return stream_json_response(
+            {'success': True, 'model': 'LSTM', 'forecast_days': forecast_days},
+            'forecast',
+            forecast_rows
+        )
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -132,29 +278,41 @@ def lstm_forecast():
 
 @ml_bp.route('/prophet-forecast', methods=['GET'])
 def prophet_forecast():
-    """Get Prophet seasonal forecast."""
+    """
+    Get Prophet seasonal forecast.
+
+    Query params:
+        days: Forecast horizon in days; every day can be paged through
+            (``total`` equals ``days``)
+        offset: Index of the first prediction returned
+        limit: Maximum number of predictions returned
+    """
     try:
         forecast_days = int(request.args.get('days', 365))
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = max(request.args.get('limit', 365, type=int), 0)
 
-        # Load model
-        model = load_prophet_model()
-        if model is None:
+        # Generate forecast
+        summary = run_inference(_prophet_summary, forecast_days)
+        if summary is None:
             return jsonify({
                 'success': False,
                 'error': 'Prophet model not trained yet. Run train_ml_models.py first.'
             }), 503
 
-        # Generate forecast
-        forecast = model.forecast(periods=forecast_days, freq='D')
-        summary = model.get_forecast_summary(forecast, last_n=min(90, forecast_days))
-
-        return jsonify({
+        # Pages are small and deterministic per model, so they get an ETag
+        # and repeat requests can be answered with 304
+        predictions = summary['predictions']
+        return etag_json_response({
             'success': True,
-            'forecast': summary['predictions'][:100],  # Limit to 100 days for response size
             'trend_direction': summary['trend_direction'],
             'mean_prediction': summary['mean_prediction'],
             'uncertainty_range': summary['uncertainty_range'],
-            'model': 'Prophet'
+            'model': 'Prophet',
+            'offset': offset,
+            'limit': limit,
+            'total': len(predictions),
+            'forecast': predictions[offset:offset + limit]
         })
 
     except Exception as e:
@@ -189,23 +347,36 @@ def detect_anomalies():
                 'error': 'Anomaly detector not trained yet. Run train_ml_models.py first.'
             }), 503
 
-        # Prepare dataframe
-        df = pd.DataFrame(climate_data)
+        # Columnar inputs; missing values become NaN as they would in a DataFrame
+        values = np.array([r.get('value') for r in climate_data], dtype=np.float64)
+        dates = [r.get('date') for r in climate_data]
+        dates = pd.to_datetime(dates) if any(d is not None for d in dates) else None
 
         # Detect anomalies
-        results = detector.detect(df, value_column='value')
-        summary = detector.get_anomaly_summary(results)
+        is_anomaly, scores = detector.detect_arrays(values, dates)
+        total_anomalies = int(np.count_nonzero(is_anomaly))
 
         # Format response
-        anomalies = results[results['is_anomaly'] == True]
+        anomaly_dates = dates[is_anomaly] if dates is not None else [None] * total_anomalies
+        anomaly_rows = (
+            {'date': date, 'value': value, 'anomaly_score': score}
+            for date, value, score in zip(
+                anomaly_dates,
+                values[is_anomaly].tolist(),
+                scores[is_anomaly].tolist()
+            )
+        )
 
-        return jsonify({
-            'success': True,
-            'total_anomalies': summary['total_anomalies'],
-            'anomaly_percentage': summary['anomaly_percentage'],
-            'anomalies': anomalies[['date', 'value', 'anomaly_score']].to_dict('records'),
-            'model': 'IsolationForest'
-        })
+        return stream_json_response(
+            {
+                'success': True,
+                'total_anomalies': total_anomalies,
+                'anomaly_percentage': total_anomalies / len(values) * 100,
+                'model': 'IsolationForest'
+            },
+            'anomalies',
+            anomaly_rows
+        )
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -239,30 +410,34 @@ def classify_patterns():
                 'error': 'Climate classifier not trained yet. Run train_ml_models.py first.'
             }), 503
 
-        # Prepare dataframe
-        df = pd.DataFrame(climate_data)
+        # Columnar inputs; missing values become NaN as they would in a DataFrame
+        temps = np.array([r.get('temperature') for r in climate_data], dtype=np.float64)
+        precips = np.array([r.get('precipitation') for r in climate_data], dtype=np.float64)
+        dates = [r.get('date') for r in climate_data]
+        date_index = pd.to_datetime(dates) if any(d is not None for d in dates) else None
 
         # Classify
-        predictions, probabilities = classifier.predict(
-            df,
-            temp_column='temperature',
-            precip_column='precipitation'
-        )
+        predictions, probabilities = classifier.predict_arrays(temps, precips, date_index)
 
         # Format response
-        results = []
-        for i, (pred, prob) in enumerate(zip(predictions, probabilities)):
-            results.append({
-                'date': climate_data[i].get('date'),
+        classification_rows = (
+            {
+                'date': date,
                 'pattern': pred,
-                'confidence': float(prob.max())
-            })
+                'confidence': confidence
+            }
+            for date, pred, confidence in zip(
+                dates,
+                predictions.tolist(),
+                probabilities.max(axis=1).tolist()
+            )
+        )
 
-        return jsonify({
-            'success': True,
-            'classifications': results[:100],  # Limit response size
-            'model': 'RandomForest'
-        })
+        return stream_json_response(
+            {'success': True, 'model': 'RandomForest'},
+            'classifications',
+            classification_rows
+        )
 
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
@@ -271,20 +446,24 @@ def classify_patterns():
 @ml_bp.route('/model-status', methods=['GET'])
 def model_status():
     """Check which ML models are available."""
-    import os
+    return jsonify(_model_status(status_bucket()))
+
 
+@lru_cache(maxsize=1)
+def _model_status(bucket):
+    """Model file checks, reused for the current status time bucket."""
     models_dir = Path('models')
     models_dir.mkdir(exist_ok=True)
 
     status = {
-        'lstm': os.path.exists('models/lstm_temperature.keras'),
-        'prophet': os.path.exists('models/prophet_seasonal.pkl'),
-        'anomaly_detector': os.path.exists('models/anomaly_model.pkl'),
-        'classifier': os.path.exists('models/climate_classifier.pkl')
+        'lstm': (models_dir / 'lstm_temperature.keras').exists(),
+        'prophet': _prophet_model_path(models_dir).exists(),
+        'anomaly_detector': (models_dir / 'anomaly_model.pkl').exists(),
+        'classifier': (models_dir / 'climate_classifier.pkl').exists()
     }
 
-    return jsonify({
+    return {
         'success': True,
         'models': status,
         'all_trained': all(status.values())
-    })
+    }
@@ -0,0 +1,242 @@
+"""Content-addressed caching of JSON responses for expensive endpoints."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import wraps
+
+from flask import Response, current_app, request
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached bytes for ``key``, or None if missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, prefix):
+        """Drop every entry whose key starts with ``prefix``."""
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+class RedisCache:
+    """Redis-backed cache shared by all workers; errors count as misses."""
+
+    def __init__(self, client):
+        """
+        Initialize cache.
+
+        Args:
+            client: Connected ``redis.Redis`` instance
+        """
+        self.client = client
+
+    def get(self, key):
+        """Return the cached bytes for ``key``, or None."""
+        try:
+            return self.client.get(key)
+        except redis.RedisError as e:
+            logger.debug("Redis get failed: %s", e)
+            return None
+
+    def set(self, key, value, ttl):
+        """Store ``value`` under ``key`` with SETEX."""
+        try:
+            self.client.setex(key, ttl, value)
+        except redis.RedisError as e:
+            logger.debug("Redis set failed: %s", e)
+
+    def invalidate(self, prefix):
+        """Delete every key under ``prefix``."""
+        try:
+            for key in self.client.scan_iter(match=prefix + '*'):
+                self.client.delete(key)
+        except redis.RedisError as e:
+            logger.debug("Redis invalidate failed: %s", e)
+
+
+class InflightRequests:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key runs the work; callers arriving while it is
+    still running wait on the same Future and receive its result (or
+    exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        """Initialize the in-flight table."""
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def run(self, key, fn):
+        """
+        Run ``fn`` once for all concurrent callers with the same ``key``.
+
+        Args:
+            key: Deduplication key
+            fn: Zero-argument callable doing the work
+
+        Returns:
+            Tuple of (result of ``fn``, whether this caller ran it)
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+
+        if not leader:
+            return future.result(), False
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+        return future.result(), True
+
+
+def build_cache(maxsize: int = 256):
+    """
+    Create the response cache backend.
+
+    Uses Redis when the client library is installed and ``REDIS_HOST`` is
+    set and reachable, so all workers share hits; otherwise an in-process
+    LRU.
+
+    Args:
+        maxsize: Entry limit for the in-process fallback
+
+    Returns:
+        MemoryCache or RedisCache
+    """
+    host = os.getenv('REDIS_HOST')
+    if REDIS_AVAILABLE and host:
+        try:
+            client = redis.Redis(
+                host=host,
+                port=int(os.getenv('REDIS_PORT', 6379)),
+                db=int(os.getenv('REDIS_DB', 0)),
+                socket_timeout=0.5
+            )
+            client.ping()
+            return RedisCache(client)
+        except redis.RedisError as e:
+            logger.warning("Redis unavailable, using in-memory response cache: %s", e)
+
+    return MemoryCache(maxsize=maxsize)
+
+
+def payload_key(prefix, payload):
+    """
+    Build a stable cache key from a JSON payload.
+
+    Args:
+        prefix: Namespace, endpoint and version prefix
+        payload: Parsed JSON body
+
+    Returns:
+        ``prefix`` followed by a 128-bit BLAKE2b digest of the canonical JSON
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return prefix + hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def cached_json_response(cache, namespace, version, ttl):
+    """
+    Cache a view's successful JSON responses keyed on its request body.
+
+    Identical payloads to the same endpoint are served from the cache
+    until ``ttl`` expires. Bump ``version`` when the output for a given
+    payload changes (e.g. new prompt templates). Only 200 responses are
+    stored. Identical requests arriving while a miss is being computed
+    wait for that result instead of calling the view again.
+
+    Args:
+        cache: Backend from :func:`build_cache`
+        namespace: Key namespace, e.g. ``'gemini'``
+        version: Output version folded into the key
+        ttl: Seconds to keep entries
+
+    Returns:
+        View decorator
+    """
+    def decorator(view):
+        prefix = f'{namespace}:{version}:{view.__name__}:'
+        inflight = InflightRequests()
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = payload_key(prefix, request.get_json(silent=True))
+
+            body = cache.get(key)
+            if body is not None:
+                response = Response(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            def compute():
+                response = current_app.make_response(view(*args, **kwargs))
+                body = response.get_data()
+                if response.status_code == 200:
+                    cache.set(key, body, ttl)
+                return body, response.status_code, response.mimetype
+
+            (body, status, mimetype), leader = inflight.run(key, compute)
+            response = Response(body, status=status, mimetype=mimetype)
+            response.headers['X-Cache'] = 'MISS' if leader else 'COALESCED'
+            return response
+
+        return wrapper
+
+    return decorator
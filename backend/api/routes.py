@@ -1,57 +1,189 @@
 """API routes for climate data and predictions."""
 
-from flask import Blueprint, jsonify, request
+import hashlib
+import importlib.util
+import os
+import sys
+import time
+from functools import lru_cache, wraps
+from flask import Blueprint, Response, current_app, jsonify, request
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
-from pathlib import Path
+
+from backend.api.json_utils import public_cache, stream_json_response
+from backend.config.config import DATA_DIR, MODELS_DIR
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 api_bp = Blueprint('api', __name__)
 
+DAYS_PER_YEAR = 365.25
+
+# Seconds filesystem status checks are reused by /health
+STATUS_TTL = 5
+
+
+def _module_available(name):
+    """Check whether a module is installed without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Process-level facts, resolved once at import
+PYTHON_VERSION = sys.version.split()[0]
+DEPENDENCIES = {
+    'flask': True,
+    'pandas': True,
+    'numpy': True,
+    'tensorflow': _module_available('tensorflow'),
+    'gemini': _module_available('google.generativeai'),
+}
+
+
+# Bump when the underlying dataset changes so clients revalidate their copies
+DATA_VERSION = os.getenv('DATA_VERSION', '1')
+DATA_MAX_AGE = int(os.getenv('DATA_MAX_AGE', 3600))
+
+
+def data_etag(*params):
+    """
+    Conditional-GET support for views determined by their query params.
+
+    The ETag is derived from the named query parameters and
+    ``DATA_VERSION``, so a matching ``If-None-Match`` is answered with 304
+    before the view builds or serializes anything.
+
+    Args:
+        *params: Query parameter names the response depends on
+
+    Returns:
+        View decorator
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = '|'.join([view.__name__, *(str(request.args.get(p)) for p in params), DATA_VERSION])
+            etag = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+
+            response.set_etag(etag, weak=True)
+            response.cache_control.max_age = DATA_MAX_AGE
+            response.headers['X-Data-Version'] = DATA_VERSION
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def status_bucket():
+    """Time bucket that changes every ``STATUS_TTL`` seconds, for lru_cache keys."""
+    return int(time.monotonic() // STATUS_TTL)
+
+
+@lru_cache(maxsize=1)
+def _directory_status(bucket):
+    """Existence of the models/ and data/ directories, cached per time bucket."""
+    return {
+        'models_directory': MODELS_DIR.exists(),
+        'data_directory': DATA_DIR.exists(),
+    }
+
+
+# Shared per-process generator (PCG64); faster than the legacy global RNG
+_RNG = np.random.default_rng()
+
+# Annual sine cycle for the longest typical request, computed once at import
+SEASONAL_TABLE_DAYS = 4096
+_SEASONAL = np.sin(2 * np.pi * np.arange(SEASONAL_TABLE_DAYS) / DAYS_PER_YEAR)
+
+# Sample trend years and their linear warming baseline
+TREND_YEARS = list(range(1990, 2024))
+_TREND_BASE = 17 + 0.015 * np.arange(len(TREND_YEARS))
+
+
+def _seasonal_cycle(n):
+    """Annual sine cycle over ``n`` days, sliced from the precomputed table."""
+    if n <= SEASONAL_TABLE_DAYS:
+        return _SEASONAL[:n]
+
+    return np.sin(2 * np.pi * np.arange(n) / DAYS_PER_YEAR)
+
+
+def _seasonal_series_numpy(seasonal, base, amplitude, sigma, noise):
+    """NumPy fallback for :func:`_seasonal_series`."""
+    values = base + amplitude * seasonal
+    if sigma > 0:
+        noise *= sigma
+        values += noise
+    return values
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _seasonal_series_jit(seasonal, base, amplitude, sigma, noise):
+        """Fill base + annual sine + scaled standard-normal noise in one fused loop."""
+        n = seasonal.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            out[i] = base + amplitude * seasonal[i]
+            if sigma > 0:
+                out[i] += sigma * noise[i]
+        return out
+
+    # Compile (or load from cache) at import, not on the first request
+    _seasonal_series_jit(_SEASONAL[:1], 0.0, 0.0, 0.0, _SEASONAL[:0])
+
+
+def _seasonal_series(n, base, amplitude, sigma=0.0):
+    """
+    Daily series with an annual seasonal cycle and optional noise.
+
+    Args:
+        n: Number of days
+        base: Mean level
+        amplitude: Seasonal amplitude
+        sigma: Standard deviation of Gaussian noise (0 for none)
+
+    Returns:
+        float64 array of length n
+    """
+    seasonal = _seasonal_cycle(n)
+    noise = _RNG.standard_normal(n) if sigma > 0 else _SEASONAL[:0]
+    if NUMBA_AVAILABLE:
+        return _seasonal_series_jit(seasonal, float(base), float(amplitude), float(sigma), noise)
+
+    return _seasonal_series_numpy(seasonal, base, amplitude, sigma, noise)
+
 
 @api_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint for Docker and monitoring."""
-    import sys
-    import os
-
     health_status = {
         'status': 'healthy',
         'timestamp': datetime.utcnow().isoformat(),
         'version': '1.0.0',
-        'python_version': sys.version.split()[0],
-        'dependencies': {
-            'flask': True,
-            'pandas': True,
-            'numpy': True,
-        }
+        'python_version': PYTHON_VERSION,
+        'dependencies': DEPENDENCIES,
+        **_directory_status(status_bucket())
     }
 
-    # Check if ML dependencies are available
-    try:
-        import tensorflow
-        health_status['dependencies']['tensorflow'] = True
-    except ImportError:
-        health_status['dependencies']['tensorflow'] = False
-
-    try:
-        import google.generativeai
-        health_status['dependencies']['gemini'] = True
-    except ImportError:
-        health_status['dependencies']['gemini'] = False
-
-    # Check if models directory exists
-    models_dir = Path(__file__).parent.parent.parent / 'models'
-    health_status['models_directory'] = models_dir.exists()
-
-    # Check if data directory exists
-    data_dir = Path(__file__).parent.parent.parent / 'data'
-    health_status['data_directory'] = data_dir.exists()
-
-    return jsonify(health_status), 200
+    return public_cache(jsonify(health_status), STATUS_TTL)
 
 
 @api_bp.route('/climate-data', methods=['GET'])
+@data_etag('start_date', 'end_date', 'metric')
 def get_climate_data():
     """
     Get historical climate data.
@@ -70,11 +202,7 @@ def get_climate_data():
     # For now, generate sample data
     data = generate_sample_climate_data(start_date, end_date, metric)
 
-    return jsonify({
-        'success': True,
-        'data': data,
-        'metric': metric
-    })
+    return stream_json_response({'success': True, 'metric': metric}, 'data', data)
 
 
 @api_bp.route('/predictions', methods=['POST'])
@@ -99,14 +227,11 @@ def get_predictions():
     # For now, generate sample predictions
     predictions = generate_sample_predictions(start_date, end_date, metric)
 
-    return jsonify({
-        'success': True,
-        'predictions': predictions,
-        'metric': metric
-    })
+    return stream_json_response({'success': True, 'metric': metric}, 'predictions', predictions)
 
 
 @api_bp.route('/statistics', methods=['GET'])
+@data_etag()
 def get_statistics():
     """
     Get climate statistics summary.
@@ -136,6 +261,7 @@ def get_statistics():
 
 
 @api_bp.route('/trends', methods=['GET'])
+@data_etag('metric')
 def get_trends():
     """
     Get long-term climate trends.
@@ -167,22 +293,20 @@ def generate_sample_climate_data(start_date, end_date, metric):
     # Generate sample data based on metric
     if metric == 'temperature':
         # Simulate temperature with seasonal pattern
-        base = 18
-        seasonal = 8 * np.sin(2 * np.pi * np.arange(len(dates)) / 365.25)
-        noise = np.random.normal(0, 2, len(dates))
-        values = base + seasonal + noise
+        values = _seasonal_series(len(dates), base=18, amplitude=8, sigma=2)
     elif metric == 'precipitation':
         # Simulate precipitation
-        values = np.random.gamma(2, 3, len(dates))
+        values = _RNG.gamma(2, 3, len(dates))
     else:
-        values = np.random.randn(len(dates)) * 10 + 50
+        values = _RNG.standard_normal(len(dates))
+        values *= 10
+        values += 50
+
+    date_strs = np.datetime_as_string(dates.values, unit='D').tolist()
 
     data = [
-        {
-            'date': date.strftime('%Y-%m-%d'),
-            'value': float(value)
-        }
-        for date, value in zip(dates, values)
+        {'date': date, 'value': value}
+        for date, value in zip(date_strs, values.tolist())
     ]
 
     return data
@@ -202,22 +326,30 @@ def generate_sample_predictions(start_date, end_date, metric):
 
     # Generate predictions with confidence intervals
     if metric == 'temperature':
-        base = 19  # Slightly higher than historical
-        seasonal = 8 * np.sin(2 * np.pi * np.arange(len(dates)) / 365.25)
-        values = base + seasonal
+        # Slightly higher than historical
+        values = _seasonal_series(len(dates), base=19, amplitude=8)
         uncertainty = 1.5
     else:
-        values = np.random.randn(len(dates)) * 10 + 52
+        values = _RNG.standard_normal(len(dates))
+        values *= 10
+        values += 52
         uncertainty = 3.0
 
+    date_strs = np.datetime_as_string(dates.values, unit='D').tolist()
+
     predictions = [
         {
-            'date': date.strftime('%Y-%m-%d'),
-            'predicted': float(value),
-            'lower_bound': float(value - uncertainty),
-            'upper_bound': float(value + uncertainty)
+            'date': date,
+            'predicted': value,
+            'lower_bound': lower,
+            'upper_bound': upper
         }
-        for date, value in zip(dates, values)
+        for date, value, lower, upper in zip(
+            date_strs,
+            values.tolist(),
+            (values - uncertainty).tolist(),
+            (values + uncertainty).tolist()
+        )
     ]
 
     return predictions
@@ -225,22 +357,18 @@ def generate_sample_predictions(start_date, end_date, metric):
 
 def generate_sample_trends(metric):
     """Generate sample trend data."""
-    years = list(range(1990, 2024))
+    n = len(TREND_YEARS)
 
     if metric == 'temperature':
         # Simulate increasing temperature trend
-        base_values = 17 + 0.015 * np.arange(len(years))
-        values = base_values + np.random.normal(0, 0.3, len(years))
+        values = _TREND_BASE + _RNG.normal(0, 0.3, n)
     else:
         # Simulate stable precipitation
-        values = 1200 + np.random.normal(0, 100, len(years))
+        values = 1200 + _RNG.normal(0, 100, n)
 
     trends = [
-        {
-            'year': year,
-            'value': float(value)
-        }
-        for year, value in zip(years, values)
+        {'year': year, 'value': value}
+        for year, value in zip(TREND_YEARS, values.tolist())
     ]
 
     return trends
@@ -0,0 +1,84 @@
+"""Request payload validation with compiled JSON Schemas."""
+
+try:
+    import fastjsonschema
+    from fastjsonschema import JsonSchemaException as ValidationError
+    FASTJSONSCHEMA_AVAILABLE = True
+except ImportError:
+    FASTJSONSCHEMA_AVAILABLE = False
+
+    class ValidationError(ValueError):
+        """Raised when a payload does not match its schema."""
+
+        def __init__(self, message):
+            super().__init__(message)
+            self.message = message
+
+
+_TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+}
+
+
+def _compile_fallback(schema):
+    """
+    Compile the subset of JSON Schema used by the API routes.
+
+    Supports a top-level ``object`` with ``required`` and per-property
+    ``type`` (single or list) and ``minLength``. Lookups are resolved
+    once here so each call is a flat loop over precomputed tuples.
+    """
+    required = tuple(schema.get('required', ()))
+    required_message = f'data must contain [{", ".join(repr(r) for r in required)}] properties'
+    properties = []
+    for name, spec in schema.get('properties', {}).items():
+        types = spec['type'] if isinstance(spec['type'], list) else [spec['type']]
+        checks = tuple(_TYPE_CHECKS[t] for t in types)
+        properties.append((name, checks, ', '.join(types), spec.get('minLength')))
+    properties = tuple(properties)
+
+    def validate(data):
+        if not isinstance(data, dict):
+            raise ValidationError('data must be object')
+
+        for name in required:
+            if name not in data:
+                raise ValidationError(required_message)
+
+        for name, checks, type_name, min_length in properties:
+            if name not in data:
+                continue
+            value = data[name]
+            if not any(check(value) for check in checks):
+                raise ValidationError(f'data.{name} must be {type_name}')
+            if min_length is not None and isinstance(value, str) and len(value) < min_length:
+                raise ValidationError(f'data.{name} must be longer than or equal to {min_length} characters')
+
+        return data
+
+    return validate
+
+
+def compile_schema(schema):
+    """
+    Compile a JSON Schema into a validator function.
+
+    Uses fastjsonschema when installed, which generates straight-line
+    Python code for the schema; otherwise a minimal built-in validator.
+
+    Args:
+        schema: JSON Schema dict
+
+    Returns:
+        Function that returns the payload or raises ValidationError
+    """
+    if FASTJSONSCHEMA_AVAILABLE:
+        return fastjsonschema.compile(schema)
+
+    return _compile_fallback(schema)
@@ -1,20 +1,28 @@
 """Main Flask application."""
 
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+import os
 
 from flask import Flask
 from flask_cors import CORS
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+from src.utils.helpers import setup_logging
+
+# Configure logging before the blueprints log their startup warnings
+setup_logging(level=os.getenv('LOG_LEVEL', 'INFO'))
+
+from backend.api.json_utils import init_json_provider
 from backend.api.routes import api_bp
 from backend.config.config import Config
 
 # Try to import ML routes (optional if dependencies not installed)
 try:
-    from backend.api.ml_routes import ml_bp
+    from backend.api.ml_routes import ml_bp, warmup_models
     ML_AVAILABLE = True
 except ImportError as e:
     print(f"ML routes not available: {e}")
@@ -59,9 +67,15 @@ def create_app(config_class=Config):
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    init_json_provider(app)
+
+    # Enable CORS for React frontend; browsers cache the preflight for
+    # max_age seconds instead of sending an OPTIONS before every JSON POST
+    CORS(app, resources={r"/api/*": {"origins": "*"}}, max_age=600)
 
-    # Enable CORS for React frontend
-    CORS(app, resources={r"/api/*": {"origins": "*"}})
+    # gzip/brotli JSON responses for clients that accept it
+    if COMPRESS_AVAILABLE:
+        Compress(app)
 
     # Register blueprints
     app.register_blueprint(api_bp, url_prefix='/api')
@@ -69,6 +83,13 @@ def create_app(config_class=Config):
     # Register ML routes if available
     if ML_AVAILABLE:
         app.register_blueprint(ml_bp, url_prefix='/api/ml')
+        # Load models up front only when serving (gunicorn.conf.py sets this);
+        # scripts and tests importing the app load them on first use.
+        # 'preload' is a gunicorn master about to fork: its workers load
+        # the forecasting models themselves in post_fork
+        warmup = os.getenv('APP_WARMUP')
+        if warmup in ('1', 'preload'):
+            warmup_models(forecasting=warmup == '1')
         print("✓ ML routes registered")
     else:
         print("✗ ML routes not available (dependencies not installed)")
@@ -3,23 +3,28 @@
 import os
 from pathlib import Path
 
+# Project paths, resolved once at import
+BASE_DIR = Path(__file__).parent.parent.parent
+DATA_DIR = BASE_DIR / 'data'
+MODELS_DIR = BASE_DIR / 'models'
+
 
 class Config:
     """Base configuration."""
 
     # Project root directory
-    BASE_DIR = Path(__file__).parent.parent.parent
+    BASE_DIR = BASE_DIR
 
     # Secret key for sessions
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
 
     # Data paths
-    DATA_DIR = BASE_DIR / 'data'
+    DATA_DIR = DATA_DIR
     RAW_DATA_DIR = DATA_DIR / 'raw'
     PROCESSED_DATA_DIR = DATA_DIR / 'processed'
 
     # Model paths
-    MODELS_DIR = BASE_DIR / 'models'
+    MODELS_DIR = MODELS_DIR
 
     # API configuration
     JSON_SORT_KEYS = False
@@ -0,0 +1,47 @@
+"""Gunicorn settings for the Flask backend.
+
+Gemini and Cyoda calls spend most of their time waiting on the network,
+so each worker runs a thread pool (gthread) instead of serving one
+request at a time. Shared module state in the API blueprints is
+lock-protected for this.
+
+The app is preloaded in the master and the joblib models (anomaly
+detector, classifier) are loaded there before the workers fork, so worker
+processes share those pages copy-on-write. TensorFlow and cmdstan are not
+fork-safe, so the LSTM and Prophet models are loaded in each worker after
+it forks (or in the spawned inference pool, see ML_INFERENCE_PROCESSES).
+
+Usage: gunicorn backend.app:app  (this file is picked up from the cwd)
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('GUNICORN_WORKERS', 4))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 120))
+
+# Hold idle client connections open so dashboards issuing many /api/*
+# calls reuse one connection instead of reconnecting per request
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 30))
+
+# Import the app (and warm up the joblib models) once in the master
+# before forking
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+os.environ.setdefault('APP_WARMUP', 'preload' if preload_app else '1')
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Load the forecasting models in each worker after it forks."""
+    if os.environ.get('APP_WARMUP') != 'preload':
+        return
+
+    try:
+        from backend.api.ml_routes import warmup_forecasting_models
+    except ImportError:
+        return
+    warmup_forecasting_models()
@@ -18,41 +18,75 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
-from datetime import datetime, timedelta
-import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+import numpy as np
 
 API_BASE = "http://localhost:5000/api"
 
+# One session for the whole demo, so every call reuses a kept-alive connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
-def generate_sample_data_with_anomalies():
+# Independent demo requests are sent concurrently over the shared session
+EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="demo-http")
+
+
+# Injected anomalies: day index -> (temperature, label)
+INJECTED_ANOMALIES = {
+    15: (41.5, "🔴 Injected HEAT WAVE"),
+    45: (-4.2, "🔵 Injected COLD SNAP"),
+    70: (38.8, "🟠 Injected HEAT EVENT"),
+}
+
+# Closing text printed after the demo
+SUMMARY = """
+This demo showed:
+✓ ML-based anomaly detection in climate data
+✓ Automatic alert generation with AI analysis
+✓ Alert entity specifications for Cyoda
+✓ Search capabilities with complex conditions
+✓ Alert lifecycle management (acknowledge/resolve)
+✓ Automatic severity and type classification
+
+Next Steps:
+1. Use MCP tools to create alert entities in Cyoda
+2. View alerts in React dashboard: http://localhost:3000/alerts
+3. Integrate with real climate data sources
+4. Set up automated monitoring workflows
+5. Configure alert notifications via Cyoda edge messages
+
+For more info, see CLAUDE.md section: Climate Alert System
+    """
+
+
+def write_block(lines):
+    """Write several output lines with a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def generate_sample_data_with_anomalies(n_days=90, seed=0):
     """Generate sample climate data with intentional anomalies."""
     print("\n📊 Generating sample climate data...")
 
-    data = []
-    start_date = datetime.now() - timedelta(days=90)
-
-    for i in range(90):
-        date = start_date + timedelta(days=i)
+    rng = np.random.default_rng(seed)
+    start_date = np.datetime64(date.today() - timedelta(days=n_days), 'D')
+    dates = np.datetime_as_string(start_date + np.arange(n_days), unit='D').tolist()
 
-        # Normal seasonal pattern
-        temp = 18 + 8 * (i / 365.25) + random.uniform(-2, 2)
+    # Normal seasonal pattern
+    temps = 18 + 8 * np.arange(n_days) / 365.25 + rng.uniform(-2, 2, n_days)
 
-        # Inject anomalies
-        if i == 15:
-            temp = 41.5  # Heat wave
-            print(f"  🔴 Injected HEAT WAVE on {date.date()}: {temp:.1f}°C")
-        elif i == 45:
-            temp = -4.2  # Cold snap
-            print(f"  🔵 Injected COLD SNAP on {date.date()}: {temp:.1f}°C")
-        elif i == 70:
-            temp = 38.8  # Another heat event
-            print(f"  🟠 Injected HEAT EVENT on {date.date()}: {temp:.1f}°C")
+    # Inject anomalies
+    for i, (temp, label) in INJECTED_ANOMALIES.items():
+        if i < n_days:
+            temps[i] = temp
+            print(f"  {label} on {dates[i]}: {temp:.1f}°C")
 
-        data.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "value": temp
-        })
+    data = [{"date": d, "value": t} for d, t in zip(dates, temps.tolist())]
 
     print(f"  ✓ Generated {len(data)} data points")
     return data
@@ -62,7 +96,7 @@ def detect_alerts(climate_data):
     """Detect anomalies and generate alert specifications."""
     print("\n🔍 Running anomaly detection...")
 
-    response = requests.post(
+    response = SESSION.post(
         f"{API_BASE}/alerts/detect",
         json={
             "data": climate_data,
@@ -85,28 +119,33 @@ def display_alert_spec(spec, index):
     """Display an alert specification."""
     entity_data = spec['entity_data']
 
-    print(f"\n🚨 Alert #{index + 1}")
-    print(f"  Type: {entity_data['alert_type']}")
-    print(f"  Severity: {entity_data['severity'].upper()}")
-    print(f"  Date: {entity_data['date']}")
-    print(f"  Value: {entity_data['value']:.1f}°C")
-    print(f"  Anomaly Score: {entity_data['anomaly_score']:.2%}")
-    print(f"  Description: {entity_data.get('description', 'N/A')}")
+    parts = [
+        f"\n🚨 Alert #{index + 1}",
+        f"  Type: {entity_data['alert_type']}",
+        f"  Severity: {entity_data['severity'].upper()}",
+        f"  Date: {entity_data['date']}",
+        f"  Value: {entity_data['value']:.1f}°C",
+        f"  Anomaly Score: {entity_data['anomaly_score']:.2%}",
+        f"  Description: {entity_data.get('description', 'N/A')}",
+    ]
 
     if 'recommendations' in entity_data:
-        print(f"  🤖 AI Recommendations:")
-        for rec in entity_data['recommendations'][:3]:
-            print(f"    • {rec}")
+        parts.append("  🤖 AI Recommendations:")
+        parts.extend(f"    • {rec}" for rec in entity_data['recommendations'][:3])
+
+    write_block(parts)
 
 
 def show_mcp_instructions(spec):
     """Show how to use MCP tools to create the alert in Cyoda."""
-    print("\n📡 To create this alert in Cyoda, use the MCP tool:")
-    print(f"\n  Tool: mcp__cyoda__entity_create_entity_tool")
-    print(f"  Parameters:")
-    print(f"    entity_model: {spec['entity_model']}")
-    print(f"    entity_version: {spec['entity_version']}")
-    print(f"    entity_data: {json.dumps(spec['entity_data'], indent=6)}")
+    write_block([
+        "\n📡 To create this alert in Cyoda, use the MCP tool:",
+        "\n  Tool: mcp__cyoda__entity_create_entity_tool",
+        "  Parameters:",
+        f"    entity_model: {spec['entity_model']}",
+        f"    entity_version: {spec['entity_version']}",
+        f"    entity_data: {json.dumps(spec['entity_data'], indent=6)}",
+    ])
 
 
 def demonstrate_search():
@@ -114,15 +153,27 @@ def demonstrate_search():
     print("\n\n🔎 DEMONSTRATION: Searching for Alerts")
     print("=" * 60)
 
+    date_from = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+
+    # Both searches are independent, so send them together
+    critical, heat_waves = EXECUTOR.map(
+        lambda payload: SESSION.post(f"{API_BASE}/alerts/search", json=payload),
+        [
+            {
+                "severity": "critical",
+                "status": "active"
+            },
+            {
+                "alert_type": "heat_wave",
+                "date_from": date_from,
+                "min_anomaly_score": 0.7
+            },
+        ]
+    )
+
     # Search for critical alerts
     print("\n1. Search for CRITICAL severity alerts:")
-    response = requests.post(
-        f"{API_BASE}/alerts/search",
-        json={
-            "severity": "critical",
-            "status": "active"
-        }
-    )
+    response = critical
 
     if response.status_code == 200:
         search_spec = response.json()['search_specification']
@@ -132,16 +183,7 @@ def demonstrate_search():
 
     # Search for heat waves in date range
     print("\n\n2. Search for HEAT WAVES in last 30 days:")
-    date_from = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
-
-    response = requests.post(
-        f"{API_BASE}/alerts/search",
-        json={
-            "alert_type": "heat_wave",
-            "date_from": date_from,
-            "min_anomaly_score": 0.7
-        }
-    )
+    response = heat_waves
 
     if response.status_code == 200:
         search_spec = response.json()['search_specification']
@@ -159,7 +201,7 @@ def demonstrate_lifecycle():
 
     # Acknowledge alert
     print(f"\n1. Acknowledging alert {alert_id}:")
-    response = requests.put(
+    response = SESSION.put(
         f"{API_BASE}/alerts/update/{alert_id}",
         json={
             "status": "acknowledged",
@@ -177,7 +219,7 @@ def demonstrate_lifecycle():
 
     # Resolve alert
     print(f"\n\n2. Resolving alert {alert_id}:")
-    response = requests.put(
+    response = SESSION.put(
         f"{API_BASE}/alerts/update/{alert_id}",
         json={
             "status": "resolved",
@@ -206,21 +248,19 @@ def demonstrate_classification():
         {"value": 95.0, "metric": "precipitation", "anomaly_score": 0.88},
     ]
 
-    for i, case in enumerate(test_cases, 1):
-        print(f"\n{i}. Classifying: {case['value']}{' °C' if case['metric'] == 'temperature' else 'mm'}")
+    # Classify every case in one request
+    response = SESSION.post(f"{API_BASE}/alerts/classify_batch", json={"cases": test_cases})
+    results = response.json()['results'] if response.status_code == 200 else [None] * len(test_cases)
 
-        response = requests.post(
-            f"{API_BASE}/alerts/classify",
-            json=case
-        )
+    for i, (case, result) in enumerate(zip(test_cases, results), 1):
+        print(f"\n{i}. Classifying: {case['value']}{' °C' if case['metric'] == 'temperature' else 'mm'}")
 
-        if response.status_code == 200:
-            result = response.json()
+        if result is not None:
             print(f"   → Type: {result['alert_type']}")
             print(f"   → Severity: {result['severity'].upper()}")
 
 
-def main():
+def run_demo():
     """Run the complete demo."""
     print("=" * 60)
     print("🌍 CLIMATE ALERT SYSTEM DEMO")
@@ -229,14 +269,14 @@ def main():
 
     # Check backend health
     try:
-        response = requests.get(f"{API_BASE}/../health", timeout=5)
+        response = SESSION.get(f"{API_BASE}/../health", timeout=5)
         if response.status_code != 200:
             print("\n❌ Backend not available. Please start the Flask app:")
-            print("   python backend/app.py")
+            print("   python -m backend.app")
             return
     except:
         print("\n❌ Cannot connect to backend at localhost:5000")
-        print("   Please start the Flask app: python backend/app.py")
+        print("   Please start the Flask app: python -m backend.app")
         return
 
     print("\n✅ Backend is running")
@@ -267,27 +307,21 @@ def main():
     demonstrate_classification()
 
     # Summary
-    print("\n\n" + "=" * 60)
-    print("📚 SUMMARY")
-    print("=" * 60)
-    print("""
-This demo showed:
-✓ ML-based anomaly detection in climate data
-✓ Automatic alert generation with AI analysis
-✓ Alert entity specifications for Cyoda
-✓ Search capabilities with complex conditions
-✓ Alert lifecycle management (acknowledge/resolve)
-✓ Automatic severity and type classification
+    write_block([
+        "\n\n" + "=" * 60,
+        "📚 SUMMARY",
+        "=" * 60,
+        SUMMARY,
+    ])
 
-Next Steps:
-1. Use MCP tools to create alert entities in Cyoda
-2. View alerts in React dashboard: http://localhost:3000/alerts
-3. Integrate with real climate data sources
-4. Set up automated monitoring workflows
-5. Configure alert notifications via Cyoda edge messages
 
-For more info, see CLAUDE.md section: Climate Alert System
-    """)
+def main():
+    """Run the demo, then release the HTTP session and worker threads."""
+    try:
+        run_demo()
+    finally:
+        EXECUTOR.shutdown()
+        SESSION.close()
 
 
 if __name__ == "__main__":
@@ -19,7 +19,7 @@ if [ ! -f "/app/models/lstm_temperature.keras" ]; then
     MODELS_TRAINED=false
 fi
 
-if [ ! -f "/app/models/prophet_seasonal.pkl" ]; then
+if [ ! -f "/app/models/prophet_seasonal.json" ] && [ ! -f "/app/models/prophet_seasonal.pkl" ]; then
     echo "⚠️  Prophet model not found"
     MODELS_TRAINED=false
 fi
@@ -22,6 +22,7 @@ from src.models.lstm_model import LSTMTemperatureForecaster
 from src.models.prophet_model import ProphetSeasonalAnalyzer
 from src.models.anomaly_detector import ClimateAnomalyDetector
 from src.models.climate_classifier import ClimatePatternClassifier
+from src.models.predict_model import SKL2ONNX_AVAILABLE, compile_to_onnx
 from src.utils.helpers import ensure_dir, setup_logging
 
 # Setup logging
@@ -39,16 +40,20 @@ def generate_sample_data(n_days=2000):
 
     dates = pd.date_range(start='2018-01-01', periods=n_days, freq='D')
 
+    rng = np.random.default_rng()
+    days = np.arange(n_days)
+    cycle = np.sin(2 * np.pi * days / 365.25)
+
     # Temperature: base + seasonal + trend + noise
     base_temp = 18
-    seasonal = 8 * np.sin(2 * np.pi * np.arange(n_days) / 365.25)
-    trend = 0.002 * np.arange(n_days)  # Warming trend
-    noise = np.random.normal(0, 2, n_days)
+    seasonal = 8 * cycle
+    trend = 0.002 * days  # Warming trend
+    noise = rng.normal(0, 2, n_days)
     temperature = base_temp + seasonal + trend + noise
 
     # Precipitation: gamma distribution with seasonal variation
-    seasonal_precip = 1 + 0.3 * np.sin(2 * np.pi * np.arange(n_days) / 365.25)
-    precipitation = np.random.gamma(2, 3, n_days) * seasonal_precip
+    seasonal_precip = 1 + 0.3 * cycle
+    precipitation = rng.gamma(2, 3, n_days) * seasonal_precip
 
     df = pd.DataFrame({
         'date': dates,
@@ -97,7 +102,7 @@ def train_prophet_model(df):
 
     # Save model
     ensure_dir('models')
-    model.save_model('models/prophet_seasonal.pkl')
+    model.save_model('models/prophet_seasonal.json')
 
     logger.info("Prophet model trained successfully")
 
@@ -140,6 +145,12 @@ def train_classifier(df):
     ensure_dir('models')
     classifier.save_model('models/climate_classifier.pkl')
 
+    # ONNX copy for predict_model.load_model/make_predictions (needs skl2onnx)
+    if SKL2ONNX_AVAILABLE:
+        compile_to_onnx(classifier.model, len(classifier.feature_names), 'models/climate_classifier.onnx')
+    else:
+        logger.info("skl2onnx not installed; skipping models/climate_classifier.onnx")
+
     logger.info(f"Classifier trained. Accuracy: {metrics['accuracy']:.4f}")
 
     return classifier, metrics
@@ -178,9 +189,11 @@ def main():
         print("TRAINING SUMMARY")
         print("=" * 50)
         print("\n✓ LSTM Temperature Forecaster - Saved to models/lstm_temperature.keras")
-        print("✓ Prophet Seasonal Analyzer - Saved to models/prophet_seasonal.pkl")
+        print("✓ Prophet Seasonal Analyzer - Saved to models/prophet_seasonal.json")
         print("✓ Anomaly Detector - Saved to models/anomaly_model.pkl")
         print(f"✓ Climate Classifier - Saved to models/climate_classifier.pkl (Accuracy: {metrics['accuracy']:.2%})")
+        if SKL2ONNX_AVAILABLE:
+            print("✓ Climate Classifier (ONNX) - Saved to models/climate_classifier.onnx")
         print("\n" + "=" * 50)
 
     except Exception as e:
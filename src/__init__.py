@@ -1,3 +1,8 @@
 """Uruguay Climate Change Analysis Package."""
 
+import logging
+
 __version__ = "0.1.0"
+
+# Library modules log; the application decides where the records go
+logging.getLogger(__name__).addHandler(logging.NullHandler())
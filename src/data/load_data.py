@@ -1,15 +1,28 @@
 """Data loading utilities."""
 
+from typing import List, Optional
+
 import pandas as pd
 from pathlib import Path
 
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 
-def load_raw_data(file_path: str) -> pd.DataFrame:
+def load_raw_data(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Load raw data from file.
 
+    CSV files are parsed with the multithreaded PyArrow reader when
+    pyarrow is installed; columns still come back as regular NumPy-backed
+    dtypes.
+
     Args:
         file_path: Path to the data file
+        columns: Only load these columns (None for all)
 
     Returns:
         DataFrame containing the raw data
@@ -17,23 +30,26 @@ def load_raw_data(file_path: str) -> pd.DataFrame:
     path = Path(file_path)
 
     if path.suffix == '.csv':
-        return pd.read_csv(file_path)
+        engine = 'pyarrow' if PYARROW_AVAILABLE else 'c'
+        return pd.read_csv(file_path, engine=engine, usecols=columns)
     elif path.suffix in ['.xlsx', '.xls']:
-        return pd.read_excel(file_path)
+        return pd.read_excel(file_path, usecols=columns)
     elif path.suffix == '.json':
-        return pd.read_json(file_path)
+        df = pd.read_json(file_path)
+        return df[columns] if columns is not None else df
     else:
         raise ValueError(f"Unsupported file format: {path.suffix}")
 
 
-def load_processed_data(file_path: str) -> pd.DataFrame:
+def load_processed_data(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Load processed data from file.
 
     Args:
         file_path: Path to the processed data file
+        columns: Only read these columns (None for all)
 
     Returns:
         DataFrame containing the processed data
     """
-    return pd.read_parquet(file_path)
+    return pd.read_parquet(file_path, columns=columns)
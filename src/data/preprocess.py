@@ -8,14 +8,15 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean raw data by handling missing values and duplicates.
 
+    The input frame is not modified; each step returns a new frame, so no
+    upfront defensive copy is made.
+
     Args:
         df: Raw DataFrame
 
     Returns:
         Cleaned DataFrame
     """
-    df = df.copy()
-
     # Remove duplicates
     df = df.drop_duplicates()
 
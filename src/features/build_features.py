@@ -1,43 +1,121 @@
 """Feature engineering functions."""
 
+from typing import Tuple
+
 import pandas as pd
 import numpy as np
 
 
-def create_time_features(df: pd.DataFrame, date_column: str) -> pd.DataFrame:
+# Smallest integer dtypes that hold each calendar component
+TIME_FEATURE_DTYPES = {
+    'year': np.int16,
+    'month': np.int8,
+    'day': np.int8,
+    'dayofweek': np.int8,
+    'dayofyear': np.int16,
+    'quarter': np.int8,
+}
+
+# Components added by create_time_features unless told otherwise
+DEFAULT_TIME_COMPONENTS = ('year', 'month', 'day', 'dayofweek', 'quarter')
+
+# Extractors over a datetime64[D] array; ``unit`` returns it truncated to
+# 'Y' or 'M', computed once per call and shared between components
+_CALENDAR_PARTS = {
+    'year': lambda days, unit: unit('Y').astype(np.int64) + 1970,
+    'month': lambda days, unit: unit('M').astype(np.int64) % 12 + 1,
+    'day': lambda days, unit: (days - unit('M')).astype(np.int64) + 1,
+    # 1970-01-01 was a Thursday (dayofweek 3, Monday=0)
+    'dayofweek': lambda days, unit: (days.astype(np.int64) + 3) % 7,
+    'dayofyear': lambda days, unit: (days - unit('Y')).astype(np.int64) + 1,
+    'quarter': lambda days, unit: unit('M').astype(np.int64) % 12 // 3 + 1,
+}
+
+
+def create_time_features(
+    df: pd.DataFrame,
+    date_column: str,
+    components: Tuple[str, ...] = DEFAULT_TIME_COMPONENTS
+) -> pd.DataFrame:
     """
     Create time-based features from a date column.
 
+    The input frame is not modified. The result shares the untouched
+    columns' data instead of duplicating it, and all new columns are
+    added in a single ``assign``.
+
     Args:
         df: Input DataFrame
         date_column: Name of the date column
+        components: Calendar components to add, from ``TIME_FEATURE_DTYPES``
 
     Returns:
         DataFrame with additional time features
     """
-    df = df.copy()
-    df[date_column] = pd.to_datetime(df[date_column])
+    dates = pd.to_datetime(df[date_column])
 
-    df['year'] = df[date_column].dt.year
-    df['month'] = df[date_column].dt.month
-    df['day'] = df[date_column].dt.day
-    df['dayofweek'] = df[date_column].dt.dayofweek
-    df['quarter'] = df[date_column].dt.quarter
+    return df.assign(**{date_column: dates}, **calendar_components(dates, components))
 
-    return df
+
+def calendar_components(dates, components: Tuple[str, ...] = DEFAULT_TIME_COMPONENTS) -> dict:
+    """
+    Compute only the requested calendar components of datetime values.
+
+    Naive dates without NaT are derived arithmetically from one
+    ``datetime64[D]`` view of the array; anything else goes through the
+    pandas datetime accessors.
+
+    Args:
+        dates: Datetime Series, DatetimeIndex or datetime64 array
+        components: Names from ``TIME_FEATURE_DTYPES``
+
+    Returns:
+        Dict of component arrays, narrowed to ``TIME_FEATURE_DTYPES``
+        unless NaT forces float arrays
+    """
+    unknown = [name for name in components if name not in TIME_FEATURE_DTYPES]
+    if unknown:
+        raise ValueError(f"Unknown time components: {unknown}")
+
+    index = pd.DatetimeIndex(dates)
+
+    if index.hasnans:
+        return {name: getattr(index, name).to_numpy() for name in components}
+
+    if index.tz is not None:
+        return {
+            name: getattr(index, name).to_numpy().astype(TIME_FEATURE_DTYPES[name])
+            for name in components
+        }
+
+    days = index.to_numpy().astype('datetime64[D]')
+    truncated = {}
+
+    def unit(code):
+        if code not in truncated:
+            truncated[code] = days.astype(f'datetime64[{code}]')
+        return truncated[code]
+
+    return {
+        name: _CALENDAR_PARTS[name](days, unit).astype(TIME_FEATURE_DTYPES[name])
+        for name in components
+    }
 
 
 def build_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Build all features for modeling.
 
+    The input frame is not modified; new columns are added to a shallow
+    copy.
+
     Args:
         df: Preprocessed DataFrame
 
     Returns:
         DataFrame with engineered features
     """
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Add your feature engineering logic here
     # - Aggregations
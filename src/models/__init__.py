@@ -1 +1,12 @@
 """Model training and prediction modules."""
+
+import os
+
+# Opt in to Intel's oneDAL random forests before the model modules import
+# them; the estimator API is unchanged
+if os.getenv('USE_SKLEARNEX') == '1':
+    try:
+        from sklearnex import patch_sklearn
+        patch_sklearn(['RandomForestClassifier', 'RandomForestRegressor'])
+    except ImportError:
+        pass
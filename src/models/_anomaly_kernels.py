@@ -0,0 +1,141 @@
+"""Numba kernels for anomaly feature construction and threshold flags."""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: the kernels depend on NaN checks
+    @njit(cache=True)
+    def _rolling_into(v, shift, window, mean_col, std_col, out):
+        """Sliding-sum rolling mean/std of ``v`` into two columns of ``out``."""
+        n = v.shape[0]
+        s = 0.0
+        s2 = 0.0
+        nan_count = 0
+        for i in range(n):
+            x = v[i]
+            if math.isnan(x):
+                nan_count += 1
+            else:
+                x -= shift
+                s += x
+                s2 += x * x
+            if i >= window:
+                y = v[i - window]
+                if math.isnan(y):
+                    nan_count -= 1
+                else:
+                    y -= shift
+                    s -= y
+                    s2 -= y * y
+            if i < window - 1 or nan_count > 0:
+                out[i, mean_col] = np.nan
+                out[i, std_col] = np.nan
+            else:
+                mean = s / window
+                var = (s2 - s * mean) / (window - 1)
+                out[i, mean_col] = mean + shift
+                out[i, std_col] = math.sqrt(var) if var > 0.0 else 0.0
+
+    @njit(cache=True)
+    def _fill_column(out, col):
+        """bfill, then ffill, then 0 -- as the pandas fill chain does."""
+        n = out.shape[0]
+        carry = np.nan
+        for i in range(n - 1, -1, -1):
+            if math.isnan(out[i, col]):
+                out[i, col] = carry
+            else:
+                carry = out[i, col]
+        carry = 0.0
+        for i in range(n):
+            if math.isnan(out[i, col]):
+                out[i, col] = carry
+            else:
+                carry = out[i, col]
+
+    @njit(cache=True)
+    def build_features_scaled(v, windows, day_of_year, month, mean, scale):
+        """
+        Build and standardize the anomaly feature matrix in one kernel.
+
+        Args:
+            v: float64 values
+            windows: int64 rolling window lengths
+            day_of_year: float64 day of year per value, or empty for none
+            month: float64 month per value, or empty for none
+            mean: Scaler means, one per feature column
+            scale: Scaler scales, one per feature column
+
+        Returns:
+            Scaled (n, n_features) float64 matrix
+        """
+        n = v.shape[0]
+        n_cols = mean.shape[0]
+        out = np.empty((n, n_cols), dtype=np.float64)
+
+        total = 0.0
+        count = 0
+        for i in range(n):
+            if not math.isnan(v[i]):
+                total += v[i]
+                count += 1
+        shift = total / count if count > 0 else 0.0
+
+        for i in range(n):
+            out[i, 0] = v[i]
+
+        for k in range(windows.shape[0]):
+            _rolling_into(v, shift, windows[k], 1 + 2 * k, 2 + 2 * k, out)
+
+        change_col = 1 + 2 * windows.shape[0]
+        if n > 0:
+            out[0, change_col] = np.nan
+        for i in range(1, n):
+            out[i, change_col] = v[i] - v[i - 1]
+
+        if day_of_year.shape[0] > 0:
+            for i in range(n):
+                out[i, change_col + 1] = day_of_year[i]
+                out[i, change_col + 2] = month[i]
+
+        for col in range(n_cols):
+            _fill_column(out, col)
+            for i in range(n):
+                out[i, col] = (out[i, col] - mean[col]) / scale[col]
+
+        return out
+
+    @njit(cache=True)
+    def threshold_flags(x, lower, upper, out):
+        """
+        Pack cold/hot/any threshold flags for ``x`` into ``out`` in one pass.
+
+        Bit 0 is set below ``lower``, bit 1 above ``upper`` and bit 2 for
+        either; NaN sets none.
+
+        Args:
+            x: float64 values
+            lower: Cold threshold
+            upper: Hot threshold
+            out: uint8 array shaped like ``x``
+        """
+        for i in range(x.shape[0]):
+            cold = x[i] < lower
+            hot = x[i] > upper
+            out[i] = cold | (hot << 1) | ((cold | hot) << 2)
+
+    def warmup():
+        """Compile (or load from cache) the kernels on tiny inputs."""
+        build_features_scaled(
+            np.zeros(2), np.array([2], dtype=np.int64), np.empty(0), np.empty(0),
+            np.zeros(4), np.ones(4)
+        )
+        threshold_flags(np.zeros(1), 0.0, 0.0, np.empty(1, dtype=np.uint8))
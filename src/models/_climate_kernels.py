@@ -0,0 +1,37 @@
+"""Numba kernels for ClimatePatternClassifier labelling."""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def label_codes(t, p, temp_low, temp_high, precip_low, precip_high):
+        """
+        Climate label codes (temperature bin * 3 + precipitation bin).
+
+        Bins are 0 below the low threshold, 2 at or above the high one and
+        1 otherwise; NaN compares false and lands in the moderate bin.
+
+        Args:
+            t: float64 temperatures
+            p: float64 precipitation values
+            temp_low: Temperature low threshold
+            temp_high: Temperature high threshold
+            precip_low: Precipitation low threshold
+            precip_high: Precipitation high threshold
+
+        Returns:
+            int8 codes indexing ``CLIMATE_LABELS``
+        """
+        out = np.empty(t.shape[0], dtype=np.int8)
+        for i in prange(t.shape[0]):
+            tb = 0 if t[i] < temp_low else (2 if t[i] >= temp_high else 1)
+            pb = 0 if p[i] < precip_low else (2 if p[i] >= precip_high else 1)
+            out[i] = tb * 3 + pb
+        return out
@@ -1,27 +1,158 @@
 """Anomaly detection for climate data."""
 
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 import joblib
 
+from src.features.build_features import calendar_components
+from src.models import _anomaly_kernels
+
+# Rolling-statistic windows (days) used as features
+ROLLING_WINDOWS = (7, 14, 30)
+
+# Feature columns without and with the seasonal (date) features
+VALUE_FEATURES = (
+    ['value']
+    + [f'rolling_{stat}_{w}' for w in ROLLING_WINDOWS for stat in ('mean', 'std')]
+    + ['daily_change']
+)
+SEASONAL_FEATURES = ['day_of_year', 'month']
+
+
+def _rolling_mean_std(v, window, mean_out, std_out):
+    """
+    Trailing rolling mean and sample std, NaN until the window is full.
+
+    Uses cumulative sums of the values and their squares, so every window
+    costs one subtraction regardless of its length. Values are shifted by
+    their mean first to keep the ``E[x^2] - E[x]^2`` variance accurate.
+    Matches ``Series.rolling(window).mean()/.std()``: any NaN inside a
+    window makes that window NaN.
+
+    Args:
+        v: 1-D float64 array
+        window: Window length
+        mean_out: Output array for the means, same length as ``v``
+        std_out: Output array for the standard deviations
+    """
+    mean_out[:window - 1] = np.nan
+    std_out[:window - 1] = np.nan
+    if v.shape[0] < window:
+        return
+
+    missing = np.isnan(v)
+    shift = np.nanmean(v) if not missing.all() else 0.0
+    x = np.where(missing, 0.0, v - shift)
+
+    cs = np.concatenate(([0.0], np.cumsum(x)))
+    cs2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    s = cs[window:] - cs[:-window]
+    s2 = cs2[window:] - cs2[:-window]
+
+    mean = s / window
+    var = (s2 - s * mean) / (window - 1)
+    std = np.sqrt(np.clip(var, 0.0, None))
+
+    if missing.any():
+        nan_count = np.concatenate(([0], np.cumsum(missing)))
+        has_nan = (nan_count[window:] - nan_count[:-window]) > 0
+        mean[has_nan] = np.nan
+        std[has_nan] = np.nan
+
+    mean_out[window - 1:] = mean + shift
+    std_out[window - 1:] = std
+
+
+def _seasonal_parts(dates):
+    """Day of year and month of a DatetimeIndex as float64 arrays (NaN for NaT)."""
+    parts = calendar_components(dates, ('dayofyear', 'month'))
+    return parts['dayofyear'].astype(np.float64), parts['month'].astype(np.float64)
+
+
+# Feature matrices by content hash of their inputs; prepare_features and
+# the non-Numba scoring path share them, so training and then detecting on
+# the same series builds the matrix once
+FEATURE_CACHE_SIZE = 32
+_feature_cache = OrderedDict()
+_feature_cache_lock = threading.Lock()
+
+
+def _feature_key(v, dates):
+    """BLAKE2b digest of the values and (optional) dates a feature matrix is built from."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(v).tobytes())
+    if dates is not None:
+        digest.update(np.ascontiguousarray(dates.asi8).tobytes())
+    else:
+        digest.update(b'no-dates')
+    return digest.digest()
+
+
+def _top_k_first(scores, k):
+    """
+    Positions of the ``k`` largest scores, highest first.
+
+    Selection is O(n) via partitioning; ties keep the earliest positions,
+    like ``DataFrame.nlargest(keep='first')``.
+    """
+    n = scores.shape[0]
+    if n > k:
+        kth = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - above.size]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(n)
+
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def _scaler_arrays_path(scaler_path):
+    """Path of the ``.npz`` file holding a scaler's fitted arrays."""
+    return Path(f'{scaler_path}.npz')
+
+
+def _scaler_from_arrays(path):
+    """Rebuild a fitted StandardScaler from its saved arrays."""
+    with np.load(path) as arrays:
+        scaler = StandardScaler()
+        scaler.mean_ = arrays['mean']
+        scaler.scale_ = arrays['scale']
+        scaler.var_ = arrays['var']
+        scaler.n_features_in_ = scaler.mean_.shape[0]
+        if arrays['feature_names'].size:
+            scaler.feature_names_in_ = arrays['feature_names'].astype(object)
+    return scaler
+
 
 class ClimateAnomalyDetector:
     """Detect anomalies in climate data using Isolation Forest."""
 
-    def __init__(self, contamination=0.1, random_state=42):
+    def __init__(self, contamination=0.1, random_state=42, n_estimators=100,
+                 max_samples='auto', n_jobs=-1):
         """
         Initialize anomaly detector.
 
         Args:
             contamination: Expected proportion of anomalies
             random_state: Random seed for reproducibility
+            n_estimators: Number of isolation trees
+            max_samples: Samples drawn per tree ('auto' is min(256, n))
+            n_jobs: Parallel jobs for fitting and scoring (-1 for all cores)
         """
         self.model = IsolationForest(
             contamination=contamination,
             random_state=random_state,
-            n_estimators=100
+            n_estimators=n_estimators,
+            max_samples=max_samples,
+            n_jobs=n_jobs
         )
         self.scaler = StandardScaler()
         self.fitted = False
@@ -30,6 +161,9 @@ class ClimateAnomalyDetector:
         """
         Prepare features for anomaly detection.
 
+        Matrices are cached by a content hash of the values and dates, so
+        repeated calls on the same series skip the rebuild.
+
         Args:
             df: DataFrame with climate data
             value_column: Name of value column
@@ -37,24 +171,86 @@ class ClimateAnomalyDetector:
         Returns:
             Feature matrix
         """
-        features = pd.DataFrame()
+        values, dates = self._feature_inputs(df, value_column)
+        features = self._cached_features(values, dates)
+
+        # Copy so callers can't alter the cached matrix; keep the caller's index
+        features = features.copy()
+        features.index = values.index
+        return features
+
+    def _cached_features(self, values, dates):
+        """
+        Feature matrix for ``values``/``dates`` from the content-hash cache.
+
+        The returned DataFrame is shared with the cache and must not be
+        modified.
+        """
+        v = np.asarray(values, dtype=np.float64)
+        key = _feature_key(v, dates)
+
+        with _feature_cache_lock:
+            features = _feature_cache.get(key)
+            if features is not None:
+                _feature_cache.move_to_end(key)
+                return features
+
+        features = self._build_features(v, dates)
+        with _feature_cache_lock:
+            _feature_cache[key] = features
+            while len(_feature_cache) > FEATURE_CACHE_SIZE:
+                _feature_cache.popitem(last=False)
+
+        return features
+
+    @staticmethod
+    def _feature_inputs(df, value_column):
+        """Value column and parsed dates (None without a date column) of ``df``."""
+        dates = None
+        if 'date' in df.columns:
+            df['date'] = pd.to_datetime(df['date'])
+            dates = pd.DatetimeIndex(df['date'])
+
+        return df[value_column], dates
+
+    @staticmethod
+    def _build_features(values, dates=None):
+        """
+        Build the feature matrix from a value series and optional dates.
+
+        Rolling statistics (from cumulative sums) and differences are
+        computed on a single float64 array and written into one
+        preallocated matrix, so the DataFrame is built once.
+
+        Args:
+            values: Series or array of measurements
+            dates: DatetimeIndex aligned with ``values``, or None
+
+        Returns:
+            Feature matrix
+        """
+        v = np.asarray(values, dtype=np.float64)
+        n = v.shape[0]
+        columns = VALUE_FEATURES + (SEASONAL_FEATURES if dates is not None else [])
+        out = np.empty((n, len(columns)), dtype=np.float64)
 
         # Original value
-        features['value'] = df[value_column]
+        out[:, 0] = v
 
         # Rolling statistics
-        for window in [7, 14, 30]:
-            features[f'rolling_mean_{window}'] = df[value_column].rolling(window=window).mean()
-            features[f'rolling_std_{window}'] = df[value_column].rolling(window=window).std()
+        for i, window in enumerate(ROLLING_WINDOWS):
+            _rolling_mean_std(v, window, out[:, 1 + 2 * i], out[:, 2 + 2 * i])
 
         # Change from previous day
-        features['daily_change'] = df[value_column].diff()
+        daily_change = out[:, len(VALUE_FEATURES) - 1]
+        daily_change[:1] = np.nan
+        np.subtract(v[1:], v[:-1], out=daily_change[1:])
 
-        # Seasonal features (if date column exists)
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            features['day_of_year'] = df['date'].dt.dayofyear
-            features['month'] = df['date'].dt.month
+        # Seasonal features
+        if dates is not None:
+            out[:, -2], out[:, -1] = _seasonal_parts(dates)
+
+        features = pd.DataFrame(out, columns=columns, index=getattr(values, 'index', None))
 
         # Fill NaN values using modern pandas syntax
         features = features.bfill().ffill()
@@ -101,24 +297,74 @@ class ClimateAnomalyDetector:
         if not self.fitted:
             raise ValueError("Model not trained yet!")
 
-        # Prepare features
-        X = self.prepare_features(df, value_column)
+        is_anomaly, anomaly_score = self._score(*self._feature_inputs(df, value_column))
 
-        # Scale features
-        X_scaled = self.scaler.transform(X)
+        # Add results to dataframe
+        result_df = df.copy()
+        result_df['is_anomaly'] = is_anomaly
+        result_df['anomaly_score'] = anomaly_score
+
+        return result_df
 
-        # Predict anomalies (-1 for anomaly, 1 for normal)
-        predictions = self.model.predict(X_scaled)
+    def detect_arrays(self, values, dates=None):
+        """
+        Detect anomalies in columnar data without building a DataFrame.
+
+        Args:
+            values: 1-D float array of measurements
+            dates: DatetimeIndex aligned with ``values``, or None
 
-        # Get anomaly scores (lower score = more anomalous)
+        Returns:
+            Tuple of (boolean anomaly mask, anomaly scores) arrays
+        """
+        if not self.fitted:
+            raise ValueError("Model not trained yet!")
+
+        return self._score(values, dates)
+
+    def _scaled_features(self, values, dates):
+        """
+        Standardized feature matrix for ``values``.
+
+        Uses the fused Numba kernel when it is installed and the scaler's
+        feature count matches; otherwise scales the cached feature matrix,
+        so detecting on the series a model was trained on reuses its build.
+        """
+        n_features = len(VALUE_FEATURES) + (len(SEASONAL_FEATURES) if dates is not None else 0)
+        mean = getattr(self.scaler, 'mean_', None)
+        scale = getattr(self.scaler, 'scale_', None)
+
+        if (_anomaly_kernels.NUMBA_AVAILABLE and mean is not None and scale is not None
+                and len(mean) == n_features):
+            if dates is not None:
+                day_of_year, month = _seasonal_parts(dates)
+            else:
+                day_of_year = month = np.empty(0)
+            return _anomaly_kernels.build_features_scaled(
+                np.asarray(values, dtype=np.float64),
+                np.asarray(ROLLING_WINDOWS, dtype=np.int64),
+                day_of_year,
+                month,
+                np.asarray(mean, dtype=np.float64),
+                np.asarray(scale, dtype=np.float64)
+            )
+
+        return self.scaler.transform(self._cached_features(values, dates))
+
+    def _score(self, values, dates):
+        """Build and scale features, then return (anomaly mask, scores)."""
+        X_scaled = self._scaled_features(values, dates)
+
+        # Get anomaly scores (lower score = more anomalous); one pass over
+        # the trees, since predict() would score every sample again
         scores = self.model.score_samples(X_scaled)
 
-        # Add results to dataframe
-        result_df = df.copy()
-        result_df['is_anomaly'] = predictions == -1
-        result_df['anomaly_score'] = -scores  # Invert so higher = more anomalous
+        # Same rule as IsolationForest.predict: anomaly where the decision
+        # function (score - offset_) is negative
+        is_anomaly = scores - self.model.offset_ < 0
 
-        return result_df
+        # Invert scores so higher = more anomalous
+        return is_anomaly, -scores
 
     def get_anomaly_summary(self, df_with_anomalies):
         """
@@ -130,34 +376,73 @@ class ClimateAnomalyDetector:
         Returns:
             Dictionary with anomaly summary
         """
-        anomalies = df_with_anomalies[df_with_anomalies['is_anomaly'] == True]
+        idx = np.flatnonzero(df_with_anomalies['is_anomaly'].to_numpy() == True)
+        scores = df_with_anomalies['anomaly_score'].to_numpy()[idx]
 
-        summary = {
-            'total_anomalies': int(len(anomalies)),
-            'anomaly_percentage': float(len(anomalies) / len(df_with_anomalies) * 100),
-            'top_anomalies': anomalies.nlargest(10, 'anomaly_score')[
+        top_anomalies = []
+        if 'date' in df_with_anomalies.columns:
+            top = _top_k_first(scores, 10)
+            top_anomalies = df_with_anomalies.iloc[idx[top]][
                 ['date', 'value', 'anomaly_score']
-            ].to_dict('records') if 'date' in anomalies.columns else [],
-            'mean_anomaly_score': float(anomalies['anomaly_score'].mean()) if len(anomalies) > 0 else 0
+            ].to_dict('records')
+
+        summary = {
+            'total_anomalies': int(idx.size),
+            'anomaly_percentage': float(idx.size / len(df_with_anomalies) * 100),
+            'top_anomalies': top_anomalies,
+            'mean_anomaly_score': float(scores.mean()) if idx.size > 0 else 0
         }
 
         return summary
 
     def save_model(self, model_path, scaler_path):
-        """Save model and scaler."""
+        """
+        Save model and scaler.
+
+        Besides the pickled scaler, its fitted arrays are written to
+        ``<scaler_path>.npz`` so loading can skip unpickling.
+        """
         joblib.dump(self.model, model_path)
         joblib.dump(self.scaler, scaler_path)
+        np.savez(
+            _scaler_arrays_path(scaler_path),
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            var=self.scaler.var_,
+            feature_names=np.asarray(getattr(self.scaler, 'feature_names_in_', []), dtype=str)
+        )
 
     def load_model(self, model_path, scaler_path):
-        """Load model and scaler."""
-        self.model = joblib.load(model_path)
-        self.scaler = joblib.load(scaler_path)
+        """
+        Load model and scaler.
+
+        Arrays are memory-mapped read-only, so forked server workers share
+        the same pages instead of each holding a copy. The scaler is
+        rebuilt from ``<scaler_path>.npz`` when present, falling back to the
+        pickle for models saved before it existed.
+        """
+        self.model = joblib.load(model_path, mmap_mode='r')
+
+        arrays_path = _scaler_arrays_path(scaler_path)
+        if arrays_path.exists():
+            self.scaler = _scaler_from_arrays(arrays_path)
+        else:
+            self.scaler = joblib.load(scaler_path, mmap_mode='r')
         self.fitted = True
 
+        # Compile the feature kernel now rather than on the first request
+        if _anomaly_kernels.NUMBA_AVAILABLE:
+            _anomaly_kernels.warmup()
+
 
 class TemperatureThresholdDetector:
     """Simple threshold-based anomaly detection for extreme temperatures."""
 
+    # Bits of the packed array returned by detect_flags
+    COLD_FLAG = 1
+    HOT_FLAG = 2
+    ANY_FLAG = 4
+
     def __init__(self, lower_percentile=5, upper_percentile=95):
         """
         Initialize threshold detector.
@@ -178,15 +463,26 @@ class TemperatureThresholdDetector:
         Args:
             temperature_data: Array or Series of temperature values
         """
-        self.lower_threshold = np.percentile(temperature_data, self.lower_percentile)
-        self.upper_threshold = np.percentile(temperature_data, self.upper_percentile)
+        # One selection pass places both percentile boundaries; plain floats,
+        # so comparisons don't go through 0-d array promotion
+        lower, upper = np.percentile(
+            np.asarray(temperature_data, dtype=np.float64),
+            [self.lower_percentile, self.upper_percentile]
+        )
+        self.lower_threshold = float(lower)
+        self.upper_threshold = float(upper)
 
-    def detect(self, temperature_data):
+    def detect(self, temperature_data, out=None):
         """
         Detect extreme temperature events.
 
+        Input is converted to a float64 ndarray once and all comparisons
+        run in NumPy, so results are boolean ndarrays even for a Series.
+
         Args:
             temperature_data: Array or Series of temperature values
+            out: Optional tuple of three bool arrays shaped like the input,
+                reused for the cold, hot and any-anomaly masks
 
         Returns:
             Dictionary with anomaly information
@@ -194,15 +490,51 @@ class TemperatureThresholdDetector:
         if self.lower_threshold is None or self.upper_threshold is None:
             raise ValueError("Detector not fitted yet!")
 
-        is_cold_anomaly = temperature_data < self.lower_threshold
-        is_hot_anomaly = temperature_data > self.upper_threshold
+        x = np.ascontiguousarray(temperature_data, dtype=np.float64)
+        cold_out, hot_out, any_out = out if out is not None else (None, None, None)
+
+        is_cold_anomaly = np.less(x, self.lower_threshold, out=cold_out)
+        is_hot_anomaly = np.greater(x, self.upper_threshold, out=hot_out)
 
         result = {
             'is_cold_anomaly': is_cold_anomaly,
             'is_hot_anomaly': is_hot_anomaly,
-            'is_any_anomaly': is_cold_anomaly | is_hot_anomaly,
+            'is_any_anomaly': np.logical_or(is_cold_anomaly, is_hot_anomaly, out=any_out),
             'lower_threshold': self.lower_threshold,
             'upper_threshold': self.upper_threshold
         }
 
         return result
+
+    def detect_flags(self, temperature_data, out=None):
+        """
+        Detect extreme temperature events as one packed flag array.
+
+        Each element holds ``COLD_FLAG``, ``HOT_FLAG`` and ``ANY_FLAG`` bits,
+        so long series are read once and need one byte of output per
+        value; test a bit with e.g. ``flags & COLD_FLAG``.
+
+        Args:
+            temperature_data: Array or Series of temperature values
+            out: Optional uint8 array shaped like the input
+
+        Returns:
+            uint8 ndarray of flags
+        """
+        if self.lower_threshold is None or self.upper_threshold is None:
+            raise ValueError("Detector not fitted yet!")
+
+        x = np.ascontiguousarray(temperature_data, dtype=np.float64)
+        if out is None:
+            out = np.empty(x.shape, dtype=np.uint8)
+
+        if _anomaly_kernels.NUMBA_AVAILABLE and x.ndim == 1:
+            _anomaly_kernels.threshold_flags(x, self.lower_threshold, self.upper_threshold, out)
+            return out
+
+        cold = x < self.lower_threshold
+        hot = x > self.upper_threshold
+        out[...] = cold
+        out |= hot.view(np.uint8) << 1
+        out |= (cold | hot).view(np.uint8) << 2
+        return out
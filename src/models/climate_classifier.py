@@ -2,29 +2,141 @@
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, confusion_matrix
-import joblib
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
+from src.models import _climate_kernels
+from src.models.predict_model import dump_model, load_joblib
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
+
+
+# Pattern labels indexed by temperature bin * 3 + precipitation bin
+CLIMATE_LABELS = np.array([
+    'Cold and Dry', 'Cold and Moderate', 'Cold and Wet',
+    'Moderate and Dry', 'Moderate', 'Moderate and Wet',
+    'Hot and Dry', 'Hot and Moderate', 'Hot and Wet',
+], dtype=object)
+
+
+ROLLING_WINDOWS = (7, 14, 30)
+SEASONAL_FEATURES = ['month', 'season', 'day_of_year']
+
+
+def _rolling_mean(values, window):
+    """
+    Trailing mean over full windows, as ``rolling(window).mean()`` computes.
+
+    Uses bottleneck's compiled moving window when it is installed; windows
+    holding a NaN, and the first ``window - 1`` rows, are NaN either way.
+
+    Args:
+        values: 1-D float64 array
+        window: Window length
+
+    Returns:
+        float64 array shaped like ``values``
+    """
+    if BOTTLENECK_AVAILABLE and window <= values.shape[0]:
+        return bn.move_mean(values, window, min_count=window)
+
+    return pd.Series(values).rolling(window=window).mean().to_numpy()
+
+
+def _fill_nan_edges(out):
+    """
+    Fill NaN in each column in place, as ``bfill().ffill()`` would.
+
+    Every NaN takes the next valid value in its column, or the previous
+    one after the last; all-NaN columns are left as they are. Done with
+    index scans over the whole matrix instead of two DataFrame copies.
+    """
+    missing = np.isnan(out)
+    if not missing.any():
+        return
+
+    n = out.shape[0]
+    rows = np.arange(n)[:, None]
+    next_valid = np.minimum.accumulate(np.where(missing, n, rows)[::-1], axis=0)[::-1]
+    prev_valid = np.maximum.accumulate(np.where(missing, -1, rows), axis=0)
+    source = np.where(next_valid < n, next_valid, prev_valid)
+
+    fillable = missing & (source >= 0)
+    columns = np.broadcast_to(np.arange(out.shape[1]), out.shape)
+    out[fillable] = out[source[fillable], columns[fillable]]
+
+
+def _label_codes(t, p):
+    """
+    Climate pattern codes (indices into ``CLIMATE_LABELS``) for each row.
+
+    Values are binned against their 33rd/67th percentiles (0=low,
+    1=moderate, 2=high); NaN compares false and stays moderate.
+
+    Args:
+        t: float64 temperatures
+        p: float64 precipitation values
+
+    Returns:
+        Integer code array
+    """
+    # Series.quantile semantics: NaN is skipped, linear interpolation
+    temp_low, temp_high = np.nanquantile(t, [0.33, 0.67])
+    precip_low, precip_high = np.nanquantile(p, [0.33, 0.67])
+
+    if _climate_kernels.NUMBA_AVAILABLE:
+        return _climate_kernels.label_codes(t, p, temp_low, temp_high, precip_low, precip_high)
+
+    temp_bin = 1 - (t < temp_low) + (t >= temp_high)
+    precip_bin = 1 - (p < precip_low) + (p >= precip_high)
+    return temp_bin * 3 + precip_bin
 
 
 class ClimatePatternClassifier:
-    """Classify climate patterns using Random Forest."""
+    """Classify climate patterns using Random Forest or gradient-boosted trees."""
 
-    def __init__(self, n_estimators=100, random_state=42):
+    def __init__(self, n_estimators=100, random_state=42, n_jobs=-1,
+                 backend='rf', max_leaf_nodes=None):
         """
         Initialize classifier.
 
         Args:
-            n_estimators: Number of trees in the forest
+            n_estimators: Number of trees in the forest (boosting iterations
+                for ``'hgbt'``)
             random_state: Random seed
+            n_jobs: Parallel jobs for fitting and prediction (-1 for all cores;
+                ``'rf'`` only)
+            backend: ``'rf'`` for RandomForestClassifier or ``'hgbt'`` for
+                HistGradientBoostingClassifier, whose binned trees predict
+                much faster
+            max_leaf_nodes: Leaf limit per tree, bounding traversal cost
+                (None for no limit beyond ``max_depth``)
         """
-        self.model = RandomForestClassifier(
-            n_estimators=n_estimators,
-            random_state=random_state,
-            max_depth=10,
-            min_samples_split=5
-        )
+        if backend == 'rf':
+            self.model = RandomForestClassifier(
+                n_estimators=n_estimators,
+                random_state=random_state,
+                max_depth=10,
+                min_samples_split=5,
+                max_leaf_nodes=max_leaf_nodes,
+                n_jobs=n_jobs
+            )
+        elif backend == 'hgbt':
+            self.model = HistGradientBoostingClassifier(
+                max_iter=n_estimators,
+                max_depth=10,
+                max_leaf_nodes=max_leaf_nodes,
+                early_stopping=True,
+                random_state=random_state
+            )
+        else:
+            raise ValueError(f"Unknown backend: {backend}")
+
+        self.backend = backend
         self.fitted = False
         self.feature_names = None
 
@@ -41,40 +153,11 @@ class ClimatePatternClassifier:
         Returns:
             Series with climate pattern labels
         """
-        # Calculate percentiles
-        temp_25 = df[temp_column].quantile(0.33)
-        temp_75 = df[temp_column].quantile(0.67)
-        precip_25 = df[precip_column].quantile(0.33)
-        precip_75 = df[precip_column].quantile(0.67)
-
-        # Create labels
-        labels = []
-        for _, row in df.iterrows():
-            temp = row[temp_column]
-            precip = row[precip_column]
-
-            if temp < temp_25 and precip < precip_25:
-                label = 'Cold and Dry'
-            elif temp < temp_25 and precip >= precip_75:
-                label = 'Cold and Wet'
-            elif temp >= temp_75 and precip < precip_25:
-                label = 'Hot and Dry'
-            elif temp >= temp_75 and precip >= precip_75:
-                label = 'Hot and Wet'
-            elif temp < temp_25:
-                label = 'Cold and Moderate'
-            elif temp >= temp_75:
-                label = 'Hot and Moderate'
-            elif precip < precip_25:
-                label = 'Moderate and Dry'
-            elif precip >= precip_75:
-                label = 'Moderate and Wet'
-            else:
-                label = 'Moderate'
-
-            labels.append(label)
-
-        return pd.Series(labels, index=df.index)
+        t = df[temp_column].to_numpy(dtype=np.float64)
+        p = df[precip_column].to_numpy(dtype=np.float64)
+
+        # Strings only at the boundary
+        return pd.Series(CLIMATE_LABELS[_label_codes(t, p)], index=df.index)
 
     def prepare_features(self, df, temp_column='temperature',
                         precip_column='precipitation'):
@@ -89,30 +172,91 @@ class ClimatePatternClassifier:
         Returns:
             Feature DataFrame
         """
-        features = pd.DataFrame()
+        features, columns = self._feature_matrix(
+            df[temp_column].to_numpy(dtype=np.float64),
+            df[precip_column].to_numpy(dtype=np.float64),
+            self._dates(df)
+        )
+
+        return pd.DataFrame(features, columns=columns, index=df.index)
+
+    def prepare_features_and_labels(self, df, temp_column='temperature',
+                                    precip_column='precipitation'):
+        """
+        Build the feature matrix and the pattern labels in one pass.
+
+        Both come from the same temperature and precipitation arrays, so
+        the columns are extracted once and no DataFrames are built.
+
+        Args:
+            df: DataFrame with climate data
+            temp_column: Name of temperature column
+            precip_column: Name of precipitation column
+
+        Returns:
+            Tuple of (feature array, label array, feature names)
+        """
+        t = df[temp_column].to_numpy(dtype=np.float64)
+        p = df[precip_column].to_numpy(dtype=np.float64)
+
+        features, columns = self._feature_matrix(t, p, self._dates(df))
+
+        return features, CLIMATE_LABELS[_label_codes(t, p)], columns
+
+    @staticmethod
+    def _dates(df):
+        """``df['date']`` as a DatetimeIndex, or None if there is no date column."""
+        # Parsed locally; the caller's frame is left untouched
+        if 'date' not in df.columns:
+            return None
+
+        dates = df['date']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates, cache=True)
+        return pd.DatetimeIndex(dates)
+
+    def _feature_matrix(self, t, p, dates=None):
+        """
+        Build the feature matrix from temperature and precipitation arrays.
+
+        Args:
+            t: float64 temperatures
+            p: float64 precipitation values aligned with ``t``
+            dates: DatetimeIndex aligned with ``t``, or None
+
+        Returns:
+            Tuple of (float64 feature matrix, feature names)
+        """
+        columns = ['temperature', 'precipitation']
+        for window in ROLLING_WINDOWS:
+            columns += [f'temp_roll_{window}', f'precip_roll_{window}']
+        if dates is not None:
+            columns += SEASONAL_FEATURES
+
+        out = np.empty((len(t), len(columns)), dtype=np.float64)
 
         # Current values
-        features['temperature'] = df[temp_column]
-        features['precipitation'] = df[precip_column]
+        out[:, 0] = t
+        out[:, 1] = p
 
         # Rolling averages
-        for window in [7, 14, 30]:
-            features[f'temp_roll_{window}'] = df[temp_column].rolling(window=window).mean()
-            features[f'precip_roll_{window}'] = df[precip_column].rolling(window=window).mean()
+        for i, window in enumerate(ROLLING_WINDOWS):
+            out[:, 2 + 2 * i] = _rolling_mean(t, window)
+            out[:, 3 + 2 * i] = _rolling_mean(p, window)
 
         # Seasonal features
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'])
-            features['month'] = df['date'].dt.month
-            features['season'] = (df['date'].dt.month % 12 + 3) // 3  # 1=Winter, 2=Spring, etc.
-            features['day_of_year'] = df['date'].dt.dayofyear
+        if dates is not None:
+            month = dates.month
+            out[:, -3] = month
+            out[:, -2] = (month % 12 + 3) // 3  # 1=Winter, 2=Spring, etc.
+            out[:, -1] = dates.dayofyear
 
         # Fill NaN
-        features = features.fillna(method='bfill').fillna(method='ffill')
+        _fill_nan_edges(out)
 
-        self.feature_names = features.columns.tolist()
+        self.feature_names = columns
 
-        return features
+        return out, columns
 
     def train(self, df, temp_column='temperature', precip_column='precipitation',
               test_size=0.2):
@@ -129,29 +273,63 @@ class ClimatePatternClassifier:
             Training metrics
         """
         # Prepare features and labels
-        X = self.prepare_features(df, temp_column, precip_column)
-        y = self.create_climate_labels(df, temp_column, precip_column)
+        X, y, _ = self.prepare_features_and_labels(df, temp_column, precip_column)
 
-        # Split data
+        # Split plain arrays: no pandas index alignment
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, random_state=42, stratify=y
         )
 
         # Train model
-        self.model.fit(X_train, y_train)
+        self.model.fit(self._model_input(X_train), y_train)
         self.fitted = True
 
         # Evaluate
-        y_pred = self.model.predict(X_test)
+        y_pred, _ = self._predict_features(X_test)
 
         metrics = {
-            'accuracy': float(self.model.score(X_test, y_test)),
+            'accuracy': float(accuracy_score(y_test, y_pred)),
             'classification_report': classification_report(y_test, y_pred, output_dict=True),
             'confusion_matrix': confusion_matrix(y_test, y_pred).tolist()
         }
 
         return metrics
 
+    def add_trees(self, n_trees, df, temp_column='temperature',
+                  precip_column='precipitation'):
+        """
+        Grow the trained forest by ``n_trees`` trees fitted on ``df``.
+
+        The existing trees are kept (sklearn's ``warm_start``), so only the
+        new ones are fitted. Each tree still only sees the data it was fitted
+        on: ``df`` should come from the same distribution as the training
+        data, and cover the same climate patterns.
+
+        Args:
+            n_trees: Number of trees to add
+            df: DataFrame with climate data
+            temp_column: Name of temperature column
+            precip_column: Name of precipitation column
+
+        Returns:
+            Number of trees in the forest
+        """
+        if not self.fitted:
+            raise ValueError("Model not trained yet!")
+        if not isinstance(self.model, RandomForestClassifier):
+            raise ValueError("Trees can only be added with the 'rf' backend")
+
+        X, y, _ = self.prepare_features_and_labels(df, temp_column, precip_column)
+
+        # Warm start only here, so train() still refits from scratch
+        self.model.set_params(warm_start=True, n_estimators=self.model.n_estimators + n_trees)
+        try:
+            self.model.fit(self._model_input(X), y)
+        finally:
+            self.model.set_params(warm_start=False)
+
+        return len(self.model.estimators_)
+
     def predict(self, df, temp_column='temperature', precip_column='precipitation'):
         """
         Predict climate patterns.
@@ -167,9 +345,52 @@ class ClimatePatternClassifier:
         if not self.fitted:
             raise ValueError("Model not trained yet!")
 
-        X = self.prepare_features(df, temp_column, precip_column)
-        predictions = self.model.predict(X)
-        probabilities = self.model.predict_proba(X)
+        return self._predict_features(self.prepare_features(df, temp_column, precip_column))
+
+    def predict_arrays(self, temps, precips, dates=None):
+        """
+        Predict climate patterns from columnar data without a DataFrame.
+
+        Args:
+            temps: 1-D float array of temperatures
+            precips: 1-D float array of precipitation values
+            dates: DatetimeIndex aligned with ``temps``, or None
+
+        Returns:
+            Tuple of (predictions, class probabilities)
+        """
+        if not self.fitted:
+            raise ValueError("Model not trained yet!")
+
+        features, _ = self._feature_matrix(
+            np.asarray(temps, dtype=np.float64), np.asarray(precips, dtype=np.float64), dates
+        )
+
+        return self._predict_features(features)
+
+    def _model_input(self, X):
+        """
+        Feature matrix as the contiguous array the estimator works on.
+
+        Forests run on float32 and gradient boosting on float64, so the
+        conversion happens once here instead of inside every sklearn call.
+        Models fitted on DataFrames before this keep receiving the frame,
+        so sklearn's feature-name check still matches.
+        """
+        if hasattr(self.model, 'feature_names_in_'):
+            return X
+        dtype = np.float64 if isinstance(self.model, HistGradientBoostingClassifier) else np.float32
+        return np.ascontiguousarray(X, dtype=dtype)
+
+    def _predict_features(self, X):
+        """
+        Return (predictions, probabilities) for a feature matrix.
+
+        The trees are traversed once: predictions are the most probable
+        class, exactly as the estimators' own ``predict`` derives them.
+        """
+        probabilities = self.model.predict_proba(self._model_input(X))
+        predictions = self.model.classes_.take(np.argmax(probabilities, axis=1))
 
         return predictions, probabilities
 
@@ -177,6 +398,8 @@ class ClimatePatternClassifier:
         """Get feature importance from trained model."""
         if not self.fitted:
             raise ValueError("Model not trained yet!")
+        if not hasattr(self.model, 'feature_importances_'):
+            raise ValueError("Feature importance is only available for the 'rf' backend")
 
         importance_df = pd.DataFrame({
             'feature': self.feature_names,
@@ -185,11 +408,18 @@ class ClimatePatternClassifier:
 
         return importance_df.to_dict('records')
 
-    def save_model(self, filepath):
-        """Save model."""
-        joblib.dump(self.model, filepath)
+    def save_model(self, filepath, compressed=False):
+        """
+        Save model.
+
+        Args:
+            filepath: Output path
+            compressed: Compress for archival; uncompressed files can be
+                memory-mapped by :meth:`load_model`
+        """
+        dump_model(self.model, filepath, compressed=compressed)
 
     def load_model(self, filepath):
-        """Load model."""
-        self.model = joblib.load(filepath)
+        """Load model (arrays memory-mapped read-only, shared across workers)."""
+        self.model = load_joblib(filepath)
         self.fitted = True
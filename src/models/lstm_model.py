@@ -1,30 +1,48 @@
 """LSTM model for temperature forecasting."""
 
+import logging
+import math
+import os
+
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+import tensorflow as tf
 from tensorflow import keras
+from tensorflow.keras import mixed_precision
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.callbacks import EarlyStopping
 from sklearn.preprocessing import MinMaxScaler
 import joblib
 
+logger = logging.getLogger(__name__)
+
+# Keras dtype policy for training: 'float32', 'mixed_float16' (GPU) or
+# 'mixed_bfloat16' (TPU / BF16-capable CPUs)
+LSTM_PRECISION = os.getenv('LSTM_PRECISION', 'float32')
+
 
 class LSTMTemperatureForecaster:
     """LSTM-based temperature forecasting model."""
 
-    def __init__(self, lookback=60, forecast_horizon=30):
+    def __init__(self, lookback=60, forecast_horizon=30, precision=None):
         """
         Initialize LSTM forecaster.
 
         Args:
             lookback: Number of past days to use for prediction
             forecast_horizon: Number of days to forecast
+            precision: Keras dtype policy name for the recurrent layers
+                (defaults to ``LSTM_PRECISION``)
         """
         self.lookback = lookback
         self.forecast_horizon = forecast_horizon
+        self.precision = precision or LSTM_PRECISION
         self.model = None
         self.scaler = MinMaxScaler()
+        self._infer = None
+        self._infer_model = None
 
     def create_sequences(self, data):
         """
@@ -36,11 +54,16 @@ class LSTMTemperatureForecaster:
         Returns:
             X, y arrays for training
         """
-        X, y = [], []
-        for i in range(len(data) - self.lookback - self.forecast_horizon + 1):
-            X.append(data[i:i + self.lookback])
-            y.append(data[i + self.lookback:i + self.lookback + self.forecast_horizon])
-        return np.array(X), np.array(y)
+        data = np.asarray(data)
+        span = self.lookback + self.forecast_horizon
+        if data.shape[0] < span:
+            return np.empty((0, self.lookback)), np.empty((0, self.forecast_horizon))
+
+        # Zero-copy windows over the series, split and copied out once
+        windows = sliding_window_view(data, span)
+        X = windows[:, :self.lookback].copy()
+        y = windows[:, self.lookback:].copy()
+        return X, y
 
     def build_model(self, input_shape):
         """
@@ -52,18 +75,34 @@ class LSTMTemperatureForecaster:
         Returns:
             Compiled Keras model
         """
+        # Default tanh/sigmoid activations with no recurrent dropout keep the
+        # layers eligible for the fused cuDNN (GPU) / oneDNN (CPU) kernel;
+        # dropout is applied between layers instead
+        # The policy is set per layer rather than globally, so other Keras
+        # models in the process are unaffected; the output layer stays
+        # float32 so the loss is computed at full precision
+        policy = mixed_precision.Policy(self.precision)
         model = Sequential([
-            LSTM(128, activation='relu', return_sequences=True, input_shape=input_shape),
-            Dropout(0.2),
-            LSTM(64, activation='relu', return_sequences=True),
-            Dropout(0.2),
-            LSTM(32, activation='relu'),
-            Dropout(0.2),
-            Dense(self.forecast_horizon)
+            LSTM(128, return_sequences=True, input_shape=input_shape, dtype=policy),
+            Dropout(0.2, dtype=policy),
+            LSTM(64, return_sequences=True, dtype=policy),
+            Dropout(0.2, dtype=policy),
+            LSTM(32, dtype=policy),
+            Dropout(0.2, dtype=policy),
+            Dense(self.forecast_horizon, dtype='float32')
         ])
+        logger.debug(
+            "LSTM built; fused cuDNN kernel %s",
+            "available" if tf.config.list_physical_devices('GPU') else "unused (no GPU)"
+        )
+
+        optimizer = keras.optimizers.Adam(learning_rate=0.001)
+        if self.precision == 'mixed_float16':
+            # float16 gradients underflow without loss scaling
+            optimizer = mixed_precision.LossScaleOptimizer(optimizer)
 
         model.compile(
-            optimizer=keras.optimizers.Adam(learning_rate=0.001),
+            optimizer=optimizer,
             loss='mse',
             metrics=['mae']
         )
@@ -103,17 +142,53 @@ class LSTMTemperatureForecaster:
         )
 
         # Train
+        train_ds, val_ds = self._datasets(X, y, batch_size, validation_split)
         history = self.model.fit(
-            X, y,
+            train_ds,
             epochs=epochs,
-            batch_size=batch_size,
-            validation_split=validation_split,
+            validation_data=val_ds,
             callbacks=[early_stop],
             verbose=1
         )
 
         return history
 
+    @staticmethod
+    def _datasets(X, y, batch_size, validation_split):
+        """
+        Input pipelines for training and validation.
+
+        The last ``validation_split`` of the sequences is held out, as
+        Keras' ``validation_split`` does. Training batches are reshuffled
+        every epoch and prefetched so input preparation overlaps with
+        the training step.
+
+        Returns:
+            Tuple of (train dataset, validation dataset or None)
+        """
+        X = X.astype(np.float32, copy=False)
+        y = y.astype(np.float32, copy=False)
+        split_at = int(math.ceil(len(X) * (1.0 - validation_split)))
+
+        train_ds = (
+            tf.data.Dataset.from_tensor_slices((X[:split_at], y[:split_at]))
+            .cache()
+            .shuffle(max(split_at, 1), reshuffle_each_iteration=True)
+            .batch(batch_size)
+            .prefetch(tf.data.AUTOTUNE)
+        )
+
+        val_ds = None
+        if split_at < len(X):
+            val_ds = (
+                tf.data.Dataset.from_tensor_slices((X[split_at:], y[split_at:]))
+                .batch(batch_size)
+                .cache()
+                .prefetch(tf.data.AUTOTUNE)
+            )
+
+        return train_ds, val_ds
+
     def predict(self, recent_data, steps=30):
         """
         Make multi-step forecast.
@@ -131,27 +206,25 @@ class LSTMTemperatureForecaster:
         # Scale input
         scaled_input = self.scaler.transform(recent_data.reshape(-1, 1)).flatten()
 
-        # Prepare input sequence
-        input_seq = scaled_input[-self.lookback:].reshape(1, self.lookback, 1)
+        # Scaled history followed by room for every forecast block; each
+        # block's input is a view of the last ``lookback`` values before it
+        horizon = self.forecast_horizon
+        n_blocks = -(-steps // horizon)
+        history = np.empty(self.lookback + n_blocks * horizon, dtype=np.float32)
+        history[:self.lookback] = scaled_input[-self.lookback:]
 
-        # Predict
-        predictions = []
-        for _ in range(steps // self.forecast_horizon + 1):
-            pred = self.model.predict(input_seq, verbose=0)
-            predictions.extend(pred[0])
+        # Predict, one forward pass per forecast_horizon block
+        infer = self._inference_fn()
+        for block in range(n_blocks):
+            start = block * horizon
+            input_seq = history[start:start + self.lookback].reshape(1, self.lookback, 1)
+            pred = infer(tf.constant(input_seq)).numpy()
+            history[start + self.lookback:start + self.lookback + horizon] = pred[0]
 
-            # Update sequence for next prediction
-            if len(predictions) < steps:
-                input_seq = np.append(input_seq[:, 1:, :],
-                                     pred.reshape(1, -1, 1)[:, :self.lookback-1, :],
-                                     axis=1)
-
-        predictions = predictions[:steps]
+        predictions = history[self.lookback:self.lookback + steps]
 
         # Inverse scale
-        predictions = self.scaler.inverse_transform(
-            np.array(predictions).reshape(-1, 1)
-        ).flatten()
+        predictions = self.scaler.inverse_transform(predictions.reshape(-1, 1)).flatten()
 
         # Calculate confidence intervals (simplified)
         std_dev = np.std(predictions) * 0.5
@@ -160,6 +233,23 @@ class LSTMTemperatureForecaster:
 
         return predictions, lower_bound, upper_bound
 
+    def _inference_fn(self):
+        """
+        Graph-compiled forward pass of the current model.
+
+        Calling the model directly inside a ``tf.function`` skips the
+        per-call setup of ``Model.predict``; the input signature accepts
+        any batch and sequence length, so it is traced once per model.
+        """
+        if self._infer is None or self._infer_model is not self.model:
+            model = self.model
+            self._infer = tf.function(
+                lambda x: model(x, training=False),
+                input_signature=[tf.TensorSpec([None, None, 1], tf.float32)]
+            )
+            self._infer_model = model
+        return self._infer
+
     def save_model(self, model_path, scaler_path):
         """Save model and scaler."""
         self.model.save(model_path)
@@ -168,4 +258,4 @@ class LSTMTemperatureForecaster:
     def load_model(self, model_path, scaler_path):
         """Load model and scaler."""
         self.model = keras.models.load_model(model_path)
-        self.scaler = joblib.load(scaler_path)
+        self.scaler = joblib.load(scaler_path, mmap_mode='r')
@@ -1,20 +1,117 @@
 """Model prediction and inference."""
 
+import warnings
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import joblib
 
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+    SKL2ONNX_AVAILABLE = True
+except ImportError:
+    SKL2ONNX_AVAILABLE = False
+
+try:
+    import lz4  # noqa: F401
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+
+# joblib compression for archival saves: lz4 when installed, else zlib
+ARCHIVE_COMPRESSION = ('lz4', 3) if LZ4_AVAILABLE else ('zlib', 3)
+
+
+def dump_model(model, file_path: str, compressed: bool = False):
+    """
+    Pickle a model with joblib.
+
+    Uncompressed files can be memory-mapped on load, so predict-only
+    workers share the tree arrays instead of copying them; compressed
+    files are smaller on disk but are read fully into memory.
+
+    Args:
+        model: Model to save
+        file_path: Output path
+        compressed: Compress with ``ARCHIVE_COMPRESSION`` (for archival)
+    """
+    joblib.dump(model, file_path, compress=ARCHIVE_COMPRESSION if compressed else 0)
+
+
+def load_joblib(file_path: str):
+    """
+    Unpickle a joblib file, memory-mapping its arrays read-only.
+
+    Compressed files can't be mapped and are read into memory instead,
+    without joblib's warning about it.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='mmap_mode .* compressed file', category=UserWarning)
+        return joblib.load(file_path, mmap_mode='r')
+
 
 def load_model(file_path: str):
     """
     Load a trained model from disk.
 
+    ``.onnx`` files (see :func:`compile_to_onnx`) are opened as an ONNX
+    Runtime session; anything else is unpickled with joblib, with arrays
+    memory-mapped read-only unless the file is compressed.
+
     Args:
         file_path: Path to the saved model
 
     Returns:
         Loaded model
     """
-    return joblib.load(file_path)
+    if Path(file_path).suffix == '.onnx':
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime not installed. Run: pip install onnxruntime")
+        return ort.InferenceSession(str(file_path), providers=['CPUExecutionProvider'])
+
+    return load_joblib(file_path)
+
+
+def compile_to_onnx(model, n_features: int, path: str) -> str:
+    """
+    Convert a fitted scikit-learn model to ONNX for faster inference.
+
+    Tree ensembles run as compiled ONNX Runtime kernels instead of
+    sklearn's per-estimator Python loop. Inputs are float32, as sklearn's
+    trees use internally.
+
+    Args:
+        model: Fitted scikit-learn estimator
+        n_features: Number of input features
+        path: Output ``.onnx`` file
+
+    Returns:
+        Path of the written model
+    """
+    if not SKL2ONNX_AVAILABLE:
+        raise ImportError("skl2onnx not installed. Run: pip install skl2onnx")
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[('X', FloatTensorType([None, n_features]))],
+        options={id(model): {'zipmap': False}} if hasattr(model, 'predict_proba') else None
+    )
+    Path(path).write_bytes(onnx_model.SerializeToString())
+    return str(path)
+
+
+def _is_onnx_session(model) -> bool:
+    """Whether ``model`` is an ONNX Runtime inference session."""
+    return ONNXRUNTIME_AVAILABLE and isinstance(model, ort.InferenceSession)
 
 
 def make_predictions(model, X: pd.DataFrame):
@@ -22,12 +119,18 @@ def make_predictions(model, X: pd.DataFrame):
     Make predictions using a trained model.
 
     Args:
-        model: Trained model
+        model: Trained model, or an ONNX Runtime session from :func:`load_model`
         X: Feature DataFrame
 
     Returns:
         Array of predictions
     """
+    if _is_onnx_session(model):
+        inputs = {model.get_inputs()[0].name: np.asarray(X, dtype=np.float32)}
+        predictions = model.run(None, inputs)[0]
+        # Regressors come back as an (n, 1) column
+        return predictions.ravel() if predictions.ndim == 2 and predictions.shape[1] == 1 else predictions
+
     return model.predict(X)
 
 
@@ -36,13 +139,13 @@ def predict_with_confidence(model, X: pd.DataFrame):
     Make predictions with confidence intervals if supported.
 
     Args:
-        model: Trained model
+        model: Trained model, or an ONNX Runtime session from :func:`load_model`
         X: Feature DataFrame
 
     Returns:
         Predictions and confidence intervals
     """
-    predictions = model.predict(X)
+    predictions = make_predictions(model, X)
 
     # Add confidence interval logic if model supports it
     # e.g., for sklearn ensemble models
@@ -2,7 +2,10 @@
 
 import pandas as pd
 import numpy as np
+from pathlib import Path
+
 from prophet import Prophet
+from prophet.serialize import model_from_json, model_to_json
 import joblib
 
 
@@ -10,7 +13,8 @@ class ProphetSeasonalAnalyzer:
     """Prophet-based seasonal analysis and forecasting."""
 
     def __init__(self, yearly_seasonality=True, weekly_seasonality=False,
-                 daily_seasonality=False):
+                 daily_seasonality=False, interval_width=0.95,
+                 uncertainty_samples=1000):
         """
         Initialize Prophet analyzer.
 
@@ -18,12 +22,18 @@ class ProphetSeasonalAnalyzer:
             yearly_seasonality: Include yearly seasonality
             weekly_seasonality: Include weekly seasonality
             daily_seasonality: Include daily seasonality
+            interval_width: Width of the yhat_lower/yhat_upper interval
+            uncertainty_samples: Simulated draws per prediction for the
+                interval; 0 skips the simulation when only point forecasts
+                are needed (no interval columns, so no
+                :meth:`detect_anomalies` or :meth:`get_forecast_summary`)
         """
         self.model = Prophet(
             yearly_seasonality=yearly_seasonality,
             weekly_seasonality=weekly_seasonality,
             daily_seasonality=daily_seasonality,
-            interval_width=0.95
+            interval_width=interval_width,
+            uncertainty_samples=uncertainty_samples
         )
         self.fitted = False
 
@@ -51,13 +61,15 @@ class ProphetSeasonalAnalyzer:
 
         return self.model
 
-    def forecast(self, periods=365, freq='D'):
+    def forecast(self, periods=365, freq='D', include_history=True):
         """
         Generate forecast.
 
         Args:
             periods: Number of periods to forecast
             freq: Frequency ('D' for daily, 'M' for monthly, etc.)
+            include_history: Also predict the training dates; without them
+                only the ``periods`` future rows are computed
 
         Returns:
             DataFrame with forecast and components
@@ -66,7 +78,9 @@ class ProphetSeasonalAnalyzer:
             raise ValueError("Model not trained yet!")
 
         # Create future dataframe
-        future = self.model.make_future_dataframe(periods=periods, freq=freq)
+        future = self.model.make_future_dataframe(
+            periods=periods, freq=freq, include_history=include_history
+        )
 
         # Generate forecast
         forecast = self.model.predict(future)
@@ -81,12 +95,20 @@ class ProphetSeasonalAnalyzer:
             forecast: Forecast DataFrame from Prophet
 
         Returns:
-            Dictionary with trend and seasonal components
+            Dictionary with trend and seasonal components, each a columnar
+            ``{'ds': [...], <component>: [...]}`` dict (None if absent)
         """
+        ds = forecast['ds'].tolist()
+
+        def column(name):
+            if name not in forecast.columns:
+                return None
+            return {'ds': ds, name: forecast[name].to_numpy().tolist()}
+
         components = {
-            'trend': forecast[['ds', 'trend']].to_dict('records'),
-            'yearly': forecast[['ds', 'yearly']].to_dict('records') if 'yearly' in forecast.columns else None,
-            'weekly': forecast[['ds', 'weekly']].to_dict('records') if 'weekly' in forecast.columns else None,
+            'trend': column('trend'),
+            'yearly': column('yearly'),
+            'weekly': column('weekly'),
         }
 
         return components
@@ -107,8 +129,9 @@ class ProphetSeasonalAnalyzer:
         if not self.fitted:
             raise ValueError("Model not trained yet!")
 
-        # Get forecast for historical period
-        forecast = self.forecast(periods=0)
+        # Get forecast for historical period, predicting the training
+        # dates directly rather than building a zero-length future frame
+        forecast = self.model.predict(pd.DataFrame({'ds': self.model.history_dates}))
 
         # Merge with actual data
         df_with_forecast = df.copy()
@@ -130,22 +153,38 @@ class ProphetSeasonalAnalyzer:
 
         return merged
 
-    def get_forecast_summary(self, forecast, last_n=30):
+    def get_forecast_summary(self, forecast, last_n=30, prediction_rows=None):
         """
         Get summary of forecast.
 
         Args:
             forecast: Forecast DataFrame
-            last_n: Number of recent predictions to return
+            last_n: Number of recent rows the summary statistics cover
+            prediction_rows: Number of trailing rows listed in
+                ``predictions`` (defaults to ``last_n``)
 
         Returns:
             Dictionary with forecast summary
         """
         recent_forecast = forecast.tail(last_n)
+        listed = recent_forecast if prediction_rows is None else forecast.tail(prediction_rows)
+        trend = forecast['trend'].to_numpy()
+
+        # Rows are zipped from column lists rather than built per row by
+        # to_dict('records'); the shape is unchanged
+        predictions = [
+            {'ds': ds, 'yhat': y, 'yhat_lower': lower, 'yhat_upper': upper}
+            for ds, y, lower, upper in zip(
+                listed['ds'].tolist(),
+                listed['yhat'].tolist(),
+                listed['yhat_lower'].tolist(),
+                listed['yhat_upper'].tolist()
+            )
+        ]
 
         summary = {
-            'predictions': recent_forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].to_dict('records'),
-            'trend_direction': 'increasing' if forecast['trend'].iloc[-1] > forecast['trend'].iloc[-last_n] else 'decreasing',
+            'predictions': predictions,
+            'trend_direction': 'increasing' if trend[-1] > trend[-last_n] else 'decreasing',
             'mean_prediction': float(recent_forecast['yhat'].mean()),
             'uncertainty_range': float(recent_forecast['yhat_upper'].mean() - recent_forecast['yhat_lower'].mean())
         }
@@ -153,10 +192,13 @@ class ProphetSeasonalAnalyzer:
         return summary
 
     def save_model(self, filepath):
-        """Save Prophet model."""
-        joblib.dump(self.model, filepath)
+        """Save Prophet model with Prophet's own JSON serializer."""
+        Path(filepath).write_text(model_to_json(self.model))
 
     def load_model(self, filepath):
-        """Load Prophet model."""
-        self.model = joblib.load(filepath)
+        """Load Prophet model from JSON (``.pkl`` files are legacy joblib pickles)."""
+        if Path(filepath).suffix == '.pkl':
+            self.model = joblib.load(filepath)
+        else:
+            self.model = model_from_json(Path(filepath).read_text())
         self.fitted = True
@@ -4,9 +4,10 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
-import joblib
 from pathlib import Path
 
+from src.models.predict_model import dump_model
+
 
 def split_data(df: pd.DataFrame, target_column: str, test_size: float = 0.2, random_state: int = 42):
     """
@@ -66,14 +67,15 @@ def evaluate_model(model, X_test, y_test):
     return metrics
 
 
-def save_model(model, file_path: str):
+def save_model(model, file_path: str, compressed: bool = False):
     """
     Save trained model to disk.
 
     Args:
         model: Trained model
         file_path: Path to save the model
+        compressed: Compress for archival (the file can't be memory-mapped)
     """
     Path(file_path).parent.mkdir(parents=True, exist_ok=True)
-    joblib.dump(model, file_path)
+    dump_model(model, file_path, compressed=compressed)
     print(f"Model saved to {file_path}")
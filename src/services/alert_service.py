@@ -1,15 +1,120 @@
 """Climate Alert Service integrating ML anomaly detection, Cyoda, and Gemini AI."""
 
-import sys
-from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root))
+from src.services.alert_columns import alerts_to_soa, priority_order
+from src.utils.disk_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+class AIAnalysis(NamedTuple):
+    """Gemini analysis attached to an alert."""
+
+    analysis: Dict[str, Any]
+    recommendations: List[str]
+    summary: str
+
+    def as_alert_params(self) -> Dict[str, Any]:
+        """Map the analysis onto ``CyodaAlertClient.create_alert`` keyword arguments."""
+        return {
+            "ai_analysis": self.analysis,
+            "recommendations": self.recommendations,
+            "description": self.summary
+        }
+
+
+EMPTY_AI_ANALYSIS = AIAnalysis(analysis={}, recommendations=[], summary="")
+
+# Gemini reports kept per service, keyed by alert type, severity, metric and
+# the value/score rounded to 0.1 / 0.01, so runs of near-identical anomalies
+# (heat-wave days, drought stretches) share one API call
+AI_REPORT_CACHE_SIZE = 1024
+
+# With a path set, the same reports also persist in SQLite across restarts
+# (shared by all workers) for AI_REPORT_CACHE_TTL seconds
+AI_REPORT_CACHE_PATH = os.getenv('AI_REPORT_CACHE_PATH')
+AI_REPORT_CACHE_TTL = int(os.getenv('AI_REPORT_CACHE_TTL', 86400))
+_report_store = DiskCache(AI_REPORT_CACHE_PATH) if AI_REPORT_CACHE_PATH else None
+
+# Report lines from the first mention of recommendations/actions onward
+# are scanned for bullet or numbered-list markers
+_RECOMMENDATION_TRIGGER = re.compile(r'recommend|action|should', re.IGNORECASE)
+_MARKED_LINE = re.compile(r'^(?=[^\n]*(?:[•*\-]|[123]\.))[^\n]*', re.MULTILINE)
+
+# Gemini analyses for one detection run are requested concurrently; calls
+# are network-bound, and the bound matches the Gemini API routes
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 8))
+_ai_executor = ThreadPoolExecutor(
+    max_workers=GEMINI_MAX_CONCURRENCY,
+    thread_name_prefix='alert-ai'
+)
+
+
+def _isoformat_dates(dates: pd.Series) -> List[str]:
+    """
+    ISO 8601 strings for a date column, as ``Timestamp.isoformat()`` gives.
+
+    Naive datetime columns with whole-second values are formatted in one
+    vectorized pass; anything else (strings, tz-aware, NaT, sub-second
+    values) goes element by element, strings passing through unchanged.
+    """
+    if pd.api.types.is_datetime64_dtype(dates):
+        ns = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        if not dates.isna().any() and not (ns % 1_000_000_000).any():
+            return dates.dt.strftime('%Y-%m-%dT%H:%M:%S').tolist()
+
+    return [date if isinstance(date, str) else date.isoformat() for date in dates]
+
+
+# Read-only lookup tables shared by every alert
+ALERT_NAMES = MappingProxyType({
+    "heat_wave": "Heat Wave",
+    "cold_snap": "Cold Snap",
+    "freeze_event": "Freeze Event",
+    "extreme_precipitation": "Extreme Precipitation",
+    "drought_indicator": "Drought Indicator",
+    "temperature_anomaly": "Temperature Anomaly",
+    "precipitation_anomaly": "Precipitation Anomaly",
+    "climate_anomaly": "Climate Anomaly"
+})
+
+# Any metric other than temperature is reported in millimetres
+METRIC_UNITS = MappingProxyType({"temperature": "°C", "precipitation": "mm"})
+
+
+@lru_cache(maxsize=256)
+def _description_parts(alert_type: str, severity: str, metric: str) -> Tuple[str, str]:
+    """Memoized (prefix, unit) of an alert description; only the value varies."""
+    alert_name = ALERT_NAMES.get(alert_type, "Climate Alert")
+    unit = METRIC_UNITS.get(metric, "mm")
+
+    return f"{severity.title()} {alert_name} detected: ", unit
+
+
+def _value_counts(alerts: List[Dict], key: str) -> Dict[Any, int]:
+    """
+    Count the values of ``key`` across alerts, most frequent first.
+
+    Matches ``pd.DataFrame(alerts)[key].value_counts().to_dict()``: alerts
+    without the key (or with None) are not counted, and ties keep the order
+    values first appear in.
+    """
+    counts = Counter(alert.get(key) for alert in alerts)
+    counts.pop(None, None)
+    return dict(counts.most_common())
 
 
 class ClimateAlertService:
@@ -22,7 +127,8 @@ class ClimateAlertService:
     - Gemini AI analysis
     """
 
-    def __init__(self, anomaly_detector=None, gemini_client=None, cyoda_client=None):
+    def __init__(self, anomaly_detector=None, gemini_client=None, cyoda_client=None,
+                 report_store=None):
         """
         Initialize alert service.
 
@@ -30,10 +136,16 @@ class ClimateAlertService:
             anomaly_detector: Instance of ClimateAnomalyDetector (optional)
             gemini_client: Instance of GeminiClimateAnalyst (optional)
             cyoda_client: Instance of CyodaAlertClient (optional)
+            report_store: Persistent cache for Gemini reports, e.g. a
+                DiskCache (defaults to the one at ``AI_REPORT_CACHE_PATH``,
+                if set)
         """
         self.anomaly_detector = anomaly_detector
         self.gemini_client = gemini_client
         self.cyoda_client = cyoda_client
+        self.report_store = report_store if report_store is not None else _report_store
+        self._report_cache = OrderedDict()
+        self._report_cache_lock = threading.Lock()
 
     def detect_and_create_alerts(
         self,
@@ -61,25 +173,43 @@ class ClimateAlertService:
             raise ValueError("Cyoda client not initialized")
 
         # Detect anomalies using ML model
-        results = self.anomaly_detector.detect(climate_data, value_column=value_column)
-
-        # Filter for actual anomalies
-        anomalies = results[results['is_anomaly'] == True].copy()
-
-        alerts = []
-
-        for _, row in anomalies.iterrows():
-            # Extract anomaly details
-            date_raw = row.get('date', datetime.utcnow().isoformat())
-            # Convert Timestamp to string immediately
-            date = date_raw if isinstance(date_raw, str) else date_raw.isoformat()
-            value = float(row[value_column])
-            anomaly_score = float(row['anomaly_score'])
+        anomalies = self._detect_anomalies(climate_data, value_column)
+        if anomalies is None:
+            return []
 
-            # Classify severity and type
-            severity = self.cyoda_client.classify_severity(anomaly_score, value, metric)
-            alert_type = self.cyoda_client.determine_alert_type(value, metric)
+        records = []
+
+        # Plain columns instead of a Series per row
+        if 'date' in anomalies:
+            dates = _isoformat_dates(anomalies['date'])
+        else:
+            dates = [datetime.utcnow().isoformat()] * len(anomalies)
+        values = anomalies[value_column].to_numpy(dtype=np.float64)
+        scores = anomalies['anomaly_score'].to_numpy(dtype=np.float64)
+
+        # Classify severity and type for all anomalies at once
+        severities = self.cyoda_client.classify_severity_batch(scores, values, metric).tolist()
+        alert_types = self.cyoda_client.determine_alert_type_batch(values, metric).tolist()
+
+        rows = list(zip(dates, values.tolist(), scores.tolist(), severities, alert_types))
+
+        # Start every Gemini analysis up front so the round trips overlap
+        analyses = None
+        if use_ai_analysis and self.gemini_client is not None:
+            analyses = [
+                _ai_executor.submit(
+                    self._generate_ai_analysis,
+                    alert_type=alert_type,
+                    severity=severity,
+                    value=value,
+                    metric=metric,
+                    anomaly_score=anomaly_score,
+                    date=date
+                )
+                for date, value, anomaly_score, severity, alert_type in rows
+            ]
 
+        for i, (date, value, anomaly_score, severity, alert_type) in enumerate(rows):
             # Prepare alert data
             alert_params = {
                 "alert_type": alert_type,
@@ -92,21 +222,11 @@ class ClimateAlertService:
             }
 
             # Add AI analysis if enabled
-            if use_ai_analysis and self.gemini_client is not None:
+            if analyses is not None:
                 try:
-                    ai_analysis = self._generate_ai_analysis(
-                        alert_type=alert_type,
-                        severity=severity,
-                        value=value,
-                        metric=metric,
-                        anomaly_score=anomaly_score,
-                        date=date
-                    )
-                    alert_params["ai_analysis"] = ai_analysis.get("analysis", {})
-                    alert_params["recommendations"] = ai_analysis.get("recommendations", [])
-                    alert_params["description"] = ai_analysis.get("summary", "")
+                    alert_params.update(analyses[i].result().as_alert_params())
                 except Exception as e:
-                    print(f"AI analysis failed: {e}")
+                    logger.warning("AI analysis failed: %s", e)
                     alert_params["description"] = self._generate_basic_description(
                         alert_type, severity, value, metric
                     )
@@ -115,11 +235,85 @@ class ClimateAlertService:
                     alert_type, severity, value, metric
                 )
 
-            # Create alert entity specification
-            alert_spec = self.cyoda_client.create_alert(**alert_params)
-            alerts.append(alert_spec)
+            records.append(alert_params)
+
+        # Create alert entity specifications in one batch
+        return self.cyoda_client.create_alerts(records)
+
+    def _detect_anomalies(
+        self,
+        climate_data: pd.DataFrame,
+        value_column: str
+    ) -> Optional[pd.DataFrame]:
+        """
+        Date, value and score rows of the anomalies found in ``climate_data``.
+
+        Detectors with ``detect_arrays`` score the value column directly, so
+        only the anomalous rows are ever materialized; otherwise ``detect``
+        returns the full result frame and it is filtered here.
+
+        Returns:
+            Anomaly rows, or None when there are none (the common case),
+            before any filtering is done
+        """
+        if hasattr(self.anomaly_detector, 'detect_arrays'):
+            values = climate_data[value_column]
+            dates = None
+            if 'date' in climate_data:
+                dates = pd.DatetimeIndex(pd.to_datetime(climate_data['date']))
+
+            is_anomaly, scores = self.anomaly_detector.detect_arrays(values, dates)
+            mask = np.asarray(is_anomaly, dtype=bool)
+            if not mask.any():
+                return None
+
+            columns = {value_column: values.to_numpy()[mask], 'anomaly_score': scores[mask]}
+            if dates is not None:
+                columns = {'date': dates[mask], **columns}
+            return pd.DataFrame(columns)
+
+        results = self.anomaly_detector.detect(climate_data, value_column=value_column)
+
+        # Filter for actual anomalies, gathering only the columns read below
+        mask = results['is_anomaly'].to_numpy(dtype=bool)
+        if not mask.any():
+            return None
+
+        columns = [c for c in ('date', value_column, 'anomaly_score') if c in results]
+        return results.loc[mask, columns]
+
+    def detect_and_create_alerts_arrays(
+        self,
+        values: np.ndarray,
+        dates: np.ndarray,
+        value_column: str = 'value',
+        metric: str = 'temperature',
+        use_ai_analysis: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Detect anomalies from columnar arrays and create alerts in Cyoda.
+
+        Builds the detector input directly from the two columns, skipping
+        per-record dtype inference of ``pd.DataFrame(list_of_dicts)``.
+
+        Args:
+            values: float64 array of measurements
+            dates: datetime64[ns] array aligned with ``values``
+            value_column: Column name to use for values
+            metric: Climate metric type
+            use_ai_analysis: Whether to use Gemini AI for analysis
+
+        Returns:
+            List of alert creation parameters for Cyoda
+        """
+        climate_data = pd.DataFrame({'date': dates, value_column: values}, copy=False)
 
-        return alerts
+        return self.detect_and_create_alerts(
+            climate_data=climate_data,
+            value_column=value_column,
+            metric=metric,
+            use_ai_analysis=use_ai_analysis
+        )
 
     def _generate_ai_analysis(
         self,
@@ -129,7 +323,7 @@ class ClimateAlertService:
         metric: str,
         anomaly_score: float,
         date: str
-    ) -> Dict[str, Any]:
+    ) -> AIAnalysis:
         """
         Generate AI-powered analysis for an alert.
 
@@ -142,24 +336,22 @@ class ClimateAlertService:
             date: Date of alert
 
         Returns:
-            Dict with analysis, recommendations, and summary
+            AIAnalysis with analysis, recommendations, and summary
+            (empty if Gemini is unavailable or fails)
         """
         if self.gemini_client is None:
-            return {}
-
-        # Prepare context for Gemini
-        anomaly_data = [{
-            "date": date,
-            "value": value,
-            "anomaly_score": anomaly_score,
-            "alert_type": alert_type,
-            "severity": severity,
-            "metric": metric
-        }]
+            return EMPTY_AI_ANALYSIS
 
         # Generate comprehensive analysis
         try:
-            report = self.gemini_client.generate_anomaly_report(anomaly_data)
+            report = self._anomaly_report(
+                alert_type=alert_type,
+                severity=severity,
+                value=value,
+                metric=metric,
+                anomaly_score=anomaly_score,
+                date=date
+            )
 
             # Extract recommendations
             recommendations = self._extract_recommendations_from_report(
@@ -169,20 +361,95 @@ class ClimateAlertService:
             # Generate summary
             summary = self._generate_summary(alert_type, severity, value, metric)
 
-            return {
-                "analysis": {
+            return AIAnalysis(
+                analysis={
                     "full_report": report,
                     "alert_type": alert_type,
                     "severity": severity,
                     "confidence": anomaly_score
                 },
-                "recommendations": recommendations,
-                "summary": summary
-            }
+                recommendations=recommendations,
+                summary=summary
+            )
 
         except Exception as e:
-            print(f"Gemini analysis error: {e}")
-            return {}
+            logger.warning("Gemini analysis error: %s", e)
+            return EMPTY_AI_ANALYSIS
+
+    def _anomaly_report(
+        self,
+        alert_type: str,
+        severity: str,
+        value: float,
+        metric: str,
+        anomaly_score: float,
+        date: str
+    ) -> str:
+        """
+        Gemini anomaly report for an alert, reusing one for a similar alert.
+
+        Reports are memoized per service (LRU, ``AI_REPORT_CACHE_SIZE``
+        entries) on the alert type, severity, metric and the value and score
+        rounded to 0.1 and 0.01. A cached report may therefore describe a
+        near-identical anomaly on another date. Concurrent requests for the
+        same key wait on one call; failed calls are not cached. Misses are
+        looked up in ``report_store`` before calling Gemini, keyed on the
+        same fields plus the client's prompt version.
+
+        Returns:
+            Report text
+        """
+        value_bucket = round(value, 1)
+        score_bucket = round(anomaly_score, 2)
+        key = (id(self.gemini_client), alert_type, severity, metric, value_bucket, score_bucket)
+
+        with self._report_cache_lock:
+            pending = self._report_cache.get(key)
+            if pending is not None:
+                self._report_cache.move_to_end(key)
+            else:
+                future = Future()
+                self._report_cache[key] = future
+                while len(self._report_cache) > AI_REPORT_CACHE_SIZE:
+                    self._report_cache.popitem(last=False)
+
+        if pending is not None:
+            return pending.result()
+
+        store_key = None
+        if self.report_store is not None:
+            version = getattr(self.gemini_client, 'PROMPT_VERSION', 0)
+            fields = f'{version}|{alert_type}|{severity}|{metric}|{value_bucket}|{score_bucket}'
+            store_key = 'ai_report:' + hashlib.blake2b(fields.encode('utf-8'), digest_size=16).hexdigest()
+
+        # Prepare context for Gemini
+        anomaly_data = [{
+            "date": date,
+            "value": value,
+            "anomaly_score": anomaly_score,
+            "alert_type": alert_type,
+            "severity": severity,
+            "metric": metric
+        }]
+
+        try:
+            report = self.report_store.get(store_key) if store_key is not None else None
+            if report is not None:
+                future.set_result(report)
+                return report
+
+            report = self.gemini_client.generate_anomaly_report(anomaly_data)
+        except BaseException as e:
+            with self._report_cache_lock:
+                if self._report_cache.get(key) is future:
+                    del self._report_cache[key]
+            future.set_exception(e)
+            raise
+
+        future.set_result(report)
+        if store_key is not None:
+            self.report_store.set(store_key, report, AI_REPORT_CACHE_TTL)
+        return report
 
     def _extract_recommendations_from_report(
         self,
@@ -204,19 +471,19 @@ class ClimateAlertService:
         # Parse report for recommendations section
         recommendations = []
 
-        # Look for recommendation keywords
-        lines = report.split('\n')
-        in_recommendations = False
-
-        for line in lines:
-            line_lower = line.lower()
-            if 'recommend' in line_lower or 'action' in line_lower or 'should' in line_lower:
-                in_recommendations = True
-            if in_recommendations and line.strip() and not line.strip().startswith('#'):
-                if any(marker in line for marker in ['•', '-', '*', '1.', '2.', '3.']):
-                    clean_line = line.strip().lstrip('•-*123456789. ')
-                    if clean_line:
-                        recommendations.append(clean_line)
+        # Look for recommendation keywords; the section starts on that line
+        trigger = _RECOMMENDATION_TRIGGER.search(report)
+        if trigger is not None:
+            start = report.rfind('\n', 0, trigger.start()) + 1
+            for match in _MARKED_LINE.finditer(report, start):
+                line = match.group().strip()
+                if line.startswith('#'):
+                    continue
+                clean_line = line.lstrip('•-*123456789. ')
+                if clean_line:
+                    recommendations.append(clean_line)
+                    if len(recommendations) == 5:
+                        break
 
         # Add default recommendations if none found
         if not recommendations:
@@ -267,21 +534,9 @@ class ClimateAlertService:
         metric: str
     ) -> str:
         """Generate basic description without AI."""
-        alert_names = {
-            "heat_wave": "Heat Wave",
-            "cold_snap": "Cold Snap",
-            "freeze_event": "Freeze Event",
-            "extreme_precipitation": "Extreme Precipitation",
-            "drought_indicator": "Drought Indicator",
-            "temperature_anomaly": "Temperature Anomaly",
-            "precipitation_anomaly": "Precipitation Anomaly",
-            "climate_anomaly": "Climate Anomaly"
-        }
+        prefix, unit = _description_parts(alert_type, severity, metric)
 
-        alert_name = alert_names.get(alert_type, "Climate Alert")
-        unit = "°C" if metric == "temperature" else "mm"
-
-        return f"{severity.title()} {alert_name} detected: {value:.1f}{unit}"
+        return f"{prefix}{value:.1f}{unit}"
 
     def _generate_summary(
         self,
@@ -311,16 +566,18 @@ class ClimateAlertService:
                 "critical_count": 0
             }
 
-        df = pd.DataFrame(alerts)
+        # One pass per field over the dicts; no DataFrame or boolean masks
+        by_severity = _value_counts(alerts, 'severity')
+        by_type = _value_counts(alerts, 'alert_type')
 
         summary = {
             "total": len(alerts),
-            "by_severity": df['severity'].value_counts().to_dict() if 'severity' in df else {},
-            "by_type": df['alert_type'].value_counts().to_dict() if 'alert_type' in df else {},
-            "critical_count": len(df[df['severity'] == 'critical']) if 'severity' in df else 0,
-            "active_count": len(df[df['status'] == 'active']) if 'status' in df else 0,
-            "acknowledged_count": len(df[df.get('acknowledged', False) == True]) if 'acknowledged' in df else 0,
-            "resolved_count": len(df[df.get('resolved', False) == True]) if 'resolved' in df else 0
+            "by_severity": by_severity,
+            "by_type": by_type,
+            "critical_count": by_severity.get('critical', 0),
+            "active_count": sum(1 for alert in alerts if alert.get('status') == 'active'),
+            "acknowledged_count": sum(1 for alert in alerts if alert.get('acknowledged') == True),  # noqa: E712
+            "resolved_count": sum(1 for alert in alerts if alert.get('resolved') == True)  # noqa: E712
         }
 
         return summary
@@ -338,21 +595,7 @@ class ClimateAlertService:
         if not alerts:
             return []
 
-        severity_order = {"critical": 4, "high": 3, "medium": 2, "low": 1}
-
-        def priority_score(alert):
-            severity_score = severity_order.get(alert.get('severity', 'low'), 0)
-            # Boost score for unacknowledged alerts
-            ack_penalty = 0 if alert.get('acknowledged', False) else 2
-            # Recent alerts get higher priority
-            try:
-                date = pd.to_datetime(alert.get('date', '2000-01-01'))
-                days_ago = (pd.Timestamp.now() - date).days
-                recency_score = max(0, 30 - days_ago) / 30  # Normalize to 0-1
-            except:
-                recency_score = 0
-
-            return severity_score + ack_penalty + recency_score
+        columns = alerts_to_soa(alerts)
+        order = priority_order(columns)
 
-        sorted_alerts = sorted(alerts, key=priority_score, reverse=True)
-        return sorted_alerts
+        return [alerts[i] for i in order.tolist()]
@@ -6,6 +6,7 @@ create/update/query entities in Cyoda using MCP tools.
 """
 
 import os
+import re
 import json
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -16,6 +17,17 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+# Transport for the Gemini client; gRPC keeps one long-lived channel, so
+# every prompt reuses the same connection instead of a new TLS handshake
+GEMINI_TRANSPORT = os.getenv('GEMINI_TRANSPORT', 'grpc')
+
+# Every prompt in this module asks for JSON; requesting it as the response
+# type returns a bare document, without Markdown fences to strip
+JSON_GENERATION_CONFIG = {'response_mime_type': 'application/json'}
+
+# Optional ```json / ``` fence around a Gemini JSON answer (text already stripped)
+_JSON_FENCE = re.compile(r'(?:```json)?(?:```)?(.*?)(?:```)?', re.DOTALL)
+
 
 class GeminiCyodaIntegration:
     """
@@ -39,9 +51,12 @@ class GeminiCyodaIntegration:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not configured")
 
-        genai.configure(api_key=self.api_key)
+        genai.configure(api_key=self.api_key, transport=GEMINI_TRANSPORT)
         # Use models/gemini-2.5-flash - the models/ prefix is required!
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+        self.model = genai.GenerativeModel(
+            'models/gemini-2.5-flash',
+            generation_config=JSON_GENERATION_CONFIG
+        )
 
     def analyze_and_create_alert(
         self,
@@ -81,14 +96,17 @@ class GeminiCyodaIntegration:
         response = self.model.generate_content(analysis_prompt)
         analysis = self._parse_json_response(response.text)
 
+        # One timestamp for the result and the entity it describes
+        now_iso = datetime.utcnow().isoformat()
+
         result = {
             "gemini_analysis": analysis,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": now_iso
         }
 
         # Step 2: Generate Cyoda MCP specification if alert needed
         if analysis.get('should_create_alert') and create_in_cyoda:
-            mcp_spec = self._create_alert_entity_spec(climate_data, analysis)
+            mcp_spec = self._create_alert_entity_spec(climate_data, analysis, now_iso)
             result['cyoda_mcp_spec'] = mcp_spec
             result['action'] = 'create_alert_entity'
 
@@ -97,7 +115,8 @@ class GeminiCyodaIntegration:
     def analyze_trends_and_store(
         self,
         historical_data: List[Dict],
-        analysis_type: str = "trend_analysis"
+        analysis_type: str = "trend_analysis",
+        statistics: Optional[Dict] = None
     ) -> Dict[str, Any]:
         """
         Use Gemini to analyze trends and store analysis as Cyoda entity.
@@ -105,6 +124,8 @@ class GeminiCyodaIntegration:
         Args:
             historical_data: List of historical climate measurements
             analysis_type: Type of analysis to perform
+            statistics: Precomputed summary of the full series (see
+                src.services.trend_stats.summarize_history)
 
         Returns:
             Dict with analysis and MCP specification
@@ -115,6 +136,7 @@ class GeminiCyodaIntegration:
 
         Data points: {len(historical_data)}
         Sample: {json.dumps(historical_data[:5], indent=2)}
+        {f"Statistics over all points: {json.dumps(statistics)}" if statistics else ""}
 
         Provide trend analysis in JSON format:
         {{
@@ -334,9 +356,20 @@ class GeminiCyodaIntegration:
     def _create_alert_entity_spec(
         self,
         climate_data: Dict,
-        analysis: Dict
+        analysis: Dict,
+        now_iso: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Generate Cyoda MCP specification for alert entity."""
+        """
+        Generate Cyoda MCP specification for alert entity.
+
+        Args:
+            climate_data: Climate measurements and context
+            analysis: Parsed Gemini analysis
+            now_iso: Creation timestamp, also the date fallback (defaults to now)
+        """
+        if now_iso is None:
+            now_iso = datetime.utcnow().isoformat()
+
         return {
             "entity_model": "climate_alert",
             "entity_version": "1",
@@ -344,14 +377,14 @@ class GeminiCyodaIntegration:
                 "alert_type": analysis.get('alert_type', 'climate_anomaly'),
                 "severity": analysis.get('severity', 'medium'),
                 "value": climate_data.get('value'),
-                "date": climate_data.get('date', datetime.utcnow().isoformat()),
+                "date": climate_data.get('date', now_iso),
                 "anomaly_score": analysis.get('confidence', 0.5),
                 "location": "Uruguay",
                 "metric": climate_data.get('metric', 'temperature'),
                 "status": "active",
                 "acknowledged": False,
                 "resolved": False,
-                "created_at": datetime.utcnow().isoformat(),
+                "created_at": now_iso,
                 "description": analysis.get('summary'),
                 "ai_analysis": {
                     "full_analysis": analysis.get('detailed_analysis'),
@@ -366,13 +399,7 @@ class GeminiCyodaIntegration:
     def _parse_json_response(self, text: str) -> Dict:
         """Parse JSON from Gemini response, handling markdown code blocks."""
         # Remove markdown code blocks if present
-        text = text.strip()
-        if text.startswith('```json'):
-            text = text[7:]
-        if text.startswith('```'):
-            text = text[3:]
-        if text.endswith('```'):
-            text = text[:-3]
+        text = _JSON_FENCE.fullmatch(text.strip()).group(1)
 
         try:
             return json.loads(text.strip())
@@ -0,0 +1,140 @@
+"""Summary statistics over historical climate series for trend analysis."""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Points further than this many standard deviations from the mean are anomalies
+ANOMALY_Z_THRESHOLD = 2.0
+
+_NS_PER_DAY = 86_400 * 10**9
+
+
+def _parse_history(
+    records: List[Dict],
+    value_key: str = 'temp'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert ``{date, value}`` records into flat time and value arrays.
+
+    Records without a numeric value are dropped.
+
+    Args:
+        records: Historical measurements
+        value_key: Record key holding the measurement
+
+    Returns:
+        Tuple of (days since epoch as float64, values as float64)
+
+    Raises:
+        ValueError: If a date cannot be parsed
+    """
+    values = np.fromiter(
+        (r.get(value_key) if isinstance(r.get(value_key), (int, float)) else np.nan
+         for r in records),
+        dtype=np.float64,
+        count=len(records)
+    )
+    dates = np.array([r.get('date') for r in records], dtype='datetime64[ns]')
+
+    mask = ~np.isnan(values) & ~np.isnat(dates)
+    days = dates[mask].astype(np.int64) / _NS_PER_DAY
+
+    return days, values[mask]
+
+
+def _trend_stats_numpy(t, v, z_threshold):
+    """NumPy fallback for :func:`_trend_stats`."""
+    n = v.shape[0]
+    mean = v.mean()
+    std = v.std()
+    t_centered = t - t.mean()
+    t_var = np.dot(t_centered, t_centered)
+    slope = np.dot(t_centered, v - mean) / t_var if t_var > 0 else 0.0
+    anomalies = int(np.count_nonzero(np.abs(v - mean) > z_threshold * std)) if std > 0 else 0
+    return n, mean, std, v.min(), v.max(), slope, anomalies
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _trend_stats_jit(t, v, z_threshold):
+        """One-pass (Welford) mean/std and least-squares slope, plus anomaly count."""
+        n = v.shape[0]
+        mean_t = 0.0
+        mean_v = 0.0
+        m2_t = 0.0
+        m2_v = 0.0
+        c_tv = 0.0
+        v_min = v[0]
+        v_max = v[0]
+        for i in range(n):
+            k = i + 1
+            dt = t[i] - mean_t
+            dv = v[i] - mean_v
+            mean_t += dt / k
+            mean_v += dv / k
+            m2_t += dt * (t[i] - mean_t)
+            m2_v += dv * (v[i] - mean_v)
+            c_tv += dt * (v[i] - mean_v)
+            if v[i] < v_min:
+                v_min = v[i]
+            if v[i] > v_max:
+                v_max = v[i]
+
+        std = np.sqrt(m2_v / n)
+        slope = c_tv / m2_t if m2_t > 0 else 0.0
+
+        anomalies = 0
+        if std > 0:
+            limit = z_threshold * std
+            for i in range(n):
+                if abs(v[i] - mean_v) > limit:
+                    anomalies += 1
+
+        return n, mean_v, std, v_min, v_max, slope, anomalies
+
+
+def _trend_stats(t: np.ndarray, v: np.ndarray, z_threshold: float = ANOMALY_Z_THRESHOLD):
+    """Dispatch to the Numba kernel when available."""
+    if NUMBA_AVAILABLE:
+        return _trend_stats_jit(t, v, z_threshold)
+
+    return _trend_stats_numpy(t, v, z_threshold)
+
+
+def summarize_history(records: List[Dict], value_key: str = 'temp') -> Optional[Dict]:
+    """
+    Compute a compact statistical summary of a historical series.
+
+    Args:
+        records: Historical measurements with ``date`` and ``value_key`` fields
+        value_key: Record key holding the measurement
+
+    Returns:
+        Dict with count, mean, std, min, max, slope per day and anomaly count,
+        or None if no usable points were found or dates could not be parsed
+    """
+    try:
+        t, v = _parse_history(records, value_key)
+    except (TypeError, ValueError):
+        return None
+
+    if v.shape[0] == 0:
+        return None
+
+    n, mean, std, v_min, v_max, slope, anomalies = _trend_stats(t, v)
+
+    return {
+        'count': int(n),
+        'mean': round(float(mean), 4),
+        'std': round(float(std), 4),
+        'min': float(v_min),
+        'max': float(v_max),
+        'slope_per_day': float(slope),
+        'anomalies': int(anomalies),
+    }
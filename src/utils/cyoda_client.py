@@ -1,8 +1,124 @@
 """Cyoda MCP client for climate alert management."""
 
 import os
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import time
+from datetime import date
+from typing import Dict, List, Optional, Any, Union
+from types import MappingProxyType
+import numpy as np
+
+SEVERITY_LEVELS = np.array(["low", "medium", "high", "critical"])
+
+# Per-metric (anomaly score, upper value, lower value) limits for the
+# critical and high levels; None disables that bound
+_SEVERITY_LIMITS = {
+    "temperature": ((0.9, 40, -10), (0.7, 35, -5)),
+    "precipitation": ((0.9, 100, None), (0.7, 50, None)),
+}
+_DEFAULT_SEVERITY_LIMITS = ((0.85, None, None), (0.7, None, None))
+_MEDIUM_SCORE_LIMIT = 0.5
+
+# Per-metric digitize bins and alert types, matching determine_alert_type;
+# upper edges are nudged so "value > x" stays strict
+_ALERT_TYPE_BINS = {
+    "temperature": (
+        np.array([0.0, 5.0, np.nextafter(35.0, np.inf)]),
+        np.array(["freeze_event", "cold_snap", "temperature_anomaly", "heat_wave"]),
+    ),
+    "precipitation": (
+        np.array([0.1, np.nextafter(50.0, np.inf)]),
+        np.array(["drought_indicator", "precipitation_anomaly", "extreme_precipitation"]),
+    ),
+}
+
+# search_alerts filter -> (jsonPath, operator) of its condition; empty
+# strings are skipped like None, while a zero score threshold still applies
+_SEARCH_FIELDS = (
+    ("status", "$.status", "EQUALS"),
+    ("severity", "$.severity", "EQUALS"),
+    ("alert_type", "$.alert_type", "EQUALS"),
+    ("min_anomaly_score", "$.anomaly_score", "GREATER_THAN"),
+    ("date_from", "$.date", "GREATER_THAN"),
+    ("date_to", "$.date", "LESS_THAN"),
+)
+_SEARCH_FIELD_NAMES = frozenset(name for name, _, _ in _SEARCH_FIELDS)
+_DATE_FILTERS = frozenset(("date_from", "date_to"))
+
+# Read-only per-filter condition bodies; each search copies one and adds its value
+_CONDITION_TEMPLATES = {
+    name: MappingProxyType({"type": "simple", "jsonPath": json_path, "operatorType": operator})
+    for name, json_path, operator in _SEARCH_FIELDS
+}
+
+
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string to the second, e.g. ``2024-01-31T12:00:00Z``."""
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def _iso(value: Union[str, date]) -> str:
+    """
+    ISO string for a date filter value; strings are passed through as-is.
+
+    Accepts ``date``, ``datetime`` and ``pandas.Timestamp`` values, so Cyoda
+    compares like-formatted strings.
+    """
+    if isinstance(value, str):
+        return value
+    return value.isoformat()
+
+
+def _simple_conditions(filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cyoda ``simple`` conditions for the set values of a filter dict."""
+    return [
+        {**template, "value": _iso(value) if name in _DATE_FILTERS else value}
+        for name, template in _CONDITION_TEMPLATES.items()
+        if (value := filters.get(name)) is not None and value != ""
+    ]
+
+
+def _combine(operator: str, conditions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Join conditions into a Cyoda group, unwrapping a single condition."""
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {"type": "group", "operator": operator, "conditions": conditions}
+
+
+def _translate_filter_tree(node: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Translate a filter tree into nested Cyoda search conditions.
+
+    Interior nodes are ``{"and": [...]}`` or ``{"or": [...]}``; leaves map
+    search_alerts filter names to values and AND them together, e.g.
+    ``{"or": [{"severity": "critical"}, {"severity": "high", "status": "active"}]}``.
+
+    Args:
+        node: Filter tree node
+
+    Returns:
+        Cyoda condition, or None if the tree sets no filters
+
+    Raises:
+        ValueError: If the tree is malformed or names an unknown filter
+    """
+    if not isinstance(node, dict):
+        raise ValueError(f"Filter tree nodes must be objects, got {type(node).__name__}")
+
+    for key in ("and", "or"):
+        if key in node:
+            children = node[key]
+            if len(node) != 1 or not isinstance(children, list):
+                raise ValueError(f'"{key}" nodes must be {{"{key}": [...]}} with no other keys')
+            translated = [_translate_filter_tree(child) for child in children]
+            return _combine(key.upper(), [c for c in translated if c is not None])
+
+    unknown = sorted(set(node) - _SEARCH_FIELD_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown search filters: {', '.join(unknown)}")
+
+    return _combine("AND", _simple_conditions(node))
 
 
 class CyodaAlertClient:
@@ -11,6 +127,10 @@ class CyodaAlertClient:
 
     Uses MCP tools for entity management. This class provides
     a Python interface that wraps the MCP tool calls.
+
+    The client only builds MCP specifications; the tool calls themselves
+    are executed by the MCP host, so it holds no network connections and
+    a single instance can be shared across request threads.
     """
 
     ENTITY_MODEL = "climate_alert"
@@ -33,7 +153,8 @@ class CyodaAlertClient:
         metric: str = "temperature",
         description: Optional[str] = None,
         ai_analysis: Optional[Dict] = None,
-        recommendations: Optional[List[str]] = None
+        recommendations: Optional[List[str]] = None,
+        created_at: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Create a new climate alert entity in Cyoda.
@@ -49,6 +170,7 @@ class CyodaAlertClient:
             description: Optional human-readable description
             ai_analysis: Optional Gemini AI analysis results
             recommendations: Optional list of recommendations
+            created_at: ISO creation timestamp (defaults to now)
 
         Returns:
             Dict with success status, entity_id, and created entity data
@@ -62,7 +184,7 @@ class CyodaAlertClient:
             "location": location,
             "metric": metric,
             "status": "active",
-            "created_at": datetime.utcnow().isoformat(),
+            "created_at": created_at or _utc_now_iso(),
             "acknowledged": False,
             "resolved": False
         }
@@ -84,6 +206,21 @@ class CyodaAlertClient:
             "entity_data": entity_data
         }
 
+    def create_alerts(self, alerts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create several alert entities, stamped with one creation time.
+
+        Args:
+            alerts: :meth:`create_alert` keyword arguments, one dict per alert
+
+        Returns:
+            List of entity specifications, in input order
+        """
+        created_at = _utc_now_iso()
+        create = self.create_alert
+
+        return [create(created_at=created_at, **params) for params in alerts]
+
     def get_alert(self, alert_id: str) -> Dict[str, Any]:
         """
         Retrieve an alert by ID.
@@ -118,72 +255,47 @@ class CyodaAlertClient:
         severity: Optional[str] = None,
         alert_type: Optional[str] = None,
         min_anomaly_score: Optional[float] = None,
-        date_from: Optional[str] = None,
-        date_to: Optional[str] = None
+        date_from: Optional[Union[str, date]] = None,
+        date_to: Optional[Union[str, date]] = None,
+        filter_tree: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Search alerts with filters using Cyoda search conditions.
 
+        The keyword filters and ``filter_tree`` are all ANDed together;
+        ``filter_tree`` adds nested AND/OR groups, so disjunctions are
+        evaluated by Cyoda instead of by filtering a broad result set.
+
         Args:
             status: Filter by status (active, acknowledged, resolved)
             severity: Filter by severity (low, medium, high, critical)
             alert_type: Filter by type (heat_wave, cold_snap, etc.)
             min_anomaly_score: Minimum anomaly score threshold
-            date_from: Start date for date range filter
-            date_to: End date for date range filter
+            date_from: Start date for date range filter (ISO string, or a
+                date/datetime/Timestamp converted with ``isoformat()``)
+            date_to: End date for date range filter (same forms as ``date_from``)
+            filter_tree: Optional nested filters, e.g.
+                ``{"or": [{"severity": "critical"}, {"min_anomaly_score": 0.9}]}``
+                (see :func:`_translate_filter_tree`)
 
         Returns:
             Dict for mcp__cyoda__search_search tool call with search conditions
-        """
-        conditions = []
 
-        if status:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.status",
-                "operatorType": "EQUALS",
-                "value": status
-            })
-
-        if severity:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.severity",
-                "operatorType": "EQUALS",
-                "value": severity
-            })
-
-        if alert_type:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.alert_type",
-                "operatorType": "EQUALS",
-                "value": alert_type
-            })
-
-        if min_anomaly_score is not None:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.anomaly_score",
-                "operatorType": "GREATER_THAN",
-                "value": min_anomaly_score
-            })
-
-        if date_from:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.date",
-                "operatorType": "GREATER_THAN",
-                "value": date_from
-            })
-
-        if date_to:
-            conditions.append({
-                "type": "simple",
-                "jsonPath": "$.date",
-                "operatorType": "LESS_THAN",
-                "value": date_to
-            })
+        Raises:
+            ValueError: If ``filter_tree`` is malformed
+        """
+        conditions = _simple_conditions({
+            "status": status,
+            "severity": severity,
+            "alert_type": alert_type,
+            "min_anomaly_score": min_anomaly_score,
+            "date_from": date_from,
+            "date_to": date_to,
+        })
+        if filter_tree is not None:
+            tree = _translate_filter_tree(filter_tree)
+            if tree is not None:
+                conditions.append(tree)
 
         # Build search condition structure
         if len(conditions) == 0:
@@ -225,18 +337,21 @@ class CyodaAlertClient:
         Returns:
             Dict for mcp__cyoda__entity_update_entity_tool call
         """
+        # One timestamp for every field this update sets
+        now_iso = _utc_now_iso()
+
         entity_data = {
             "status": status,
             "acknowledged": acknowledged,
             "resolved": resolved,
-            "updated_at": datetime.utcnow().isoformat()
+            "updated_at": now_iso
         }
 
         if resolved:
-            entity_data["resolved_at"] = datetime.utcnow().isoformat()
+            entity_data["resolved_at"] = now_iso
 
         if acknowledged and not resolved:
-            entity_data["acknowledged_at"] = datetime.utcnow().isoformat()
+            entity_data["acknowledged_at"] = now_iso
 
         if resolution_notes:
             entity_data["resolution_notes"] = resolution_notes
@@ -277,7 +392,12 @@ class CyodaAlertClient:
         Returns:
             Severity level: low, medium, high, critical
         """
+        # Most alerts are low/medium: settle those with one range check
+        # before walking the critical/high chain. NaN fails the fast path
+        # and falls through, as before
         if metric == "temperature":
+            if anomaly_score <= 0.7 and -5 <= value <= 35:
+                return "medium" if anomaly_score > 0.5 else "low"
             if anomaly_score > 0.9 or value > 40 or value < -10:
                 return "critical"
             elif anomaly_score > 0.7 or value > 35 or value < -5:
@@ -288,6 +408,8 @@ class CyodaAlertClient:
                 return "low"
 
         elif metric == "precipitation":
+            if anomaly_score <= 0.7 and value <= 50:
+                return "medium" if anomaly_score > 0.5 else "low"
             if anomaly_score > 0.9 or value > 100:  # >100mm in a day
                 return "critical"
             elif anomaly_score > 0.7 or value > 50:
@@ -298,6 +420,8 @@ class CyodaAlertClient:
                 return "low"
 
         # Default classification based only on anomaly score
+        if anomaly_score <= 0.5:
+            return "low"
         if anomaly_score > 0.85:
             return "critical"
         elif anomaly_score > 0.7:
@@ -307,6 +431,39 @@ class CyodaAlertClient:
         else:
             return "low"
 
+    @staticmethod
+    def classify_severity_batch(
+        anomaly_scores: np.ndarray,
+        values: np.ndarray,
+        metric: str
+    ) -> np.ndarray:
+        """
+        Vectorized :meth:`classify_severity` over aligned arrays.
+
+        Args:
+            anomaly_scores: ML anomaly scores (0-1)
+            values: Measured values
+            metric: Climate metric shared by all points
+
+        Returns:
+            Array of severity labels
+        """
+        scores = np.asarray(anomaly_scores, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+
+        conditions = []
+        for score_limit, upper, lower in _SEVERITY_LIMITS.get(metric, _DEFAULT_SEVERITY_LIMITS):
+            condition = scores > score_limit
+            if upper is not None:
+                condition |= values > upper
+            if lower is not None:
+                condition |= values < lower
+            conditions.append(condition)
+        conditions.append(scores > _MEDIUM_SCORE_LIMIT)
+
+        codes = np.select(conditions, [3, 2, 1], default=0)
+        return SEVERITY_LEVELS[codes]
+
     @staticmethod
     def determine_alert_type(value: float, metric: str, seasonal_context: Optional[Dict] = None) -> str:
         """
@@ -339,3 +496,26 @@ class CyodaAlertClient:
                 return "precipitation_anomaly"
 
         return "climate_anomaly"
+
+    @staticmethod
+    def determine_alert_type_batch(values: np.ndarray, metric: str) -> np.ndarray:
+        """
+        Vectorized :meth:`determine_alert_type` via a bin lookup.
+
+        Args:
+            values: Measured values
+            metric: Climate metric shared by all points
+
+        Returns:
+            Array of alert type strings
+        """
+        values = np.asarray(values, dtype=np.float64)
+
+        if metric not in _ALERT_TYPE_BINS:
+            return np.full(values.shape, "climate_anomaly")
+
+        bins, labels = _ALERT_TYPE_BINS[metric]
+        idx = np.digitize(values, bins)
+        # NaN fails every comparison in the scalar version
+        idx[np.isnan(values)] = len(bins) - 1
+        return labels[idx]
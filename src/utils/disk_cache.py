@@ -0,0 +1,93 @@
+"""SQLite-backed key/value cache that survives process restarts."""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Expired and over-limit entries are pruned once per this many writes
+PRUNE_EVERY = 64
+
+
+class DiskCache:
+    """
+    Persistent cache of string or bytes values with per-entry expiry.
+
+    Same ``get``/``set`` interface as the API response caches. Each thread
+    (and each forked worker) opens its own connection; the database runs
+    in WAL mode so worker processes can share one file. SQLite errors are
+    logged and count as misses, so a broken cache never fails the caller.
+    """
+
+    def __init__(self, path, maxsize: int = 10000):
+        """
+        Initialize cache.
+
+        Args:
+            path: SQLite database file (created with its directory if missing)
+            maxsize: Maximum number of entries kept; those expiring soonest
+                are dropped first
+        """
+        self.path = Path(path)
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        """This thread's connection, reopened after a fork."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)'
+        )
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Return the cached value for ``key``, or None if missing/expired."""
+        try:
+            row = self._connection().execute(
+                'SELECT value FROM entries WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Disk cache get failed: %s", e)
+            return None
+
+        return row[0] if row is not None else None
+
+    def set(self, key, value, ttl):
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, now + ttl)
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._prune(conn, now)
+        except sqlite3.Error as e:
+            logger.debug("Disk cache set failed: %s", e)
+
+    def _prune(self, conn, now):
+        """Drop expired entries, then the soonest-expiring beyond ``maxsize``."""
+        conn.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+        conn.execute(
+            'DELETE FROM entries WHERE key NOT IN '
+            '(SELECT key FROM entries ORDER BY expires_at DESC LIMIT ?)',
+            (self.maxsize,)
+        )
@@ -1,18 +1,104 @@
 """Google Gemini AI integration for climate insights."""
 
+import hashlib
 import os
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
+
+from src.utils.disk_cache import DiskCache
+
 try:
     import google.generativeai as genai
     GEMINI_AVAILABLE = True
 except ImportError:
     GEMINI_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Transport for the Gemini client; gRPC keeps one long-lived channel
+# that all prompts reuse
+GEMINI_TRANSPORT = os.getenv('GEMINI_TRANSPORT', 'grpc')
+
+# Upper bound on concurrent Gemini API calls per process, to stay inside
+# the rate limit however many request threads (or generate_all sections)
+# are waiting on the model; cached prompts don't take a slot
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))
+_gemini_slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENCY)
+
+# Shared pool running generate_all sections; Gemini calls are network-bound
+_section_executor = ThreadPoolExecutor(
+    max_workers=GEMINI_MAX_CONCURRENCY,
+    thread_name_prefix='gemini-report'
+)
+
+# Responses are memoized by prompt hash: the most recent
+# GEMINI_PROMPT_CACHE_SIZE in memory and, when GEMINI_PROMPT_CACHE_PATH is
+# set, in a SQLite file (shared by all workers) for GEMINI_PROMPT_CACHE_TTL
+# seconds
+GEMINI_PROMPT_CACHE_SIZE = int(os.getenv('GEMINI_PROMPT_CACHE_SIZE', 256))
+GEMINI_PROMPT_CACHE_PATH = os.getenv('GEMINI_PROMPT_CACHE_PATH')
+GEMINI_PROMPT_CACHE_TTL = int(os.getenv('GEMINI_PROMPT_CACHE_TTL', 7 * 86400))
+_prompt_store = DiskCache(GEMINI_PROMPT_CACHE_PATH) if GEMINI_PROMPT_CACHE_PATH else None
+_prompt_cache = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+# Persona shared by every prompt, sent once as the model's system
+# instruction instead of being repeated in each prompt body
+SYSTEM_INSTRUCTION = (
+    "You are a climate scientist analyzing Uruguay climate data. "
+    "Be concise and scientifically accurate."
+)
+
+# Low temperature for consistent, cacheable answers; the output cap bounds
+# worst-case latency (gemini-2.5 counts thinking tokens against it)
+GENERATION_CONFIG = {
+    'temperature': float(os.getenv('GEMINI_TEMPERATURE', 0.2)),
+    'max_output_tokens': int(os.getenv('GEMINI_MAX_OUTPUT_TOKENS', 2048)),
+}
+
+# full_analysis fields the executive summary prompt keeps (the ones the
+# /executive-summary route and the AI Insights page send); list fields are
+# cut to their first EXECUTIVE_SUMMARY_MAX_ITEMS entries
+EXECUTIVE_SUMMARY_KEYS = ('statistics', 'predictions', 'anomalies', 'trends', 'time_period', 'region')
+EXECUTIVE_SUMMARY_MAX_ITEMS = int(os.getenv('EXECUTIVE_SUMMARY_MAX_ITEMS', 20))
+
+
+def _to_json(data) -> str:
+    """Pretty-print prompt data as JSON, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+    return json.dumps(data, indent=2)
+
 
 class GeminiClimateAnalyst:
     """Generate AI-powered insights using Google Gemini."""
 
+    # Bump when any prompt template below changes, so cached responses
+    # generated from the old prompts are no longer served
+    PROMPT_VERSION = 4
+
+    # generate_all section -> generate_* method; comparative_analysis takes
+    # its two arguments as a {'current_data': ..., 'historical_data': ...} dict
+    SECTIONS = {
+        'climate_summary': 'generate_climate_summary',
+        'ml_insights': 'generate_ml_insights',
+        'anomaly_report': 'generate_anomaly_report',
+        'recommendations': 'generate_recommendations',
+        'comparative_analysis': 'generate_comparative_analysis',
+        'seasonal_narrative': 'generate_seasonal_forecast_narrative',
+        'executive_summary': 'generate_executive_summary',
+    }
+
     def __init__(self, api_key: str = None):
         """
         Initialize Gemini AI client.
@@ -27,9 +113,52 @@ class GeminiClimateAnalyst:
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
-        genai.configure(api_key=self.api_key)
+        genai.configure(api_key=self.api_key, transport=GEMINI_TRANSPORT)
         # Use models/gemini-2.5-flash - the models/ prefix is required!
-        self.model = genai.GenerativeModel('models/gemini-2.5-flash')
+        self.model = genai.GenerativeModel(
+            'models/gemini-2.5-flash',
+            system_instruction=SYSTEM_INSTRUCTION,
+            generation_config=GENERATION_CONFIG
+        )
+
+    def _cached_generate(self, prompt: str) -> str:
+        """
+        Send ``prompt`` to Gemini, reusing the response to an identical prompt.
+
+        Prompts embed their full input data, so equal prompts (for the same
+        model) get the same answer; only successful responses are cached.
+
+        Args:
+            prompt: Complete prompt text
+
+        Returns:
+            Response text
+        """
+        model_name = getattr(self.model, 'model_name', '')
+        key = 'gemini_prompt:' + hashlib.blake2b(
+            f"{model_name}\0{prompt}".encode('utf-8'), digest_size=16
+        ).hexdigest()
+
+        with _prompt_cache_lock:
+            text = _prompt_cache.get(key)
+            if text is not None:
+                _prompt_cache.move_to_end(key)
+                return text
+
+        text = _prompt_store.get(key) if _prompt_store is not None else None
+        if text is None:
+            with _gemini_slots:
+                text = self.model.generate_content(prompt).text
+            if _prompt_store is not None:
+                _prompt_store.set(key, text, GEMINI_PROMPT_CACHE_TTL)
+
+        with _prompt_cache_lock:
+            _prompt_cache[key] = text
+            _prompt_cache.move_to_end(key)
+            while len(_prompt_cache) > GEMINI_PROMPT_CACHE_SIZE:
+                _prompt_cache.popitem(last=False)
+
+        return text
 
     def generate_climate_summary(self, climate_data: Dict[str, Any]) -> str:
         """
@@ -41,11 +170,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated summary
         """
+        climate_data_json = _to_json(climate_data)
         prompt = f"""
-        As a climate scientist, analyze the following climate data for Uruguay and provide a comprehensive summary:
+        Summarize the following climate data for Uruguay:
 
         Data:
-        {json.dumps(climate_data, indent=2)}
+        {climate_data_json}
 
         Please provide:
         1. A clear overview of current climate conditions
@@ -53,11 +183,10 @@ class GeminiClimateAnalyst:
         3. Notable changes compared to historical averages
         4. Potential implications for the region
 
-        Keep the summary concise (3-4 paragraphs) and scientifically accurate.
+        Keep the summary to 3-4 paragraphs.
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_ml_insights(self, ml_results: Dict[str, Any]) -> str:
         """
@@ -69,11 +198,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated insights
         """
+        ml_results_json = _to_json(ml_results)
         prompt = f"""
-        As a data scientist specializing in climate analysis, analyze these machine learning predictions:
+        Analyze these machine learning predictions:
 
         ML Results:
-        {json.dumps(ml_results, indent=2)}
+        {ml_results_json}
 
         Please provide:
         1. Interpretation of the forecast trends
@@ -84,8 +214,7 @@ class GeminiClimateAnalyst:
         Be concise and actionable (2-3 paragraphs).
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_anomaly_report(self, anomalies: List[Dict[str, Any]]) -> str:
         """
@@ -97,11 +226,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated anomaly report
         """
+        anomalies_json = _to_json(anomalies)
         prompt = f"""
-        As a climate analyst, review these detected climate anomalies for Uruguay:
+        Review these detected climate anomalies for Uruguay:
 
         Anomalies Detected:
-        {json.dumps(anomalies, indent=2)}
+        {anomalies_json}
 
         Please provide:
         1. Severity assessment of these anomalies
@@ -112,8 +242,7 @@ class GeminiClimateAnalyst:
         Format as a brief report (3-4 paragraphs).
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_recommendations(self, analysis_summary: Dict[str, Any]) -> str:
         """
@@ -125,11 +254,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated recommendations
         """
+        analysis_summary_json = _to_json(analysis_summary)
         prompt = f"""
         Based on this climate analysis for Uruguay, provide actionable recommendations:
 
         Analysis:
-        {json.dumps(analysis_summary, indent=2)}
+        {analysis_summary_json}
 
         Please provide recommendations for:
         1. Government and policymakers
@@ -140,8 +270,7 @@ class GeminiClimateAnalyst:
         Format as clear, actionable bullet points under each category.
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_comparative_analysis(self, current_data: Dict, historical_data: Dict) -> str:
         """
@@ -154,14 +283,16 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated comparative analysis
         """
+        current_data_json = _to_json(current_data)
+        historical_data_json = _to_json(historical_data)
         prompt = f"""
         Compare current climate conditions with historical patterns for Uruguay:
 
         Current Conditions:
-        {json.dumps(current_data, indent=2)}
+        {current_data_json}
 
         Historical Averages:
-        {json.dumps(historical_data, indent=2)}
+        {historical_data_json}
 
         Provide:
         1. Key differences between current and historical conditions
@@ -172,8 +303,7 @@ class GeminiClimateAnalyst:
         Be specific with numbers and trends (2-3 paragraphs).
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_seasonal_forecast_narrative(self, seasonal_data: Dict[str, Any]) -> str:
         """
@@ -185,11 +315,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated narrative
         """
+        seasonal_data_json = _to_json(seasonal_data)
         prompt = f"""
         Create an engaging narrative about the upcoming seasonal forecast for Uruguay:
 
         Seasonal Forecast:
-        {json.dumps(seasonal_data, indent=2)}
+        {seasonal_data_json}
 
         Write a narrative that:
         1. Explains what to expect in the coming months
@@ -200,8 +331,7 @@ class GeminiClimateAnalyst:
         Write in an accessible style for general audiences (2-3 paragraphs).
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
 
     def generate_executive_summary(self, full_analysis: Dict[str, Any]) -> str:
         """
@@ -213,11 +343,12 @@ class GeminiClimateAnalyst:
         Returns:
             AI-generated executive summary
         """
+        full_analysis_json = _to_json(self._slim_analysis(full_analysis))
         prompt = f"""
         Create an executive summary of this comprehensive climate analysis for Uruguay:
 
         Complete Analysis:
-        {json.dumps(full_analysis, indent=2)}
+        {full_analysis_json}
 
         Provide a concise executive summary with:
         1. Key findings (top 3-5 bullet points)
@@ -228,5 +359,74 @@ class GeminiClimateAnalyst:
         Target audience: Decision-makers and stakeholders. Keep it under 200 words.
         """
 
-        response = self.model.generate_content(prompt)
-        return response.text
+        return self._cached_generate(prompt)
+
+    @staticmethod
+    def _slim_analysis(full_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Project an analysis down to the fields an executive summary needs.
+
+        Keeps ``EXECUTIVE_SUMMARY_KEYS`` and truncates long lists, so prompt
+        size no longer grows with the whole payload. Analyses with none of
+        those keys are passed through unchanged.
+
+        Args:
+            full_analysis: Complete climate analysis results
+
+        Returns:
+            Reduced analysis dict
+        """
+        slim = {key: full_analysis[key] for key in EXECUTIVE_SUMMARY_KEYS if key in full_analysis}
+        if not slim:
+            return full_analysis
+
+        for key, value in slim.items():
+            if isinstance(value, list) and len(value) > EXECUTIVE_SUMMARY_MAX_ITEMS:
+                slim[key] = value[:EXECUTIVE_SUMMARY_MAX_ITEMS]
+
+        return slim
+
+    def generate_all(self, sections: Dict[str, Any], return_exceptions: bool = False) -> Dict[str, Any]:
+        """
+        Generate several report sections with overlapping Gemini calls.
+
+        Each section is still its own prompt, but the calls run
+        concurrently, so a full report takes about as long as its slowest
+        section instead of the sum of all of them.
+
+        Args:
+            sections: Section name (see ``SECTIONS``) -> that method's input
+            return_exceptions: Return a failing section's exception as its
+                value instead of raising it
+
+        Returns:
+            Section name -> AI-generated text, in the order given. Unless
+            ``return_exceptions`` is set, the exception of the first
+            failing section (in that order) is re-raised.
+
+        Raises:
+            ValueError: If a section name is unknown
+        """
+        unknown = sorted(set(sections) - set(self.SECTIONS))
+        if unknown:
+            raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+        def run(name, payload):
+            method = getattr(self, self.SECTIONS[name])
+            if name == 'comparative_analysis':
+                return method(**payload)
+            return method(payload)
+
+        futures = {
+            name: _section_executor.submit(run, name, payload)
+            for name, payload in sections.items()
+        }
+
+        if not return_exceptions:
+            return {name: future.result() for name, future in futures.items()}
+
+        results = {}
+        for name, future in futures.items():
+            error = future.exception()
+            results[name] = error if error is not None else future.result()
+        return results
@@ -1,10 +1,21 @@
 """Helper functions and utilities."""
 
+import copy
 import json
 import yaml
+from functools import lru_cache
 from pathlib import Path
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# libyaml's C loader when PyYAML was built with it
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 def setup_logging(log_file: str = None, level=logging.INFO):
     """
@@ -30,25 +41,35 @@ def setup_logging(log_file: str = None, level=logging.INFO):
         logging.basicConfig(level=level, format=log_format)
 
 
+@lru_cache(maxsize=32)
+def _load_config_file(path_str: str, mtime_ns: int):
+    """Parse a config file; ``mtime_ns`` only keys the cache."""
+    path = Path(path_str)
+
+    with open(path, 'r') as f:
+        if path.suffix in ['.yaml', '.yml']:
+            return yaml.load(f, Loader=_YamlLoader)
+        elif path.suffix == '.json':
+            return json.load(f)
+        else:
+            raise ValueError(f"Unsupported config format: {path.suffix}")
+
+
 def load_config(config_path: str):
     """
     Load configuration from YAML or JSON file.
 
+    Parsed files are cached until their modification time changes.
+
     Args:
         config_path: Path to configuration file
 
     Returns:
-        Configuration dictionary
+        Configuration dictionary (a copy, safe to modify)
     """
     path = Path(config_path)
-
-    with open(path, 'r') as f:
-        if path.suffix in ['.yaml', '.yml']:
-            return yaml.safe_load(f)
-        elif path.suffix == '.json':
-            return json.load(f)
-        else:
-            raise ValueError(f"Unsupported config format: {path.suffix}")
+    config = _load_config_file(str(path), path.stat().st_mtime_ns)
+    return copy.deepcopy(config)
 
 
 def save_json(data: dict, file_path: str):
@@ -61,6 +82,13 @@ def save_json(data: dict, file_path: str):
     """
     Path(file_path).parent.mkdir(parents=True, exist_ok=True)
 
+    if ORJSON_AVAILABLE:
+        # One bytes blob, one write; NumPy values serialize natively
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+        with open(file_path, 'wb') as f:
+            f.write(payload)
+        return
+
     with open(file_path, 'w') as f:
         json.dump(data, f, indent=2)
 
@@ -1,18 +1,44 @@
 """Plotting and visualization functions."""
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from pathlib import Path
+import os
+import matplotlib
 
+# Batch report runs render off-screen and never show figures
+HEADLESS = os.getenv('HEADLESS', '').lower() in ('1', 'true', 'yes')
+if HEADLESS:
+    matplotlib.use('Agg')
+
+# Imported after the backend is selected
+import matplotlib.pyplot as plt  # noqa: E402
+import seaborn as sns  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from pathlib import Path  # noqa: E402
+
+SAVE_DPI = 150
+MAX_ANNOTATED_COLUMNS = 15
 
 # Set default style
 sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+
+
+def _finish(fig, save_path: str = None):
+    """Save, show (unless headless) and release a figure."""
+    fig.tight_layout()
+
+    if save_path:
+        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(save_path, dpi=SAVE_DPI, bbox_inches='tight')
+
+    if not HEADLESS:
+        plt.show()
+
+    plt.close(fig)
 
 
 def plot_time_series(df: pd.DataFrame, date_column: str, value_column: str,
-                     title: str = "Time Series Plot", save_path: str = None):
+                     title: str = "Time Series Plot", save_path: str = None,
+                     max_points: int = 5000):
     """
     Plot time series data.
 
@@ -22,20 +48,19 @@ def plot_time_series(df: pd.DataFrame, date_column: str, value_column: str,
         value_column: Name of the value column
         title: Plot title
         save_path: Optional path to save the figure
+        max_points: Stride-downsample longer series to about this many
+            points before drawing; None plots every point
     """
-    plt.figure(figsize=(14, 6))
-    plt.plot(df[date_column], df[value_column], linewidth=2)
-    plt.title(title, fontsize=16)
-    plt.xlabel('Date', fontsize=12)
-    plt.ylabel(value_column, fontsize=12)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-
-    if save_path:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    if max_points and len(df) > max_points:
+        df = df.iloc[::-(-len(df) // max_points)]
 
-    plt.show()
+    fig, ax = plt.subplots(figsize=(14, 6))
+    ax.plot(df[date_column], df[value_column], linewidth=2, rasterized=True)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel(value_column, fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    _finish(fig, save_path)
 
 
 def plot_correlation_matrix(df: pd.DataFrame, title: str = "Correlation Matrix",
@@ -48,19 +73,34 @@ def plot_correlation_matrix(df: pd.DataFrame, title: str = "Correlation Matrix",
         title: Plot title
         save_path: Optional path to save the figure
     """
-    plt.figure(figsize=(12, 10))
-    correlation = df.select_dtypes(include=['float64', 'int64']).corr()
-
-    sns.heatmap(correlation, annot=True, cmap='coolwarm', center=0,
-                fmt='.2f', square=True, linewidths=1)
-    plt.title(title, fontsize=16)
-    plt.tight_layout()
-
-    if save_path:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    plt.show()
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    columns = numeric.columns
+
+    # float32 halves the data fed to corrcoef's BLAS product; rows with any
+    # missing value are dropped (pandas' corr() drops them pairwise instead)
+    values = numeric.to_numpy(dtype=np.float32, na_value=np.nan)
+    values = values[~np.isnan(values).any(axis=1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = np.atleast_2d(np.corrcoef(values, rowvar=False, dtype=np.float32))
+    n = len(columns)
+
+    fig, ax = plt.subplots(figsize=(12, 10))
+    im = ax.imshow(correlation, cmap='coolwarm', vmin=-1, vmax=1)
+    fig.colorbar(im, ax=ax)
+
+    # Per-cell labels are unreadable (and slow to draw) on wide matrices
+    if n <= MAX_ANNOTATED_COLUMNS:
+        for i in range(n):
+            for j in range(n):
+                ax.text(j, i, f"{correlation[i, j]:.2f}", ha='center', va='center')
+
+    ax.set_xticks(range(n))
+    ax.set_xticklabels(columns, rotation=45, ha='right')
+    ax.set_yticks(range(n))
+    ax.set_yticklabels(columns)
+    ax.grid(False)
+    ax.set_title(title, fontsize=16)
+    _finish(fig, save_path)
 
 
 def plot_feature_importance(feature_names, importance_values,
@@ -81,18 +121,12 @@ def plot_feature_importance(feature_names, importance_values,
         'importance': importance_values
     }).sort_values('importance', ascending=False).head(top_n)
 
-    plt.figure(figsize=(10, 8))
-    sns.barplot(data=importance_df, x='importance', y='feature', palette='viridis')
-    plt.title(title, fontsize=16)
-    plt.xlabel('Importance', fontsize=12)
-    plt.ylabel('Feature', fontsize=12)
-    plt.tight_layout()
-
-    if save_path:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
-
-    plt.show()
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.barplot(data=importance_df, x='importance', y='feature', palette='viridis', ax=ax)
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel('Importance', fontsize=12)
+    ax.set_ylabel('Feature', fontsize=12)
+    _finish(fig, save_path)
 
 
 def plot_predictions_vs_actual(y_true, y_pred,
@@ -107,22 +141,19 @@ def plot_predictions_vs_actual(y_true, y_pred,
         title: Plot title
         save_path: Optional path to save the figure
     """
-    plt.figure(figsize=(10, 8))
-    plt.scatter(y_true, y_pred, alpha=0.5)
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    ax.scatter(y_true, y_pred, alpha=0.5, s=6, marker='.', linewidths=0)
 
     # Plot perfect prediction line
     min_val = min(y_true.min(), y_pred.min())
     max_val = max(y_true.max(), y_pred.max())
-    plt.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Prediction')
-
-    plt.title(title, fontsize=16)
-    plt.xlabel('Actual Values', fontsize=12)
-    plt.ylabel('Predicted Values', fontsize=12)
-    plt.legend()
-    plt.tight_layout()
-
-    if save_path:
-        Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    ax.plot([min_val, max_val], [min_val, max_val], 'r--', linewidth=2, label='Perfect Prediction')
 
-    plt.show()
+    ax.set_title(title, fontsize=16)
+    ax.set_xlabel('Actual Values', fontsize=12)
+    ax.set_ylabel('Predicted Values', fontsize=12)
+    ax.legend()
+    _finish(fig, save_path)
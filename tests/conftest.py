@@ -0,0 +1,48 @@
+"""Shared test fixtures."""
+
+from types import SimpleNamespace
+
+import pytest
+import pandas as pd
+import numpy as np
+
+
+@pytest.fixture(scope="session")
+def toy_df():
+    """100-row frame with two features and a linear target; treat as read-only."""
+    return pd.DataFrame({
+        'feature1': np.arange(100),
+        'feature2': np.arange(100) * 2,
+        'target': np.arange(100) * 3
+    })
+
+
+class FakeGemini:
+    """
+    Gemini stub that counts calls.
+
+    Stands in for a ``GeminiClimateAnalyst`` (``generate_anomaly_report``)
+    or for its ``GenerativeModel`` (``generate_content``, which echoes the
+    prompt's first line and raises for prompts containing ``fail_on``).
+    """
+
+    def __init__(self, report="Recommendations:\n- Stay hydrated", fail_on=None):
+        self.report = report
+        self.fail_on = fail_on
+        self.calls = 0
+
+    def generate_anomaly_report(self, anomaly_data):
+        self.calls += 1
+        return self.report
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        if self.fail_on is not None and self.fail_on in prompt:
+            raise RuntimeError(f"Gemini failed on {self.fail_on!r}")
+        return SimpleNamespace(text=prompt.strip().splitlines()[0])
+
+
+@pytest.fixture
+def make_fake_gemini():
+    """Factory for :class:`FakeGemini` stubs; takes the report text to return."""
+    return FakeGemini
@@ -0,0 +1,205 @@
+"""Tests for the climate alert service."""
+
+import pytest
+import numpy as np
+import pandas as pd
+from src.services.alert_service import ClimateAlertService
+from src.utils.cyoda_client import CyodaAlertClient
+
+
+def test_prioritize_alerts():
+    """Test alerts are ordered by severity, acknowledgement and recency."""
+    today = pd.Timestamp.now().strftime('%Y-%m-%d')
+    alerts = [
+        {'id': 'old-low', 'severity': 'low', 'date': '2000-01-01'},
+        {'id': 'acked-critical', 'severity': 'critical', 'acknowledged': True, 'date': '2000-01-01'},
+        {'id': 'recent-high', 'severity': 'high', 'date': today},
+        {'id': 'old-high', 'severity': 'high', 'date': '2000-01-01'},
+    ]
+
+    service = ClimateAlertService()
+    prioritized = service.prioritize_alerts(alerts)
+
+    assert [a['id'] for a in prioritized] == ['recent-high', 'old-high', 'acked-critical', 'old-low']
+    assert service.prioritize_alerts([]) == []
+
+
+def test_prioritize_alerts_mixed_time_zones():
+    """Test mixed offsets and naive/aware dates fall back to per-date parsing."""
+    from src.services.alert_columns import alerts_to_soa
+
+    now = pd.Timestamp('2024-01-11')
+    offsets = [{'date': '2024-01-01T00:00:00+01:00'}, {'date': '2024-01-01T00:00:00+02:00'}]
+    mixed = [{'date': '2024-01-01'}, {'date': '2024-01-01T00:00:00Z'}]
+
+    assert alerts_to_soa(offsets, now)['has_date'].tolist() == [False, False]
+    columns = alerts_to_soa(mixed, now)
+    assert columns['has_date'].tolist() == [True, False]
+    assert columns['days_ago'][0] == 10
+
+    alerts = [
+        {'id': 'plus1', 'severity': 'high', 'date': '2024-01-01T00:00:00+01:00'},
+        {'id': 'naive', 'severity': 'low', 'date': '2024-01-01'},
+        {'id': 'utc', 'severity': 'critical', 'date': '2024-01-01T00:00:00Z'},
+        {'id': 'plus2', 'severity': 'high', 'date': '2024-01-01T00:00:00+02:00'},
+    ]
+    prioritized = ClimateAlertService().prioritize_alerts(alerts)
+    assert [a['id'] for a in prioritized] == ['utc', 'plus1', 'plus2', 'naive']
+
+
+def test_classify_batch_matches_scalar():
+    """Test batch classification agrees with the scalar rules at every threshold."""
+    values = np.array([-12, -10, -6, -5, 0, 0.05, 0.1, 3, 5, 20, 35, 36, 40, 41, 50, 51, 100, 101])
+    scores = np.tile([0.2, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.3], 2)
+
+    for metric in ['temperature', 'precipitation', 'humidity']:
+        severities = CyodaAlertClient.classify_severity_batch(scores, values, metric)
+        alert_types = CyodaAlertClient.determine_alert_type_batch(values, metric)
+
+        assert severities.tolist() == [
+            CyodaAlertClient.classify_severity(s, v, metric) for s, v in zip(scores, values)
+        ]
+        assert alert_types.tolist() == [
+            CyodaAlertClient.determine_alert_type(v, metric) for v in values
+        ]
+
+
+@pytest.mark.parametrize("score,value,metric,expected", [
+    (0.2, 20, 'temperature', 'low'),
+    (0.6, 20, 'temperature', 'medium'),
+    (0.2, 35, 'temperature', 'low'),
+    (0.2, 36, 'temperature', 'high'),
+    (0.2, -5, 'temperature', 'low'),
+    (0.2, -6, 'temperature', 'high'),
+    (0.2, 41, 'temperature', 'critical'),
+    (0.2, -11, 'temperature', 'critical'),
+    (0.75, 20, 'temperature', 'high'),
+    (0.95, 20, 'temperature', 'critical'),
+    (0.2, float('nan'), 'temperature', 'low'),
+    (float('nan'), 20, 'temperature', 'low'),
+    (0.2, 10, 'precipitation', 'low'),
+    (0.6, 50, 'precipitation', 'medium'),
+    (0.2, 51, 'precipitation', 'high'),
+    (0.2, 101, 'precipitation', 'critical'),
+    (0.5, 0, 'humidity', 'low'),
+    (0.6, 0, 'humidity', 'medium'),
+    (0.8, 0, 'humidity', 'high'),
+    (0.9, 0, 'humidity', 'critical'),
+])
+def test_classify_severity_table(score, value, metric, expected):
+    """Test scalar severity at the fast-path and threshold boundaries."""
+    assert CyodaAlertClient.classify_severity(score, value, metric) == expected
+
+
+def test_search_alerts_filter_tree():
+    """Test nested AND/OR filters translate to Cyoda groups alongside keyword filters."""
+    client = CyodaAlertClient()
+    spec = client.search_alerts(status='active', filter_tree={
+        'or': [{'severity': 'critical'}, {'severity': 'high', 'min_anomaly_score': 0.8}]
+    })
+
+    def simple(path, op, value):
+        return {'type': 'simple', 'jsonPath': path, 'operatorType': op, 'value': value}
+
+    assert spec['search_conditions'] == {
+        'type': 'group', 'operator': 'AND', 'conditions': [
+            simple('$.status', 'EQUALS', 'active'),
+            {'type': 'group', 'operator': 'OR', 'conditions': [
+                simple('$.severity', 'EQUALS', 'critical'),
+                {'type': 'group', 'operator': 'AND', 'conditions': [
+                    simple('$.severity', 'EQUALS', 'high'),
+                    simple('$.anomaly_score', 'GREATER_THAN', 0.8),
+                ]},
+            ]},
+        ]
+    }
+    assert client.search_alerts(filter_tree={'and': [{'status': None}]})['search_conditions'] == {}
+
+    with pytest.raises(ValueError):
+        client.search_alerts(filter_tree={'or': [{'colour': 'red'}]})
+
+
+def test_search_alerts_date_range_accepts_datetimes():
+    """Test date filters are sent as ISO strings whether given as str or datetime."""
+    client = CyodaAlertClient()
+    spec = client.search_alerts(date_from=pd.Timestamp('2024-01-01'), date_to='2024-02-01')
+    values = [c['value'] for c in spec['search_conditions']['conditions']]
+
+    assert values == ['2024-01-01T00:00:00', '2024-02-01']
+    assert client.search_alerts(filter_tree={'date_from': pd.Timestamp('2024-03-05').date()})[
+        'search_conditions']['value'] == '2024-03-05'
+
+
+def test_ai_report_reused_for_similar_anomalies(make_fake_gemini):
+    """Near-identical anomalies share one Gemini report."""
+    gemini = make_fake_gemini()
+    service = ClimateAlertService(gemini_client=gemini)
+
+    first = service._generate_ai_analysis('heat_wave', 'high', 38.01, 'temperature', 0.801, '2024-01-10')
+    second = service._generate_ai_analysis('heat_wave', 'high', 38.04, 'temperature', 0.804, '2024-01-11')
+    service._generate_ai_analysis('heat_wave', 'high', 39.5, 'temperature', 0.8, '2024-01-12')
+
+    assert gemini.calls == 2
+    assert second.analysis['full_report'] == first.analysis['full_report']
+    assert second.analysis['confidence'] == 0.804
+
+
+def test_active_alerts_summary_counts():
+    """Summary counts skip missing fields and order types by frequency."""
+    alerts = [
+        {'severity': 'critical', 'alert_type': 'heat_wave', 'status': 'active'},
+        {'severity': 'low', 'alert_type': 'cold_snap', 'status': 'active', 'acknowledged': True},
+        {'severity': 'critical', 'alert_type': 'cold_snap', 'resolved': True},
+        {'alert_type': 'cold_snap', 'severity': None},
+    ]
+
+    summary = ClimateAlertService().get_active_alerts_summary(alerts)
+
+    assert summary['total'] == 4
+    assert summary['by_severity'] == {'critical': 2, 'low': 1}
+    assert list(summary['by_type']) == ['cold_snap', 'heat_wave']
+    assert summary['critical_count'] == 2
+    assert summary['active_count'] == 2
+    assert summary['acknowledged_count'] == 1
+    assert summary['resolved_count'] == 1
+
+
+def test_ai_report_persists_across_services(tmp_path, make_fake_gemini):
+    """A report stored on disk is reused by a fresh service, without Gemini."""
+    from src.utils.disk_cache import DiskCache
+
+    store = DiskCache(tmp_path / 'reports.sqlite3')
+    report = "Recommendations:\n- Check drainage"
+    first, second = make_fake_gemini(report), make_fake_gemini(report)
+
+    ClimateAlertService(gemini_client=first, report_store=store)._generate_ai_analysis(
+        'extreme_precipitation', 'critical', 120.0, 'precipitation', 0.95, '2024-03-01'
+    )
+    analysis = ClimateAlertService(gemini_client=second, report_store=store)._generate_ai_analysis(
+        'extreme_precipitation', 'critical', 120.0, 'precipitation', 0.95, '2024-03-02'
+    )
+
+    assert (first.calls, second.calls) == (1, 0)
+    assert analysis.recommendations == ['Check drainage']
+
+
+def test_priority_kernel_matches_numpy():
+    """The Numba priority kernel orders alerts like the NumPy fallback."""
+    from src.services import alert_columns
+
+    if not alert_columns.NUMBA_AVAILABLE:
+        pytest.skip("numba not installed")
+
+    rng = np.random.default_rng(7)
+    n = 500
+    args = (
+        rng.integers(0, 5, n).astype(np.int8),
+        rng.random(n) < 0.5,
+        rng.integers(-5, 60, n).astype(np.int64),
+        rng.random(n) < 0.9,
+    )
+
+    np.testing.assert_array_equal(
+        alert_columns._priority_order_jit(*args),
+        alert_columns._priority_order_numpy(*args)
+    )
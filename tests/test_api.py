@@ -0,0 +1,54 @@
+"""Tests for the Flask API routes."""
+
+import pytest
+import pandas as pd
+import numpy as np
+from flask import Flask
+from backend.api.json_utils import init_json_provider
+
+# The ML blueprint imports TensorFlow and Prophet
+ml_routes = pytest.importorskip('backend.api.ml_routes')
+prophet_model = pytest.importorskip('src.models.prophet_model')
+
+
+class FakeProphet:
+    """Stands in for a fitted Prophet model with a linear forecast."""
+
+    def make_future_dataframe(self, periods, freq='D', include_history=True):
+        return pd.DataFrame({'ds': pd.date_range('2025-01-01', periods=periods, freq=freq)})
+
+    def predict(self, future):
+        yhat = np.arange(len(future), dtype=float)
+        return future.assign(yhat=yhat, yhat_lower=yhat - 1, yhat_upper=yhat + 1, trend=yhat)
+
+
+@pytest.fixture
+def ml_client(monkeypatch):
+    """Test client for the ML blueprint with a fake Prophet model loaded."""
+    analyzer = prophet_model.ProphetSeasonalAnalyzer()
+    analyzer.model = FakeProphet()
+    analyzer.fitted = True
+    monkeypatch.setattr(ml_routes, 'prophet_model', analyzer)
+    monkeypatch.setattr(ml_routes, 'ML_INFERENCE_PROCESSES', 0)
+
+    app = Flask(__name__)
+    init_json_provider(app)
+    app.register_blueprint(ml_routes.ml_bp, url_prefix='/api/ml')
+    return app.test_client()
+
+
+def test_prophet_forecast_pages_full_horizon(ml_client):
+    """Test every forecast day is reachable through offset/limit."""
+    body = ml_client.get('/api/ml/prophet-forecast?days=365&offset=0&limit=365').get_json()
+
+    assert body['total'] == 365
+    assert [row['yhat'] for row in body['forecast']] == list(range(365))
+    # Summary statistics still cover the last 90 days
+    assert body['mean_prediction'] == pytest.approx(np.arange(275, 365).mean())
+
+    page = ml_client.get('/api/ml/prophet-forecast?days=365&offset=100&limit=50').get_json()
+    assert page['total'] == 365
+    assert [row['yhat'] for row in page['forecast']] == list(range(100, 150))
+
+    tail = ml_client.get('/api/ml/prophet-forecast?days=365&offset=360&limit=50').get_json()
+    assert [row['yhat'] for row in tail['forecast']] == list(range(360, 365))
@@ -22,4 +22,31 @@ def test_create_time_features():
     assert result['day'].iloc[0] == 15
 
 
+def test_create_time_features_compact_dtypes():
+    """Test time features match the .dt accessor and use narrow dtypes."""
+    df = pd.DataFrame({'date': pd.date_range('1960-01-01', '2030-12-31', freq='13D')})
+
+    result = create_time_features(df, 'date')
+    dt = df['date'].dt
+
+    for column in ['year', 'month', 'day', 'dayofweek', 'quarter']:
+        assert (result[column].to_numpy() == getattr(dt, column).to_numpy()).all()
+    assert result['year'].dtype == 'int16'
+    assert result['month'].dtype == 'int8'
+
+
+def test_create_time_features_components_subset():
+    """Test only the requested components are added."""
+    df = pd.DataFrame({'date': ['2024-02-29', '2024-12-31']})
+
+    result = create_time_features(df, 'date', components=('dayofyear', 'month'))
+
+    assert list(result.columns) == ['date', 'dayofyear', 'month']
+    assert result['dayofyear'].tolist() == [60, 366]
+    assert result['month'].tolist() == [2, 12]
+
+    with pytest.raises(ValueError):
+        create_time_features(df, 'date', components=('week',))
+
+
 # Add more tests here
@@ -0,0 +1,50 @@
+"""Tests for the Gemini climate analyst."""
+
+from collections import OrderedDict
+
+import pytest
+from src.utils import gemini_ai
+from src.utils.gemini_ai import GeminiClimateAnalyst
+
+
+@pytest.fixture
+def analyst(monkeypatch):
+    """Build an analyst around a stub model, bypassing SDK setup and caches."""
+    monkeypatch.setattr(gemini_ai, '_prompt_cache', OrderedDict())
+    monkeypatch.setattr(gemini_ai, '_prompt_store', None)
+
+    def build(model):
+        analyst = GeminiClimateAnalyst.__new__(GeminiClimateAnalyst)
+        analyst.model = model
+        return analyst
+
+    return build
+
+
+def test_generate_all_keeps_order_and_reraises(analyst, make_fake_gemini):
+    """Sections come back in request order; a failing section's error propagates."""
+    sections = {
+        'seasonal_narrative': {'season': 'winter'},
+        'climate_summary': {'mean_temperature': 18.2},
+        'comparative_analysis': {'current_data': {'t': 19}, 'historical_data': {'t': 17}},
+    }
+
+    results = analyst(make_fake_gemini()).generate_all(sections)
+
+    assert list(results) == list(sections)
+    assert results['seasonal_narrative'].startswith('Create an engaging narrative')
+    assert results['climate_summary'].startswith('Summarize the following climate data')
+    assert results['comparative_analysis'].startswith('Compare current climate conditions')
+
+    # Fresh payload, so the prompt cache can't answer for the stub
+    sections['climate_summary'] = {'mean_temperature': 21.5}
+    failing = analyst(make_fake_gemini(fail_on='Summarize'))
+    with pytest.raises(RuntimeError, match='Summarize'):
+        failing.generate_all(sections)
+
+    outcomes = failing.generate_all(sections, return_exceptions=True)
+    assert isinstance(outcomes['climate_summary'], RuntimeError)
+    assert outcomes['seasonal_narrative'].startswith('Create an engaging narrative')
+
+    with pytest.raises(ValueError):
+        failing.generate_all({'weather_poem': {}})
@@ -5,34 +5,230 @@ import pandas as pd
 import numpy as np
 from sklearn.linear_model import LinearRegression
 from src.models.train_model import split_data, train_model, evaluate_model
+from src.models.anomaly_detector import ClimateAnomalyDetector, TemperatureThresholdDetector
+from src.models.climate_classifier import ClimatePatternClassifier
 
 
-def test_split_data():
+@pytest.mark.parametrize("test_size,expected_train", [(0.2, 80), (0.1, 90), (0.3, 70)])
+def test_split_data(toy_df, test_size, expected_train):
     """Test data splitting function."""
-    df = pd.DataFrame({
-        'feature1': np.arange(100),
-        'feature2': np.arange(100) * 2,
-        'target': np.arange(100) * 3
-    })
+    X_train, X_test, y_train, y_test = split_data(toy_df, 'target', test_size=test_size)
 
-    X_train, X_test, y_train, y_test = split_data(df, 'target', test_size=0.2)
-
-    assert len(X_train) == 80
-    assert len(X_test) == 20
+    assert len(X_train) == expected_train
+    assert len(X_test) == len(toy_df) - expected_train
+    assert len(y_train) == expected_train
     assert 'target' not in X_train.columns
     assert 'target' not in X_test.columns
 
 
-def test_train_model():
+@pytest.mark.parametrize("slope", [2.0, 0.5, -3.0])
+def test_train_model(slope):
     """Test model training."""
     X_train = pd.DataFrame({'feature': np.arange(10)})
-    y_train = np.arange(10) * 2
+    y_train = np.arange(10) * slope
 
     model = LinearRegression()
     trained_model = train_model(X_train, y_train, model)
 
     assert hasattr(trained_model, 'coef_')
-    assert trained_model.coef_[0] == pytest.approx(2.0, rel=1e-5)
+    assert trained_model.coef_[0] == pytest.approx(slope, rel=1e-5)
+
+
+def test_anomaly_features_match_pandas_rolling():
+    """Test anomaly features against the pandas rolling-window definition."""
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.normal(18, 5, 400))
+    dates = pd.date_range('2020-01-01', periods=400, freq='D')
+
+    expected = pd.DataFrame({'value': values})
+    for window in [7, 14, 30]:
+        expected[f'rolling_mean_{window}'] = values.rolling(window=window).mean()
+        expected[f'rolling_std_{window}'] = values.rolling(window=window).std()
+    expected['daily_change'] = values.diff()
+    expected['day_of_year'] = dates.dayofyear
+    expected['month'] = dates.month
+    expected = expected.bfill().ffill().fillna(0)
+
+    features = ClimateAnomalyDetector()._build_features(values, dates)
+
+    assert list(features.columns) == list(expected.columns)
+    np.testing.assert_allclose(features.to_numpy(), expected.to_numpy(dtype=float), atol=1e-9)
+
+
+def test_anomaly_scaled_features_match_scaler():
+    """Test the fused feature/scaling path against StandardScaler."""
+    pytest.importorskip('numba')
+
+    rng = np.random.default_rng(1)
+    values = rng.normal(18, 5, 300)
+    values[[10, 150]] = np.nan
+    dates = pd.date_range('2021-01-01', periods=300, freq='D')
+
+    detector = ClimateAnomalyDetector()
+    features = detector._build_features(values, dates)
+    detector.scaler.fit(features)
+
+    np.testing.assert_allclose(
+        detector._scaled_features(values, dates),
+        detector.scaler.transform(features),
+        atol=1e-9
+    )
+
+
+def test_anomaly_detect_matches_isolation_forest_predict():
+    """Test single-pass anomaly labels against IsolationForest.predict."""
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=500, freq='D'),
+        'value': rng.normal(18, 5, 500)
+    })
+
+    detector = ClimateAnomalyDetector(n_estimators=20, n_jobs=1)
+    detector.train(df.copy())
+    result = detector.detect(df.copy())
+
+    X_scaled = detector.scaler.transform(detector.prepare_features(df.copy()))
+    expected = detector.model.predict(X_scaled) == -1
+
+    np.testing.assert_array_equal(result['is_anomaly'].to_numpy(), expected)
+    np.testing.assert_allclose(result['anomaly_score'], -detector.model.score_samples(X_scaled))
+
+
+def test_anomaly_features_cached_between_train_and_detect(monkeypatch):
+    """Training then detecting on one series builds its features once."""
+    from collections import OrderedDict
+    from src.models import anomaly_detector, _anomaly_kernels
+
+    monkeypatch.setattr(anomaly_detector, '_feature_cache', OrderedDict())
+    monkeypatch.setattr(_anomaly_kernels, 'NUMBA_AVAILABLE', False)
+    builds = []
+    build = ClimateAnomalyDetector._build_features
+    monkeypatch.setattr(ClimateAnomalyDetector, '_build_features',
+                        staticmethod(lambda *args: builds.append(1) or build(*args)))
+
+    rng = np.random.default_rng(4)
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=200, freq='D'),
+        'value': rng.normal(18, 5, 200)
+    })
+
+    detector = ClimateAnomalyDetector(n_estimators=10, n_jobs=1)
+    detector.train(df.copy())
+    first = detector.prepare_features(df.copy())
+    first.iloc[0, 0] = -999.0
+    detector.detect(df.copy())
+
+    assert len(builds) == 1
+    assert detector.prepare_features(df.copy()).iloc[0, 0] != -999.0
+
+
+def test_onnx_predictions_match_sklearn(tmp_path):
+    """ONNX Runtime predictions from compile_to_onnx agree with scikit-learn."""
+    pytest.importorskip('skl2onnx')
+    pytest.importorskip('onnxruntime')
+    from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+    from src.models.predict_model import compile_to_onnx, load_model, make_predictions
+
+    rng = np.random.default_rng(6)
+    X = pd.DataFrame(rng.normal(size=(300, 4)).astype(np.float32), columns=list('abcd'))
+    labels = np.where(X['a'] + X['b'] > 0, 'warm', 'cold')
+
+    classifier = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, labels)
+    regressor = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, X['c'] * 2)
+
+    for name, model in [('classifier', classifier), ('regressor', regressor)]:
+        session = load_model(compile_to_onnx(model, X.shape[1], tmp_path / f'{name}.onnx'))
+        predictions = make_predictions(session, X)
+        if name == 'classifier':
+            np.testing.assert_array_equal(predictions, model.predict(X))
+        else:
+            np.testing.assert_allclose(predictions, model.predict(X), rtol=1e-5, atol=1e-5)
+
+
+def test_add_trees_keeps_existing_estimators():
+    """add_trees grows the forest by n trees without refitting the old ones."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=300),
+        'temperature': rng.normal(18, 6, 300),
+        'precipitation': rng.gamma(2, 3, 300)
+    })
+
+    classifier = ClimatePatternClassifier(n_estimators=5, n_jobs=1)
+    classifier.train(df)
+    original = list(classifier.model.estimators_)
+
+    assert classifier.add_trees(3, df) == len(original) + 3
+    assert len(classifier.model.estimators_) == len(original) + 3
+    assert all(a is b for a, b in zip(classifier.model.estimators_, original))
+    assert classifier.model.warm_start is False
+
+
+def test_threshold_flags_match_detect():
+    """Packed threshold flags agree with the boolean masks."""
+    rng = np.random.default_rng(5)
+    temps = rng.normal(18, 6, 500)
+    temps[::37] = np.nan
+
+    detector = TemperatureThresholdDetector()
+    detector.fit(temps[~np.isnan(temps)])
+    masks = detector.detect(temps)
+    flags = detector.detect_flags(temps)
+
+    assert flags.dtype == np.uint8
+    np.testing.assert_array_equal(flags & detector.COLD_FLAG > 0, masks['is_cold_anomaly'])
+    np.testing.assert_array_equal(flags & detector.HOT_FLAG > 0, masks['is_hot_anomaly'])
+    np.testing.assert_array_equal(flags & detector.ANY_FLAG > 0, masks['is_any_anomaly'])
+
+
+def test_climate_features_and_labels_match_reference():
+    """The fused pass matches pandas rolling features and the row-by-row label rules."""
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({
+        'date': pd.date_range('2020-01-01', periods=120),
+        'temperature': rng.normal(18, 6, 120),
+        'precipitation': rng.gamma(2, 3, 120)
+    })
+    df.loc[[5, 60], 'temperature'] = np.nan
+
+    expected = pd.DataFrame({'temperature': df['temperature'], 'precipitation': df['precipitation']})
+    for window in [7, 14, 30]:
+        expected[f'temp_roll_{window}'] = df['temperature'].rolling(window=window).mean()
+        expected[f'precip_roll_{window}'] = df['precipitation'].rolling(window=window).mean()
+    expected['month'] = df['date'].dt.month
+    expected['season'] = (df['date'].dt.month % 12 + 3) // 3
+    expected['day_of_year'] = df['date'].dt.dayofyear
+    expected = expected.bfill().ffill()
+
+    temp_low, temp_high = df['temperature'].quantile([0.33, 0.67])
+    precip_low, precip_high = df['precipitation'].quantile([0.33, 0.67])
+    labels = []
+    for _, row in df.iterrows():
+        temp, precip = row['temperature'], row['precipitation']
+        if temp < temp_low and precip < precip_low:
+            labels.append('Cold and Dry')
+        elif temp < temp_low and precip >= precip_high:
+            labels.append('Cold and Wet')
+        elif temp >= temp_high and precip < precip_low:
+            labels.append('Hot and Dry')
+        elif temp >= temp_high and precip >= precip_high:
+            labels.append('Hot and Wet')
+        elif temp < temp_low:
+            labels.append('Cold and Moderate')
+        elif temp >= temp_high:
+            labels.append('Hot and Moderate')
+        elif precip < precip_low:
+            labels.append('Moderate and Dry')
+        elif precip >= precip_high:
+            labels.append('Moderate and Wet')
+        else:
+            labels.append('Moderate')
+
+    X, y, names = ClimatePatternClassifier().prepare_features_and_labels(df)
+
+    assert names == expected.columns.tolist()
+    np.testing.assert_allclose(X, expected.to_numpy(dtype=float), atol=1e-9)
+    np.testing.assert_array_equal(y, np.array(labels, dtype=object))
 
 
 # Add more tests here